@@ -8,18 +8,59 @@ Quickstart:
     results = fetch_metadata_for_accessions(["CP184062.1", "NC_000913.3"])  # blocking helper
     print(len(results), "records")
 
-This module provides both async and sync helpers.
+This module provides both async and sync helpers. When no ``client`` is passed,
+the async helpers share one lazily-created ``httpx.AsyncClient`` so repeated
+calls (e.g., job polling) reuse pooled keep-alive connections. Call
+``aclose_default_client()`` before the event loop shuts down.
+
+Status polls are conditional: if the server answers ``GET /api/v1/jobs/{job_id}``
+(or the compact ``/api/v1/jobs/{job_id}/status``) with an ``ETag`` and/or
+``Last-Modified`` header, later polls send ``If-None-Match``/``If-Modified-Since``
+and a ``304 Not Modified`` reply reuses the previously parsed ``JobStatus``. Servers that omit the headers are polled
+unconditionally as before.
 """
 from __future__ import annotations
 
 import asyncio
+import logging
+import re
+import warnings
 from dataclasses import dataclass
-from typing import Iterable, Literal, Optional
+from typing import Any, Iterable, Literal, Optional
 
 import httpx
+import orjson
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_BASE_URL = "http://127.0.0.1:8000"
 
+# Whole-string check for submitted accessions: GCF_/GCA_/NC_/NZ_CP.../CP184062.1 style
+ACCESSION_FORMAT_RE = re.compile(r"(?:[A-Z]{2,3}_[A-Z]{0,6}|[A-Z]{1,6})\d{5,12}(?:\.\d+)?", re.IGNORECASE)
+
+_default_client: httpx.AsyncClient | None = None
+
+
+def _get_default_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use."""
+    global _default_client
+    if _default_client is None or _default_client.is_closed:
+        _default_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(300.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0),
+            http2=True,
+            headers={"user-agent": "ncbi-metadata-harvester"},
+        )
+    return _default_client
+
+
+async def aclose_default_client() -> None:
+    """Close the shared AsyncClient (if one was created)."""
+    global _default_client
+    if _default_client is not None:
+        await _default_client.aclose()
+        _default_client = None
+
 
 @dataclass(frozen=True)
 class JobProgress:
@@ -39,26 +80,96 @@ class MetadataClientError(Exception):
     pass
 
 
+# status URL -> (etag, last_modified, cached status) for conditional status polls,
+# least recently polled first; finished jobs are dropped since they are not polled again
+_STATUS_CACHE_MAX = 1024
+_status_cache: dict[str, tuple[str | None, str | None, JobStatus]] = {}
+
+# base URLs whose server predates the compact /status endpoint
+_no_progress_endpoint: set[str] = set()
+
+# base_url -> whether concurrent requests are worthwhile against that server
+_concurrency_safe: dict[str, bool] = {}
+
+
+async def is_concurrency_safe(
+    base_url: str = DEFAULT_BASE_URL,
+    *,
+    client: Optional[httpx.AsyncClient] = None,
+) -> bool:
+    """Probe once per base_url whether the server handles requests in parallel.
+
+    Issues ``HEAD /`` and reads the ``X-Concurrency`` header; a value of
+    ``serial`` (e.g., a single-worker dev server) disables concurrent fetches.
+    Defaults to True when the header is absent or the probe fails.
+    """
+    cached = _concurrency_safe.get(base_url)
+    if cached is not None:
+        return cached
+    if client is None:
+        client = _get_default_client()
+    try:
+        resp = await client.head(f"{base_url}/")
+        safe = resp.headers.get("x-concurrency", "parallel").lower() != "serial"
+    except httpx.HTTPError:
+        safe = True
+    _concurrency_safe[base_url] = safe
+    return safe
+
+
 async def submit_accessions(
     accessions: Iterable[str],
     *,
     base_url: str = DEFAULT_BASE_URL,
     client: Optional[httpx.AsyncClient] = None,
 ) -> str:
-    """Submit a job for a list of accessions. Returns job_id."""
-    owns = False
+    """Submit a job for a list of accessions. Returns job_id.
+
+    Accessions are stripped and de-duplicated (first occurrence wins), and
+    entries that do not look like an accession are dropped before submission.
+    """
     if client is None:
-        client = httpx.AsyncClient(timeout=300.0)
-        owns = True
-    try:
-        payload = {"accessions": list(accessions)}
-        resp = await client.post(f"{base_url}/api/v1/jobs/accessions", json=payload)
-        resp.raise_for_status()
-        data = resp.json()
-        return data["job_id"]
-    finally:
-        if owns:
-            await client.aclose()
+        client = _get_default_client()
+    unique = [a for a in dict.fromkeys(a.strip() for a in accessions) if a and ACCESSION_FORMAT_RE.fullmatch(a)]
+    if not unique:
+        raise MetadataClientError("No valid accessions to submit")
+    payload = {"accessions": unique}
+    resp = await client.post(f"{base_url}/api/v1/jobs/accessions", json=payload)
+    resp.raise_for_status()
+    data = orjson.loads(resp.content)
+    return data["job_id"]
+
+
+async def _fetch_status(client: httpx.AsyncClient, url: str, job_id: str) -> JobStatus:
+    """Conditional GET of a status URL, reusing the cached JobStatus on 304."""
+    headers: dict[str, str] = {}
+    cached = _status_cache.get(url)
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    resp = await client.get(url, headers=headers)
+    if resp.status_code == 304 and cached is not None:
+        _status_cache[url] = _status_cache.pop(url)
+        return cached[2]
+    resp.raise_for_status()
+    data = orjson.loads(resp.content)
+    prog = data.get("progress") or {"total": 0, "completed": 0, "errors": 0}
+    status = JobStatus(
+        job_id=job_id,
+        status=data["status"],
+        progress=JobProgress(total=prog.get("total", 0), completed=prog.get("completed", 0), errors=prog.get("errors", 0)),
+    )
+    etag = resp.headers.get("etag")
+    last_modified = resp.headers.get("last-modified")
+    _status_cache.pop(url, None)
+    if (etag or last_modified) and status.status not in _TERMINAL_STATES:
+        if len(_status_cache) >= _STATUS_CACHE_MAX:
+            _status_cache.pop(next(iter(_status_cache)))
+        _status_cache[url] = (etag, last_modified, status)
+    return status
 
 
 async def get_job_status(
@@ -67,52 +178,226 @@ async def get_job_status(
     base_url: str = DEFAULT_BASE_URL,
     client: Optional[httpx.AsyncClient] = None,
 ) -> JobStatus:
-    owns = False
     if client is None:
-        client = httpx.AsyncClient(timeout=60.0)
-        owns = True
-    try:
-        resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}")
-        resp.raise_for_status()
-        data = resp.json()
-        prog = data.get("progress") or {"total": 0, "completed": 0, "errors": 0}
-        return JobStatus(
-            job_id=job_id,
-            status=data["status"],
-            progress=JobProgress(total=prog.get("total", 0), completed=prog.get("completed", 0), errors=prog.get("errors", 0)),
+        client = _get_default_client()
+    return await _fetch_status(client, f"{base_url}/api/v1/jobs/{job_id}", job_id)
+
+
+async def get_job_progress(
+    job_id: str,
+    *,
+    base_url: str = DEFAULT_BASE_URL,
+    client: Optional[httpx.AsyncClient] = None,
+) -> JobStatus:
+    """Poll the compact ``/status`` endpoint (status + progress only).
+
+    Falls back to the full job document on servers without that endpoint.
+    """
+    if client is None:
+        client = _get_default_client()
+    if base_url not in _no_progress_endpoint:
+        try:
+            return await _fetch_status(client, f"{base_url}/api/v1/jobs/{job_id}/status", job_id)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code != 404:
+                raise
+        status = await get_job_status(job_id, base_url=base_url, client=client)
+        # The job exists, so the 404 came from a server without /status
+        _no_progress_endpoint.add(base_url)
+        return status
+    return await get_job_status(job_id, base_url=base_url, client=client)
+
+
+_TERMINAL_STATES = frozenset({"succeeded", "failed", "canceled"})
+
+
+class JobPoller:
+    """Background poller that checks many jobs with one request per cycle.
+
+    Each cycle issues a single ``GET /api/v1/jobs?ids=...`` for every job that
+    still has a waiter (or gathered per-job status requests on servers without
+    the batch endpoint) and sets the job's event once it reaches a terminal state.
+    The sweep task starts on the first ``register`` and exits when nothing is pending.
+    Every ``register`` must be paired with a ``release`` once the caller has read
+    the result; a job's state is dropped when its last waiter releases it.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str = DEFAULT_BASE_URL,
+        interval: float = 2.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.base_url = base_url
+        self.interval = interval
+        self._client = client
+        self._events: dict[str, asyncio.Event] = {}
+        self._statuses: dict[str, JobStatus] = {}
+        self._errors: dict[str, MetadataClientError] = {}
+        self._waiters: dict[str, int] = {}
+        self._task: asyncio.Task | None = None
+        self._batch_supported = True
+
+    def register(self, job_id: str) -> asyncio.Event:
+        """Start tracking a job; the returned event is set when it finishes."""
+        event = self._events.get(job_id)
+        if event is None:
+            event = self._events[job_id] = asyncio.Event()
+        self._waiters[job_id] = self._waiters.get(job_id, 0) + 1
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+        return event
+
+    def release(self, job_id: str) -> None:
+        """Drop one waiter; forget the job once none are left."""
+        remaining = self._waiters.get(job_id, 0) - 1
+        if remaining > 0:
+            self._waiters[job_id] = remaining
+            return
+        self._waiters.pop(job_id, None)
+        self._events.pop(job_id, None)
+        self._statuses.pop(job_id, None)
+        self._errors.pop(job_id, None)
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        """Last known status of a job; raises if the job could not be polled."""
+        if job_id in self._errors:
+            raise self._errors[job_id]
+        return self._statuses.get(job_id)
+
+    def _record(self, status: JobStatus) -> None:
+        self._statuses[status.job_id] = status
+        if status.status in _TERMINAL_STATES and status.job_id in self._events:
+            self._events[status.job_id].set()
+
+    def _fail(self, job_id: str, error: MetadataClientError) -> None:
+        self._errors[job_id] = error
+        if job_id in self._events:
+            self._events[job_id].set()
+
+    async def _sweep(self, job_ids: list[str]) -> None:
+        client = self._client or _get_default_client()
+        if self._batch_supported:
+            resp = await client.get(f"{self.base_url}/api/v1/jobs", params={"ids": ",".join(job_ids)})
+            if resp.status_code in (404, 405):
+                self._batch_supported = False
+            else:
+                resp.raise_for_status()
+                docs = orjson.loads(resp.content)
+                for job_id in job_ids:
+                    doc = docs.get(job_id)
+                    if doc is None:
+                        self._fail(job_id, MetadataClientError(f"Job {job_id} not found"))
+                        continue
+                    prog = doc.get("progress") or {}
+                    self._record(JobStatus(
+                        job_id=job_id,
+                        status=doc["status"],
+                        progress=JobProgress(total=prog.get("total", 0), completed=prog.get("completed", 0), errors=prog.get("errors", 0)),
+                    ))
+                return
+        results = await asyncio.gather(
+            *(get_job_progress(job_id, base_url=self.base_url, client=client) for job_id in job_ids),
+            return_exceptions=True,
         )
-    finally:
-        if owns:
-            await client.aclose()
+        for job_id, result in zip(job_ids, results):
+            if isinstance(result, httpx.HTTPStatusError) and result.response.status_code == 404:
+                self._fail(job_id, MetadataClientError(f"Job {job_id} not found"))
+            elif isinstance(result, JobStatus):
+                self._record(result)
+            elif not isinstance(result, httpx.HTTPError):
+                self._fail(job_id, MetadataClientError(f"Polling job {job_id} failed: {result!r}"))
+
+    async def _run(self) -> None:
+        while True:
+            pending = [job_id for job_id, event in self._events.items() if not event.is_set()]
+            if not pending:
+                return
+            try:
+                await self._sweep(pending)
+            except httpx.HTTPError as exc:
+                logger.warning("Job status sweep failed, retrying: %s", exc)
+            except Exception as exc:
+                # A malformed response would fail every cycle; wake the waiters with it
+                logger.exception("Job status sweep failed")
+                for job_id in pending:
+                    self._fail(job_id, MetadataClientError(f"Polling job {job_id} failed: {exc!r}"))
+            await asyncio.sleep(self.interval)
+
+
+_pollers: dict[str, JobPoller] = {}
+
+
+def get_job_poller(base_url: str = DEFAULT_BASE_URL) -> JobPoller:
+    """Shared JobPoller for a base_url, using the default client."""
+    poller = _pollers.get(base_url)
+    if poller is None:
+        poller = _pollers[base_url] = JobPoller(base_url=base_url)
+    return poller
 
 
 async def wait_for_job(
     job_id: str,
     *,
     base_url: str = DEFAULT_BASE_URL,
-    poll_interval: float = 5.0,
+    initial_interval: float = 0.5,
+    max_interval: float = 5.0,
+    backoff_factor: float = 1.5,
     timeout: float = 1800.0,
     client: Optional[httpx.AsyncClient] = None,
+    poller: Optional[JobPoller] = None,
+    poll_interval: Optional[float] = None,
 ) -> JobStatus:
-    """Poll until job completes or times out."""
-    owns = False
+    """Poll until job completes or times out.
+
+    The poll delay starts at ``initial_interval`` and grows by ``backoff_factor``
+    up to ``max_interval``; it drops back to ``initial_interval`` whenever the
+    completed count advances.
+
+    When many tasks wait on different jobs at once (e.g., a Genome Extractor
+    batch), pass ``poller=get_job_poller(base_url)`` so all of them share one
+    status request per cycle instead of polling independently.
+
+    ``poll_interval`` is deprecated; it polls at that fixed interval, the same as
+    passing it as both ``initial_interval`` and ``max_interval``.
+    """
+    if poll_interval is not None:
+        warnings.warn(
+            "wait_for_job(poll_interval=...) is deprecated; use initial_interval/max_interval",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        initial_interval = max_interval = poll_interval
+    if poller is not None:
+        event = poller.register(job_id)
+        try:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                last = poller.get(job_id)
+                raise MetadataClientError(f"Timeout waiting for job {job_id}: {last.status if last else 'unknown'}")
+            return poller.get(job_id)
+        finally:
+            poller.release(job_id)
     if client is None:
-        client = httpx.AsyncClient(timeout=60.0)
-        owns = True
-    try:
-        deadline = asyncio.get_event_loop().time() + timeout
-        last_status: Optional[JobStatus] = None
-        while True:
-            status = await get_job_status(job_id, base_url=base_url, client=client)
-            last_status = status
-            if status.status in {"succeeded", "failed", "canceled"}:
-                return status
-            if asyncio.get_event_loop().time() > deadline:
-                raise MetadataClientError(f"Timeout waiting for job {job_id}: {status.status}")
-            await asyncio.sleep(poll_interval)
-    finally:
-        if owns:
-            await client.aclose()
+        client = _get_default_client()
+    now = asyncio.get_running_loop().time
+    deadline = now() + timeout
+    delay = initial_interval
+    last_completed = -1
+    while True:
+        status = await get_job_progress(job_id, base_url=base_url, client=client)
+        if status.status in _TERMINAL_STATES:
+            return status
+        if now() > deadline:
+            raise MetadataClientError(f"Timeout waiting for job {job_id}: {status.status}")
+        if status.progress.completed != last_completed:
+            last_completed = status.progress.completed
+            delay = initial_interval
+        await asyncio.sleep(delay)
+        delay = min(max_interval, delay * backoff_factor)
 
 
 async def get_results(
@@ -122,19 +407,36 @@ async def get_results(
     format: Literal["json", "csv"] = "json",
     client: Optional[httpx.AsyncClient] = None,
 ):
-    owns = False
     if client is None:
-        client = httpx.AsyncClient(timeout=300.0)
-        owns = True
-    try:
-        resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}/results", params={"format": format})
-        resp.raise_for_status()
-        if format == "json":
-            return resp.json()
-        return resp.text
-    finally:
-        if owns:
-            await client.aclose()
+        client = _get_default_client()
+    resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}/results", params={"format": format})
+    resp.raise_for_status()
+    if format == "json":
+        return orjson.loads(resp.content)
+    return resp.text
+
+
+async def get_results_multi(
+    job_id: str,
+    formats: Iterable[Literal["json", "csv"]] = ("json", "csv"),
+    *,
+    base_url: str = DEFAULT_BASE_URL,
+    client: Optional[httpx.AsyncClient] = None,
+) -> dict[str, Any]:
+    """Fetch several result formats, concurrently unless the server is serial.
+
+    Returns a dict keyed by format.
+    """
+    if client is None:
+        client = _get_default_client()
+    formats = tuple(formats)
+    if await is_concurrency_safe(base_url, client=client):
+        payloads = await asyncio.gather(
+            *(get_results(job_id, base_url=base_url, format=fmt, client=client) for fmt in formats)
+        )
+    else:
+        payloads = [await get_results(job_id, base_url=base_url, format=fmt, client=client) for fmt in formats]
+    return dict(zip(formats, payloads))
 
 
 def fetch_metadata_for_accessions(
@@ -148,20 +450,22 @@ def fetch_metadata_for_accessions(
     Raises MetadataClientError on failure or timeout.
     """
     async def _run():
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        client = _get_default_client()
+        try:
             job_id = await submit_accessions(accessions, base_url=base_url, client=client)
             status = await wait_for_job(job_id, base_url=base_url, timeout=timeout, client=client)
             if status.status != "succeeded":
                 raise MetadataClientError(f"Job {job_id} finished with status {status.status}")
             data = await get_results(job_id, base_url=base_url, format="json", client=client)
             return data["results"], data.get("errors", [])
+        finally:
+            # asyncio.run() closes the loop, so the pooled connections can't outlive it
+            await aclose_default_client()
 
     return asyncio.run(_run())
 
 
 # Optional helper: extract accession from FASTA/GenBank headers
-import re
-
 ACC_RE = re.compile(r"\b([A-Z]{1,4}_?\d{3,9}(?:\.\d+)?)\b")
 
 
@@ -173,9 +477,7 @@ def extract_accessions_from_headers(headers: Iterable[str]) -> list[str]:
       ">CP184062.1 ..."
       ">GCF_000005845.2 ..."
     """
-    accs: list[str] = []
-    for h in headers:
-        m = ACC_RE.search(h)
-        if m:
-            accs.append(m.group(1))
-    return accs
+    if not headers:
+        return []
+    search = ACC_RE.search
+    return [m.group(1) for h in headers if (m := search(h))]
@@ -1,9 +1,22 @@
 """Check job status and download results."""
 import asyncio
-import json
+import csv
 import sys
+from itertools import islice
+from pathlib import Path
 
 import httpx
+import orjson
+
+from cli_common import dig, download_to_file, head_json_list
+from ncbi_metadata_harvester.http_client import with_retries
+
+
+# (label, key path, default) for the sample-result printout; rows come from the CSV export
+FIELDS = (
+    ("Organism", ("organism",), "Unknown"),
+    ("BioSample", ("biosample",), "N/A"),
+)
 
 
 async def check_job_status(job_id: str, base_url: str = "http://127.0.0.1:8000"):
@@ -12,12 +25,13 @@ async def check_job_status(job_id: str, base_url: str = "http://127.0.0.1:8000")
     print(f"🔍 Checking job status: {job_id}")
     print("=" * 70)
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    limits = httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60.0)
+    async with httpx.AsyncClient(timeout=30.0, http2=True, limits=limits) as client:
         try:
             # Get job status
-            resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}")
+            resp = await with_retries(lambda: client.get(f"{base_url}/api/v1/jobs/{job_id}"))
             resp.raise_for_status()
-            status_data = resp.json()
+            status_data = orjson.loads(resp.content)
             
             print(f"\n📊 Job Status:")
             print(f"   Status: {status_data['status']}")
@@ -39,44 +53,39 @@ async def check_job_status(job_id: str, base_url: str = "http://127.0.0.1:8000")
                 print(f"\n✅ Job completed successfully!")
                 print(f"\n📥 Downloading results...")
                 
-                # Get results
-                resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}/results?format=json")
-                resp.raise_for_status()
-                results = resp.json()
-                
+                # Stream JSON and CSV results to disk concurrently
+                results_url = f"{base_url}/api/v1/jobs/{job_id}/results"
+                output_file = f"results/metadata_{job_id}.json"
+                csv_file = f"results/metadata_{job_id}.csv"
+                Path("results").mkdir(exist_ok=True)
+                await asyncio.gather(
+                    with_retries(lambda: download_to_file(client, results_url, output_file, params={"format": "json"})),
+                    with_retries(lambda: download_to_file(client, results_url, csv_file, params={"format": "csv"})),
+                )
+                # Counts come from the final progress; samples from the head of the CSV,
+                # so the saved JSON is never loaded back into memory
                 print(f"\n📊 Results Summary:")
-                print(f"   Genomes retrieved: {len(results['results'])}")
-                print(f"   Errors: {len(results['errors'])}")
+                print(f"   Genomes retrieved: {progress['completed']}")
+                print(f"   Errors: {progress['errors']}")
                 
-                # Save to file
-                output_file = f"results/metadata_{job_id}.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, indent=2, ensure_ascii=False)
                 print(f"\n✅ Saved to: {output_file}")
+                print(f"✅ Saved to: {csv_file}")
                 
                 # Show first few results
-                if results['results']:
+                with open(csv_file, newline='', encoding='utf-8') as f:
+                    sample = list(islice(csv.DictReader(f), 3))
+                if sample:
                     print(f"\n📋 First few results:")
-                    for i, r in enumerate(results['results'][:3], 1):
-                        print(f"\n   [{i}] {r.get('accession', 'N/A')}")
-                        print(f"       Organism: {r.get('organism', 'Unknown')}")
-                        print(f"       BioSample: {r.get('dblink', {}).get('biosample', 'N/A')}")
+                    for i, r in enumerate(sample, 1):
+                        print(f"\n   [{i}] {r.get('accession') or 'N/A'}")
+                        for label, path, default in FIELDS:
+                            print(f"       {label}: {dig(r, path, default)}")
                 
-                # Show errors if any
-                if results['errors']:
+                if errors := head_json_list(output_file, "errors", 5):
                     print(f"\n⚠️  Errors (first 5):")
-                    for err in results['errors'][:5]:
+                    for err in errors:
                         print(f"      - {err}")
                 
-                # Download CSV too
-                print(f"\n📥 Downloading CSV...")
-                resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}/results?format=csv")
-                resp.raise_for_status()
-                csv_file = f"results/metadata_{job_id}.csv"
-                with open(csv_file, 'w', encoding='utf-8') as f:
-                    f.write(resp.text)
-                print(f"✅ Saved to: {csv_file}")
-                
             elif status_data['status'] == 'running':
                 print(f"\n⏳ Job is still running...")
                 print(f"   Processing {progress['completed']}/{progress['total']} genomes")
@@ -87,8 +96,8 @@ async def check_job_status(job_id: str, base_url: str = "http://127.0.0.1:8000")
                 print(f"\n❌ Job failed!")
                 # Try to get results to see errors
                 try:
-                    resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}/results?format=json")
-                    results = resp.json()
+                    resp = await with_retries(lambda: client.get(f"{base_url}/api/v1/jobs/{job_id}/results?format=json"))
+                    results = orjson.loads(resp.content)
                     if results.get('errors'):
                         print(f"\n⚠️  Errors:")
                         for err in results['errors']:
@@ -0,0 +1,122 @@
+"""Helpers shared by the command-line scripts in this directory."""
+import json
+from itertools import islice
+from typing import Any, Iterator
+
+import httpx
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def dig(record: dict, path: tuple[str, ...], default: str = "N/A"):
+    """Follow ``path`` through nested dicts, returning ``default`` when a key is missing."""
+    for key in path:
+        if not isinstance(record, dict) or key not in record:
+            return default
+        record = record[key]
+    return record or default
+
+
+async def download_to_file(client: httpx.AsyncClient, url: str, path, params: dict | None = None) -> None:
+    """Stream a GET response body straight to disk without buffering it in memory."""
+    async with client.stream("GET", url, params=params) as resp:
+        resp.raise_for_status()
+        with open(path, 'wb') as f:
+            async for chunk in resp.aiter_bytes(65536):
+                f.write(chunk)
+
+
+class _JSONReader:
+    """Incremental decoder over a JSON file, holding at most one value plus a read chunk."""
+
+    def __init__(self, f, chunk_size: int = 65536):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or "" at end of file."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos : self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete value, reading more of the file until it fits."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the buffer's edge may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self) -> Iterator[Any]:
+        """Yield the elements of the array starting at the cursor one at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == "]":
+                self.pos += 1
+                return
+            self.expect(",")
+
+
+def head_json_list(path, key: str, n: int) -> list[Any]:
+    """
+    Read the first ``n`` items of the top-level list ``key`` from a JSON object file.
+
+    Other top-level lists are skipped element by element, so the cost in memory is
+    one element at a time regardless of the file's size (e.g., reading ``errors``
+    after a large ``results`` list).
+
+    Args:
+        path: JSON file holding an object
+        key: Top-level key whose value is a list
+        n: Maximum number of items to return
+
+    Returns:
+        Up to ``n`` items, or an empty list when the key is absent
+    """
+    with open(path, encoding="utf-8") as f:
+        reader = _JSONReader(f)
+        reader.expect("{")
+        while reader.peek() not in ("}", ""):
+            name = reader.value()
+            reader.expect(":")
+            if reader.peek() == "[":
+                items = reader.items()
+                if name == key:
+                    return list(islice(items, n))
+                for _ in items:
+                    pass
+            else:
+                reader.value()
+            if reader.peek() == ",":
+                reader.pos += 1
+    return []
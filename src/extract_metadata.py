@@ -1,9 +1,26 @@
 """Extract metadata for first 50 genomes from accession list."""
 import asyncio
-import json
+import sys
+import time
 from pathlib import Path
 
 import httpx
+import orjson
+
+from cli_common import dig, download_to_file, head_json_list
+from ncbi_metadata_harvester.http_client import with_retries
+
+
+def _truncate(value: str) -> str:
+    return f"{value[:70]}..."
+
+
+# (label, key path, formatter) for the sample-result printout
+FIELDS = (
+    ("Definition", ("definition",), _truncate),
+    ("BioSample", ("dblink", "biosample"), str),
+    ("BioProject", ("dblink", "bioproject"), str),
+)
 
 
 async def extract_metadata_from_file(accession_file: str, limit: int = 50, output_dir: str = "results"):
@@ -17,13 +34,18 @@ async def extract_metadata_from_file(accession_file: str, limit: int = 50, outpu
     """
     # Read accessions
     print(f"📖 Reading accessions from {accession_file}...")
-    with open(accession_file, 'r') as f:
-        accessions = [line.strip() for line in f if line.strip()]
+    raw = Path(accession_file).read_text(encoding="utf-8")
+    accessions = [s for s in map(str.strip, raw.splitlines()) if s]
     
+    # Drop repeated accessions (keeping first occurrence) so each is fetched once
     total_accessions = len(accessions)
+    accessions = list(dict.fromkeys(accessions))
+    duplicates = total_accessions - len(accessions)
     accessions_to_process = accessions[:limit]
     
     print(f"✅ Found {total_accessions} total accessions")
+    if duplicates:
+        print(f"   Skipped {duplicates} duplicate(s), {len(accessions)} unique")
     print(f"🎯 Processing first {len(accessions_to_process)} accessions")
     
     # Create output directory
@@ -34,14 +56,15 @@ async def extract_metadata_from_file(accession_file: str, limit: int = 50, outpu
     base_url = "http://127.0.0.1:8000"
     print(f"\n🚀 Submitting job to {base_url}...")
     
-    async with httpx.AsyncClient(timeout=300.0) as client:
+    limits = httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60.0)
+    async with httpx.AsyncClient(timeout=300.0, http2=True, limits=limits) as client:
         # Submit accession job
         payload = {"accessions": accessions_to_process}
         
         try:
-            resp = await client.post(f"{base_url}/api/v1/jobs/accessions", json=payload)
+            resp = await with_retries(lambda: client.post(f"{base_url}/api/v1/jobs/accessions", json=payload), idempotent=False)
             resp.raise_for_status()
-            job_data = resp.json()
+            job_data = orjson.loads(resp.content)
             job_id = job_data["job_id"]
             print(f"✅ Job created: {job_id}")
             print(f"   Status: {job_data['status']}")
@@ -59,33 +82,52 @@ async def extract_metadata_from_file(accession_file: str, limit: int = 50, outpu
         print(f"   (This may take ~30-40 minutes for 50 genomes)")
         print(f"   💡 Tip: Press Ctrl+C to stop waiting (job will continue in background)")
         
-        last_progress = {"completed": 0, "total": 0, "errors": 0}
+        last_key = (-1, -1, -1)  # (completed, total, errors)
         dots = 0
         status = "queued"
         
-        # Increase timeout: 60 minutes max (1800 iterations * 2s)
-        for i in range(1800):
-            await asyncio.sleep(2)
+        # Poll with exponential backoff (0.5s -> 10s), reset whenever progress advances
+        initial_delay, max_delay = 0.5, 10.0
+        delay = initial_delay
+        start = time.monotonic()
+        deadline = start + 3600  # 60 minutes max
+        # Parsed once; httpx reuses a URL object as-is on every poll
+        status_url = httpx.URL(f"{base_url}/api/v1/jobs/{job_id}/status")
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(max_delay, delay * 1.5)
             
             try:
-                resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}")
-                resp.raise_for_status()
-                status_data = resp.json()
+                resp = await with_retries(lambda: client.get(status_url))
+                if resp.status_code == 404 and status_url.path.endswith("/status"):
+                    # Older server without the compact endpoint: poll the full job document
+                    status_url = httpx.URL(f"{base_url}/api/v1/jobs/{job_id}")
+                    resp = await with_retries(lambda: client.get(status_url))
+                if resp.status_code != 200:
+                    resp.raise_for_status()
+                status_data = orjson.loads(resp.content)
                 
                 status = status_data["status"]
                 progress = status_data["progress"]
                 
                 # Show progress if changed
-                if progress != last_progress:
-                    elapsed = i * 2
-                    print(f"\n   [{elapsed}s] Status: {status}")
-                    print(f"         Progress: {progress['completed']}/{progress['total']}")
-                    print(f"         Errors: {progress['errors']}")
-                    last_progress = progress.copy()
+                key = (progress["completed"], progress["total"], progress["errors"])
+                if key != last_key:
+                    elapsed = int(time.monotonic() - start)
+                    if key[0] != last_key[0]:
+                        delay = initial_delay
+                    # One write + flush per tick instead of a locked print per line
+                    sys.stdout.write(
+                        f"\n   [{elapsed}s] Status: {status}\n"
+                        f"         Progress: {progress['completed']}/{progress['total']}\n"
+                        f"         Errors: {progress['errors']}\n"
+                    )
+                    sys.stdout.flush()
+                    last_key = key
                     dots = 0
                 else:
                     # Show activity dots
-                    if dots % 15 == 0:
+                    if dots % 5 == 0:
                         print(".", end="", flush=True)
                     dots += 1
                 
@@ -108,47 +150,36 @@ async def extract_metadata_from_file(accession_file: str, limit: int = 50, outpu
         # Fetch results
         print(f"\n📥 Downloading results...")
         
-        # Get JSON results
-        resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}/results?format=json")
-        resp.raise_for_status()
-        results = resp.json()
-        
-        # Save JSON
+        # Stream JSON and CSV results to disk concurrently
+        results_url = f"{base_url}/api/v1/jobs/{job_id}/results"
         json_file = output_path / f"metadata_{job_id}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        print(f"✅ Saved JSON: {json_file}")
-        
-        # Get CSV results
-        resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}/results?format=csv")
-        resp.raise_for_status()
-        csv_content = resp.text
-        
-        # Save CSV
         csv_file = output_path / f"metadata_{job_id}.csv"
-        with open(csv_file, 'w', encoding='utf-8') as f:
-            f.write(csv_content)
+        await asyncio.gather(
+            with_retries(lambda: download_to_file(client, results_url, json_file, params={"format": "json"})),
+            with_retries(lambda: download_to_file(client, results_url, csv_file, params={"format": "csv"})),
+        )
+        print(f"✅ Saved JSON: {json_file}")
         print(f"✅ Saved CSV: {csv_file}")
         
-        # Show summary
+        # Show summary; counts come from the final progress and samples from the head
+        # of each list, so the saved JSON is never loaded whole
         print(f"\n" + "="*70)
         print("📊 SUMMARY")
         print("="*70)
         print(f"Total accessions requested: {len(accessions_to_process)}")
-        print(f"Successfully processed: {len(results['results'])}")
-        print(f"Errors encountered: {len(results['errors'])}")
+        print(f"Successfully processed: {progress['completed']}")
+        print(f"Errors encountered: {progress['errors']}")
         
-        if results['results']:
+        if sample := head_json_list(json_file, "results", 3):
             print(f"\n✅ Sample results (first 3):")
-            for i, r in enumerate(results['results'][:3], 1):
+            for i, r in enumerate(sample, 1):
                 print(f"\n  [{i}] {r.get('accession', 'N/A')} - {r.get('organism', 'Unknown')}")
-                print(f"      Definition: {r.get('definition', 'N/A')[:70]}...")
-                print(f"      BioSample: {r.get('dblink', {}).get('biosample', 'N/A')}")
-                print(f"      BioProject: {r.get('dblink', {}).get('bioproject', 'N/A')}")
+                for label, path, fmt in FIELDS:
+                    print(f"      {label}: {fmt(dig(r, path))}")
         
-        if results['errors']:
+        if errors := head_json_list(json_file, "errors", 5):
             print(f"\n⚠️  Errors (first 5):")
-            for err in results['errors'][:5]:
+            for err in errors:
                 print(f"      - {err}")
         
         print(f"\n" + "="*70)
@@ -158,8 +189,6 @@ async def extract_metadata_from_file(accession_file: str, limit: int = 50, outpu
 
 async def main():
     """Main entry point."""
-    import sys
-    
     # Parse command line args
     accession_file = "accession_list.txt"
     limit = 50
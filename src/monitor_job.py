@@ -1,53 +1,78 @@
 """Monitor a job until completion with live progress updates."""
 import asyncio
-import json
 import sys
 import time
 from pathlib import Path
 
 import httpx
+import orjson
+
+from cli_common import download_to_file, head_json_list
+from ncbi_metadata_harvester.http_client import with_retries
 
 
 async def monitor_job(job_id: str, base_url: str = "http://127.0.0.1:8000", check_interval: int = 10):
-    """Monitor a job until completion with live updates."""
+    """Monitor a job until completion with live updates.
+    
+    Polls with exponential backoff from 0.5s up to ``check_interval`` seconds,
+    dropping back to 0.5s whenever progress changes.
+    """
     
     print(f"🔍 Monitoring job: {job_id}")
     print("=" * 70)
-    print(f"⏱️  Checking every {check_interval} seconds (Ctrl+C to stop)\n")
+    print(f"⏱️  Checking at most every {check_interval} seconds (Ctrl+C to stop)\n")
     
-    last_completed = -1
+    last_key = (-1, -1)  # (completed, errors)
     start_time = time.time()
+    initial_delay = 0.5
+    delay = initial_delay
+    # Parsed once; httpx reuses a URL object as-is on every poll
+    status_url = httpx.URL(f"{base_url}/api/v1/jobs/{job_id}/status")
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    limits = httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60.0)
+    async with httpx.AsyncClient(timeout=30.0, http2=True, limits=limits) as client:
         try:
             while True:
                 try:
                     # Get job status
-                    resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}")
-                    resp.raise_for_status()
-                    status_data = resp.json()
+                    resp = await with_retries(lambda: client.get(status_url))
+                    if resp.status_code == 404 and status_url.path.endswith("/status"):
+                        # Older server without the compact endpoint: poll the full job document
+                        status_url = httpx.URL(f"{base_url}/api/v1/jobs/{job_id}")
+                        resp = await with_retries(lambda: client.get(status_url))
+                    if resp.status_code != 200:
+                        resp.raise_for_status()
+                    status_data = orjson.loads(resp.content)
                     
                     status = status_data['status']
                     progress = status_data['progress']
                     elapsed = time.time() - start_time
                     
                     # Show progress if changed
-                    if progress['completed'] != last_completed:
+                    key = (progress['completed'], progress['errors'])
+                    if key != last_key:
                         elapsed_str = time.strftime("%H:%M:%S", time.gmtime(elapsed))
                         pct = (progress['completed'] / progress['total'] * 100) if progress['total'] > 0 else 0
                         
-                        print(f"[{elapsed_str}] Status: {status} | "
-                              f"Progress: {progress['completed']}/{progress['total']} ({pct:.1f}%) | "
-                              f"Errors: {progress['errors']}")
+                        # One write + flush per tick instead of a locked print per line
+                        lines = [
+                            f"[{elapsed_str}] Status: {status} | "
+                            f"Progress: {progress['completed']}/{progress['total']} ({pct:.1f}%) | "
+                            f"Errors: {progress['errors']}\n"
+                        ]
                         
                         # Estimate time remaining
                         if progress['completed'] > 0 and elapsed > 0:
                             rate = progress['completed'] / elapsed
                             remaining = (progress['total'] - progress['completed']) / rate
                             remaining_str = time.strftime("%H:%M:%S", time.gmtime(remaining))
-                            print(f"         Est. time remaining: {remaining_str}")
+                            lines.append(f"         Est. time remaining: {remaining_str}\n")
+                        sys.stdout.write("".join(lines))
+                        sys.stdout.flush()
                         
-                        last_completed = progress['completed']
+                        if key[0] != last_key[0]:
+                            delay = initial_delay
+                        last_key = key
                     
                     # Check if job is complete
                     if status == 'succeeded':
@@ -57,37 +82,31 @@ async def monitor_job(job_id: str, base_url: str = "http://127.0.0.1:8000", chec
                         
                         # Download results
                         print(f"\n📥 Downloading results...")
-                        resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}/results?format=json")
-                        resp.raise_for_status()
-                        results = resp.json()
-                        
-                        # Save JSON
+                        results_url = f"{base_url}/api/v1/jobs/{job_id}/results"
                         Path("results").mkdir(exist_ok=True)
                         json_file = f"results/metadata_{job_id}.json"
-                        with open(json_file, 'w', encoding='utf-8') as f:
-                            json.dump(results, f, indent=2, ensure_ascii=False)
-                        print(f"✅ JSON saved: {json_file}")
-                        
-                        # Save CSV
-                        resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}/results?format=csv")
-                        resp.raise_for_status()
                         csv_file = f"results/metadata_{job_id}.csv"
-                        with open(csv_file, 'w', encoding='utf-8') as f:
-                            f.write(resp.text)
+                        await asyncio.gather(
+                            with_retries(lambda: download_to_file(client, results_url, json_file, params={"format": "json"})),
+                            with_retries(lambda: download_to_file(client, results_url, csv_file, params={"format": "csv"})),
+                        )
+                        print(f"✅ JSON saved: {json_file}")
                         print(f"✅ CSV saved: {csv_file}")
                         
+                        # Counts come from the final progress; samples are read from the
+                        # head of each list, so the saved JSON is never loaded whole
                         print(f"\n📊 Summary:")
-                        print(f"   Genomes retrieved: {len(results['results'])}")
-                        print(f"   Errors: {len(results['errors'])}")
+                        print(f"   Genomes retrieved: {progress['completed']}")
+                        print(f"   Errors: {progress['errors']}")
                         
-                        if results['results']:
+                        if sample := head_json_list(json_file, "results", 3):
                             print(f"\n📋 Sample results (first 3):")
-                            for i, r in enumerate(results['results'][:3], 1):
+                            for i, r in enumerate(sample, 1):
                                 print(f"   [{i}] {r.get('accession', 'N/A')} - {r.get('organism', 'Unknown')}")
                         
-                        if results['errors']:
+                        if errors := head_json_list(json_file, "errors", 5):
                             print(f"\n⚠️  Errors (first 5):")
-                            for err in results['errors'][:5]:
+                            for err in errors:
                                 print(f"      - {err}")
                         
                         break
@@ -95,8 +114,8 @@ async def monitor_job(job_id: str, base_url: str = "http://127.0.0.1:8000", chec
                     elif status == 'failed':
                         print(f"\n❌ Job failed!")
                         try:
-                            resp = await client.get(f"{base_url}/api/v1/jobs/{job_id}/results?format=json")
-                            results = resp.json()
+                            resp = await with_retries(lambda: client.get(f"{base_url}/api/v1/jobs/{job_id}/results?format=json"))
+                            results = orjson.loads(resp.content)
                             if results.get('errors'):
                                 print(f"\n⚠️  Errors:")
                                 for err in results['errors']:
@@ -106,7 +125,8 @@ async def monitor_job(job_id: str, base_url: str = "http://127.0.0.1:8000", chec
                         break
                     
                     # Wait before next check
-                    await asyncio.sleep(check_interval)
+                    await asyncio.sleep(delay)
+                    delay = min(check_interval, delay * 1.5)
                 
                 except httpx.HTTPStatusError as e:
                     print(f"\n❌ HTTP Error: {e.response.status_code}")
@@ -125,7 +145,7 @@ async def monitor_job(job_id: str, base_url: str = "http://127.0.0.1:8000", chec
 
 async def main():
     if len(sys.argv) < 2:
-        print("Usage: python src/monitor_job.py <job_id> [check_interval_seconds]")
+        print("Usage: python src/monitor_job.py <job_id> [max_check_interval_seconds]")
         print("\nExample:")
         print("  python src/monitor_job.py 3ebce10c-02d3-448b-a224-4290ec9583cd")
         print("  python src/monitor_job.py 3ebce10c-02d3-448b-a224-4290ec9583cd 5")
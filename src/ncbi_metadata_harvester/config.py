@@ -1,6 +1,5 @@
 """Configuration management using environment variables."""
-import os
-from functools import lru_cache
+from dataclasses import dataclass
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,6 +22,8 @@ class Settings(BaseSettings):
     max_retries: int = 3
     retry_base_delay: float = 0.5  # seconds
     retry_max_delay: float = 8.0  # seconds
+    # Retried NCBI requests in flight at once; bounds retry pile-ups during 429 storms
+    max_concurrent_retries: int = 2
 
     # Concurrency for parallel metadata fetching (bounded)
     # Recommended 6-8 to balance speed and NCBI politeness
@@ -35,9 +36,53 @@ class Settings(BaseSettings):
     http2_enabled: bool = True
     http_max_connections: int = 50
     http_max_keepalive: int = 50
+    http_keepalive_expiry: float = 60.0  # seconds; httpx defaults to 5
+    # Open a pooled E-utilities connection at startup (off for offline runs/tests)
+    ncbi_warmup: bool = True
 
+    # Shared job store for multi-worker deployments (in-memory when unset)
+    redis_url: str | None = None
+    # TTL for cached ESummary/EFetch bodies; records are immutable per accession version
+    ncbi_cache_ttl: int = 604800  # 7 days
 
-@lru_cache
-def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    # Directory for JSON/CSV snapshots written when a job succeeds (disabled when unset)
+    results_dir: str | None = None
+
+    # Worker processes for GenBank parsing (one per CPU when unset)
+    parse_workers: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeSettings:
+    """Immutable snapshot of validated Settings for cheap attribute access on hot paths."""
+
+    ncbi_tool: str
+    ncbi_email: str
+    ncbi_api_key: str | None
+    ncbi_rate_limit: float
+    max_retries: int
+    retry_base_delay: float
+    retry_max_delay: float
+    max_concurrent_retries: int
+    ncbi_concurrency: int
+    ncbi_batch_size: int
+    http2_enabled: bool
+    http_max_connections: int
+    http_max_keepalive: int
+    http_keepalive_expiry: float
+    ncbi_warmup: bool
+    redis_url: str | None
+    ncbi_cache_ttl: int
+    results_dir: str | None
+    parse_workers: int | None
+
+
+_SETTINGS: RuntimeSettings | None = None
+
+
+def get_settings() -> RuntimeSettings:
+    """Get the settings snapshot, validating the environment on first call."""
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = RuntimeSettings(**Settings().model_dump())
+    return _SETTINGS
@@ -1,8 +1,98 @@
 """CSV export utilities."""
+import csv
 import io
-from typing import Any
+from typing import Any, Iterable, Iterator
 
-import pandas as pd
+CSV_FIELDNAMES = (
+    "accession",
+    "version",
+    "locus",
+    "definition",
+    "organism",
+    "source",
+    "biosample",
+    "bioproject",
+    "keywords",
+    "taxonomy",
+    "assembly_accession",
+    "assembly_name",
+    "assembly_level",
+    "refseq_category",
+    "ref_authors",
+    "ref_title",
+    "ref_journal",
+    "ref_pubmed",
+)
+
+
+_EMPTY: dict[str, Any] = {}
+_NO_REFS = (_EMPTY,)
+
+
+def _rows(results: Iterable[dict[str, Any]]) -> Iterator[tuple[Any, ...]]:
+    """Yield one flattened row per result, in CSV_FIELDNAMES order."""
+    join = "; ".join
+    for r in results:
+        get = r.get
+        dblink = get("dblink") or _EMPTY
+        asm = get("assembly") or _EMPTY
+        # Only the first reference is exported
+        ref = (get("references") or _NO_REFS)[0]
+        yield (
+            get("accession", ""),
+            get("version", ""),
+            get("locus", ""),
+            get("definition", ""),
+            get("organism", ""),
+            get("source", ""),
+            dblink.get("biosample", ""),
+            dblink.get("bioproject", ""),
+            join(get("keywords") or ()),
+            join(get("taxonomy") or ()),
+            asm.get("accession", ""),
+            asm.get("name", ""),
+            asm.get("level", ""),
+            asm.get("refseq_category", ""),
+            ref.get("authors", ""),
+            ref.get("title", ""),
+            ref.get("journal", ""),
+            ref.get("pubmed", ""),
+        )
+
+
+# Rows formatted per yielded chunk; StreamingResponse hops to a thread for every
+# chunk of a sync iterator, so single-row chunks would cost more than they save
+_ROWS_PER_CHUNK = 256
+
+
+def iter_results_to_csv(results: list[dict[str, Any]]) -> Iterator[str]:
+    """
+    Export metadata results to CSV format incrementally.
+
+    Args:
+        results: List of metadata dictionaries
+
+    Yields:
+        CSV text chunks (header first), each holding up to _ROWS_PER_CHUNK rows
+    """
+    if not results:
+        yield "No results to export"
+        return
+
+    csv_buffer = io.StringIO()
+    writer = csv.writer(csv_buffer, lineterminator="\n")
+    writer.writerow(CSV_FIELDNAMES)
+    pending = 0
+    for row in _rows(results):
+        writer.writerow(row)
+        pending += 1
+        if pending == _ROWS_PER_CHUNK:
+            yield csv_buffer.getvalue()
+            csv_buffer.seek(0)
+            csv_buffer.truncate(0)
+            pending = 0
+    if tail := csv_buffer.getvalue():
+        yield tail
 
 
 def export_results_to_csv(results: list[dict[str, Any]]) -> str:
@@ -15,47 +105,4 @@ def export_results_to_csv(results: list[dict[str, Any]]) -> str:
     Returns:
         CSV string
     """
-    if not results:
-        return "No results to export"
-
-    # Flatten nested structures for CSV
-    flattened = []
-    for result in results:
-        flat = {
-            "accession": result.get("accession", ""),
-            "version": result.get("version", ""),
-            "locus": result.get("locus", ""),
-            "definition": result.get("definition", ""),
-            "organism": result.get("organism", ""),
-            "source": result.get("source", ""),
-            "biosample": result.get("dblink", {}).get("biosample", ""),
-            "bioproject": result.get("dblink", {}).get("bioproject", ""),
-            "keywords": "; ".join(result.get("keywords", [])),
-            "taxonomy": "; ".join(result.get("taxonomy", [])),
-            "assembly_accession": result.get("assembly", {}).get("accession", ""),
-            "assembly_name": result.get("assembly", {}).get("name", ""),
-            "assembly_level": result.get("assembly", {}).get("level", ""),
-            "refseq_category": result.get("assembly", {}).get("refseq_category", ""),
-        }
-        
-        # Add first reference if available
-        refs = result.get("references", [])
-        if refs:
-            ref = refs[0]
-            flat["ref_authors"] = ref.get("authors", "")
-            flat["ref_title"] = ref.get("title", "")
-            flat["ref_journal"] = ref.get("journal", "")
-            flat["ref_pubmed"] = ref.get("pubmed", "")
-        else:
-            flat["ref_authors"] = ""
-            flat["ref_title"] = ""
-            flat["ref_journal"] = ""
-            flat["ref_pubmed"] = ""
-        
-        flattened.append(flat)
-    
-    # Create DataFrame and export to CSV
-    df = pd.DataFrame(flattened)
-    csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
-    return csv_buffer.getvalue()
+    return "".join(iter_results_to_csv(results))
@@ -1,4 +1,5 @@
 """GenBank record parsing utilities."""
+import logging
 from io import StringIO
 from typing import Any
 
@@ -8,6 +9,13 @@ try:
 except ImportError:
     BIOPYTHON_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+_BIOSAMPLE = "BioSample:"
+_BIOPROJECT = "BioProject:"
+_DBLINK_PREFIXES = (_BIOSAMPLE, _BIOPROJECT)
+_DBLINK_KEYS = {"BioSample": "biosample", "BioProject": "bioproject"}
+
 
 def parse_genbank_record(genbank_text: str) -> dict[str, Any] | None:
     """
@@ -26,37 +34,32 @@ def parse_genbank_record(genbank_text: str) -> dict[str, Any] | None:
         handle = StringIO(genbank_text)
         record = SeqIO.read(handle, "genbank")
 
+        annotations = record.annotations
+
         # Extract DBLINK
         dblink = {"biosample": None, "bioproject": None}
-        if hasattr(record, "dbxrefs") and record.dbxrefs:
-            for ref in record.dbxrefs:
-                if ref.startswith("BioSample:"):
-                    dblink["biosample"] = ref.replace("BioSample:", "")
-                elif ref.startswith("BioProject:"):
-                    dblink["bioproject"] = ref.replace("BioProject:", "")
-
-        # Extract keywords
-        keywords = []
-        if hasattr(record, "annotations") and "keywords" in record.annotations:
-            keywords = record.annotations.get("keywords", [])
-
-        # Extract source and organism
-        source = record.annotations.get("source", "")
-        organism = record.annotations.get("organism", "")
-        taxonomy = record.annotations.get("taxonomy", [])
+        for ref in record.dbxrefs:
+            if ref.startswith(_DBLINK_PREFIXES):
+                key, _, value = ref.partition(":")
+                dblink[_DBLINK_KEYS[key]] = value
+
+        # Extract keywords, source and organism
+        keywords = annotations.get("keywords", [])
+        source = annotations.get("source", "")
+        organism = annotations.get("organism", "")
+        taxonomy = annotations.get("taxonomy", [])
 
         # Extract references
-        references = []
-        if hasattr(record, "annotations") and "references" in record.annotations:
-            for ref in record.annotations["references"]:
-                ref_data = {
-                    "authors": getattr(ref, "authors", ""),
-                    "title": getattr(ref, "title", ""),
-                    "journal": getattr(ref, "journal", ""),
-                    "pubmed": getattr(ref, "pubmed_id", None) or None,
-                    "remark": getattr(ref, "comment", None) or None,
-                }
-                references.append(ref_data)
+        references = [
+            {
+                "authors": getattr(ref, "authors", ""),
+                "title": getattr(ref, "title", ""),
+                "journal": getattr(ref, "journal", ""),
+                "pubmed": getattr(ref, "pubmed_id", None) or None,
+                "remark": getattr(ref, "comment", None) or None,
+            }
+            for ref in annotations.get("references", ())
+        ]
 
         return {
             "locus": record.name,
@@ -71,35 +74,195 @@ def parse_genbank_record(genbank_text: str) -> dict[str, Any] | None:
             "references": references,
         }
 
-    except Exception as e:
-        # Log parse error but don't crash
-        print(f"Failed to parse GenBank record: {e}")
+    except (ValueError, KeyError, AttributeError) as e:
+        # Malformed record: log and skip rather than failing the whole batch
+        logger.warning("Failed to parse GenBank record: %s", e)
         return None
 
 
-def parse_genbank_batch(genbank_text: str) -> list[dict[str, Any]]:
+_CONTINUATION = " " * 12
+_HEADER_END_KEYS = frozenset({"FEATURES", "ORIGIN", "//"})
+_REFERENCE_FIELDS = {
+    "AUTHORS": "authors",
+    "TITLE": "title",
+    "JOURNAL": "journal",
+    "PUBMED": "pubmed",
+    "REMARK": "remark",
+}
+
+
+def _split_semicolons(content: str) -> list[str]:
+    """Split a ';'-separated GenBank list, dropping the terminating period."""
+    if content.endswith("."):
+        content = content[:-1]
+    return [item.strip() for item in content.split(";")]
+
+
+def parse_genbank_header(genbank_text: str) -> dict[str, Any] | None:
     """
-    Parse multiple GenBank records from a single text block.
+    Extract metadata fields from a GenBank record by scanning its header lines.
+
+    This reads only the header (everything before FEATURES/ORIGIN) and builds no
+    SeqRecord, so it does not need Biopython. Output matches parse_genbank_record.
 
     Args:
-        genbank_text: GenBank format text with potentially multiple records
+        genbank_text: GenBank format text for a single record
 
     Returns:
-        List of parsed metadata dictionaries
+        Dictionary with extracted fields or None if no LOCUS line is found
     """
-    if not BIOPYTHON_AVAILABLE:
-        raise RuntimeError("Biopython is required for GenBank parsing but not installed")
+    # Group each keyword line with its 12-space-indented continuation lines
+    entries: list[tuple[str, list[str]]] = []
+    for line in genbank_text.splitlines():
+        if line.startswith(_CONTINUATION):
+            if entries:
+                entries[-1][1].append(line[12:].rstrip())
+            continue
+        key = line[:12].strip()
+        if key in _HEADER_END_KEYS or line.startswith("//"):
+            break
+        if key:
+            entries.append((key, [line[12:].strip()]))
 
-    results = []
-    try:
-        handle = StringIO(genbank_text)
-        for record in SeqIO.parse(handle, "genbank"):
-            # Reuse single-record parser logic
-            single_gb = record.format("genbank")
-            parsed = parse_genbank_record(single_gb)
-            if parsed:
-                results.append(parsed)
-    except Exception as e:
-        print(f"Failed to parse GenBank batch: {e}")
-
-    return results
+    locus = None
+    definition = ""
+    accession = ""
+    version = ""
+    dblink: dict[str, str | None] = {"biosample": None, "bioproject": None}
+    keywords: list[str] = []
+    source = ""
+    organism = ""
+    taxonomy: list[str] = []
+    references: list[dict[str, Any]] = []
+
+    for key, lines in entries:
+        if key == "LOCUS":
+            locus = lines[0].split()[0] if lines[0] else ""
+        elif key == "DEFINITION":
+            definition = " ".join(lines)
+            if definition.endswith("."):
+                definition = definition[:-1]
+        elif key == "ACCESSION":
+            tokens = " ".join(lines).replace(";", " ").split()
+            accession = tokens[0] if tokens else ""
+        elif key == "VERSION":
+            tokens = lines[0].split()
+            version = tokens[0] if tokens else ""
+        elif key == "DBLINK":
+            for entry in lines:
+                entry = entry.strip()
+                while ": " in entry:
+                    entry = entry.replace(": ", ":")
+                if entry.startswith(_DBLINK_PREFIXES):
+                    key, _, value = entry.partition(":")
+                    dblink[_DBLINK_KEYS[key]] = value
+        elif key == "KEYWORDS":
+            keywords = _split_semicolons(" ".join(lines))
+        elif key == "SOURCE":
+            source = " ".join(lines)
+            if source.endswith("."):
+                source = source[:-1]
+        elif key == "ORGANISM":
+            # Name may wrap; the lineage starts at the first line containing ';'
+            organism = lines[0]
+            lineage: list[str] = []
+            for extra in lines[1:]:
+                if lineage or ";" in extra:
+                    lineage.append(extra)
+                elif extra.strip() != ".":
+                    organism += " " + extra.strip()
+            lineage_text = " ".join(lineage).strip()
+            if lineage_text and lineage_text != ".":
+                taxonomy = [t for t in _split_semicolons(lineage_text) if t]
+        elif key == "REFERENCE":
+            references.append({"authors": "", "title": "", "journal": "", "pubmed": None, "remark": None})
+        elif key in _REFERENCE_FIELDS and references:
+            value = " ".join(lines)
+            field = _REFERENCE_FIELDS[key]
+            references[-1][field] = value if field in ("authors", "title", "journal") else (value or None)
+
+    if locus is None:
+        return None
+
+    record_id = version or accession or locus
+    return {
+        "locus": locus,
+        "definition": definition,
+        "accession": record_id.split(".")[0] if "." in record_id else record_id,
+        "version": record_id,
+        "dblink": dblink,
+        "keywords": keywords,
+        "source": source,
+        "organism": organism,
+        "taxonomy": taxonomy,
+        "references": references,
+    }
+
+
+class GenBankRecordSplitter:
+    """Incrementally split streamed GenBank text into records on ``//`` lines."""
+
+    def __init__(self, headers_only: bool = False):
+        """
+        Initialize the splitter.
+
+        Args:
+            headers_only: Keep only the lines before FEATURES/ORIGIN of each record,
+                which is all parse_genbank_header reads
+        """
+        self.headers_only = headers_only
+        self._partial = ""
+        self._lines: list[str] = []
+        self._in_body = False
+
+    def feed(self, chunk: str) -> list[str]:
+        """
+        Consume a chunk of text.
+
+        Args:
+            chunk: Next piece of the stream
+
+        Returns:
+            Records completed by this chunk
+        """
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        records = []
+        for line in lines:
+            if line.rstrip() == "//":
+                self._lines.append("//")
+                records.append("\n".join(self._lines))
+                self._lines = []
+                self._in_body = False
+            elif not self._in_body:
+                if self.headers_only and line.startswith(("FEATURES", "ORIGIN")):
+                    self._in_body = True
+                else:
+                    self._lines.append(line)
+        return records
+
+    def close(self) -> list[str]:
+        """
+        Flush any unterminated trailing record.
+
+        Returns:
+            The remaining record, if it has any content
+        """
+        records = self.feed("\n") if self._partial else []
+        if any(line.strip() for line in self._lines):
+            records.append("\n".join(self._lines))
+        self._lines = []
+        return records
+
+
+def parse_genbank_headers(records: list[str]) -> list[dict[str, Any]]:
+    """
+    Parse already-split GenBank records with parse_genbank_header.
+
+    Args:
+        records: One GenBank record (or record header) per item
+
+    Returns:
+        List of parsed metadata dictionaries, skipping unparseable records
+    """
+    return [parsed for text in records if (parsed := parse_genbank_header(text))]
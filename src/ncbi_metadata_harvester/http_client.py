@@ -1,10 +1,75 @@
 """HTTP client with retry logic and exponential backoff."""
 import asyncio
 import random
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
 
 import httpx
 
+from .config import get_settings
+
+T = TypeVar("T")
+
+# Gateway-style failures worth retrying from API clients
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+# Failures that guarantee the request never reached the server
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+async def with_retries(
+    request_factory: Callable[[], Awaitable[T]],
+    *,
+    idempotent: bool = True,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+) -> T:
+    """
+    Await ``request_factory()``, retrying transient failures with jittered backoff.
+
+    Retries on transport errors and 502/503/504 responses (returned or raised via
+    ``raise_for_status``), using ``max_retries``/``retry_base_delay``/``retry_max_delay``
+    from settings. Non-idempotent requests are only retried when the connection
+    could not be established, so a job is never submitted twice.
+
+    Args:
+        request_factory: Zero-argument callable returning a fresh awaitable per attempt
+        idempotent: Whether the request is safe to repeat after it may have been sent
+        sleep: Coroutine used to wait between retries
+
+    Returns:
+        Result of the last attempt
+    """
+    settings = get_settings()
+    for attempt in range(settings.max_retries + 1):
+        final = attempt == settings.max_retries
+        try:
+            result = await request_factory()
+        except httpx.HTTPStatusError as exc:
+            if final or not idempotent or exc.response.status_code not in RETRYABLE_STATUS_CODES:
+                raise
+        except httpx.TransportError as exc:
+            if final or not (idempotent or isinstance(exc, _NOT_SENT_ERRORS)):
+                raise
+        else:
+            retryable = (
+                idempotent
+                and isinstance(result, httpx.Response)
+                and result.status_code in RETRYABLE_STATUS_CODES
+            )
+            if final or not retryable:
+                return result
+        delay = min(settings.retry_max_delay, settings.retry_base_delay * 2**attempt)
+        await sleep(delay * random.uniform(0.5, 1.5))
+
+
+def _retry_after_seconds(response: httpx.Response) -> float:
+    """Return a numeric Retry-After header value in seconds, or 0 if absent/unparseable."""
+    try:
+        return max(0.0, float(response.headers.get("retry-after", 0)))
+    except ValueError:
+        # HTTP-date form; not worth parsing for NCBI
+        return 0.0
+
 
 class RetryableHTTPClient:
     """HTTP client with exponential backoff retry logic."""
@@ -15,8 +80,11 @@ class RetryableHTTPClient:
         base_delay: float = 0.5,
         max_delay: float = 8.0,
         timeout: float = 30.0,
-        http2: bool = False,
+        http2: bool = True,
         limits: httpx.Limits | None = None,
+        keepalive_expiry: float | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        max_concurrent_retries: int | None = None,
     ):
         """
         Initialize retryable HTTP client.
@@ -28,14 +96,30 @@ class RetryableHTTPClient:
             timeout: Request timeout (seconds)
             http2: Enable HTTP/2 if supported by the server
             limits: Connection pool limits
+            keepalive_expiry: Idle seconds before a pooled connection is dropped
+                (overrides the value in ``limits``; defaults to 60)
+            sleep: Coroutine used to wait between retries
+            max_concurrent_retries: Requests allowed to be backing off or retrying at
+                once across all callers (unbounded when None); first attempts are not limited
         """
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.timeout = timeout
+        self._sleep = sleep
+        self._retry_slots = asyncio.Semaphore(max_concurrent_retries) if max_concurrent_retries else None
         if limits is None:
-            limits = httpx.Limits(max_connections=10, max_keepalive_connections=10)
-        self._client = httpx.AsyncClient(timeout=timeout, http2=http2, limits=limits)
+            limits = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+        if keepalive_expiry is not None:
+            limits = httpx.Limits(
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+        # One explicit pooled transport so consecutive requests to a host reuse its
+        # TCP+TLS connection; connect retries stay at 0 since _request retries itself
+        transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits, retries=0)
+        self._client = httpx.AsyncClient(timeout=timeout, transport=transport)
 
     async def close(self) -> None:
         """Close the HTTP client."""
@@ -61,21 +145,58 @@ class RetryableHTTPClient:
 
         return False
 
-    def _calculate_backoff(self, attempt: int) -> float:
-        """Calculate exponential backoff with jitter."""
-        delay = min(self.base_delay * (2**attempt), self.max_delay)
-        # Add jitter (±25%)
-        jitter = delay * 0.25 * (2 * random.random() - 1)
-        return max(0, delay + jitter)
+    def _calculate_backoff(self, prev_delay: float = 0.0, response: httpx.Response | None = None) -> float:
+        """
+        Calculate the next retry delay using decorrelated jitter.
 
-    async def get(self, url: str, params: dict[str, Any] | None = None, **kwargs) -> httpx.Response:
+        Each delay is drawn from [base_delay, 3 * prev_delay] (capped at max_delay), so
+        concurrent retriers drift apart instead of retrying in lockstep. A Retry-After
+        header on the response, when present, sets a lower bound.
+
+        Args:
+            prev_delay: Delay used before the previous retry (0 on the first)
+            response: Response that triggered the retry, if any
+
+        Returns:
+            Delay in seconds
         """
-        GET request with retry logic.
+        upper = min(self.max_delay, max(self.base_delay, prev_delay) * 3)
+        delay = random.uniform(self.base_delay, max(self.base_delay, upper))
+        if response is not None:
+            delay = max(delay, _retry_after_seconds(response))
+        return delay
+
+    @asynccontextmanager
+    async def _retry_slot(self, attempt: int, delay: float) -> AsyncIterator[None]:
+        """
+        Wait out the backoff before a retry, holding a shared retry slot if capped.
+
+        During a 429/5xx storm this bounds how many retried requests are in flight,
+        so retries cannot pile onto a struggling server faster than first attempts.
 
         Args:
+            attempt: Zero-based attempt number (0 passes straight through)
+            delay: Backoff delay to sleep before the retry
+        """
+        if attempt == 0:
+            yield
+            return
+        if self._retry_slots is None:
+            await self._sleep(delay)
+            yield
+            return
+        async with self._retry_slots:
+            await self._sleep(delay)
+            yield
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request, retrying rate limits, server errors and network failures.
+
+        Args:
+            method: HTTP method
             url: Request URL
-            params: Query parameters
-            **kwargs: Additional arguments to pass to httpx
+            **kwargs: Arguments passed to ``httpx.AsyncClient.request``
 
         Returns:
             Response object
@@ -83,39 +204,79 @@ class RetryableHTTPClient:
         Raises:
             httpx.HTTPStatusError: On final failure after retries
         """
-        last_exception: Exception | None = None
+        retries = self.max_retries
+        delay = 0.0
+        for attempt in range(retries + 1):
+            async with self._retry_slot(attempt, delay):
+                try:
+                    response = await self._client.request(method, url, **kwargs)
+                except Exception as exc:
+                    if attempt == retries or not self._should_retry(None, exc):
+                        raise
+                    delay = self._calculate_backoff(delay)
+                    continue
+            if attempt == retries or not self._should_retry(response, None):
+                response.raise_for_status()
+                return response
+            delay = self._calculate_backoff(delay, response)
 
-        for attempt in range(self.max_retries + 1):
-            try:
-                response = await self._client.get(url, params=params, **kwargs)
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        Open a streaming request with retry logic.
 
-                if not self._should_retry(response, None):
-                    response.raise_for_status()
-                    return response
+        Retries apply until response headers arrive; once the response is yielded its
+        body is read by the caller and is not retried.
 
-                # Retry needed
-                if attempt < self.max_retries:
-                    delay = self._calculate_backoff(attempt)
-                    await asyncio.sleep(delay)
-                else:
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Arguments passed to ``httpx.AsyncClient.build_request``
+
+        Yields:
+            Response object with an unread body
+
+        Raises:
+            httpx.HTTPStatusError: On final failure after retries
+        """
+        retries = self.max_retries
+        delay = 0.0
+        for attempt in range(retries + 1):
+            async with self._retry_slot(attempt, delay):
+                try:
+                    response = await self._client.send(self._client.build_request(method, url, **kwargs), stream=True)
+                except Exception as exc:
+                    if attempt == retries or not self._should_retry(None, exc):
+                        raise
+                    delay = self._calculate_backoff(delay)
+                    continue
+            # The body is read outside the retry slot
+            if attempt == retries or not self._should_retry(response, None):
+                try:
                     response.raise_for_status()
-                    return response
+                    yield response
+                finally:
+                    await response.aclose()
+                return
+            await response.aclose()
+            delay = self._calculate_backoff(delay, response)
 
-            except Exception as exc:
-                last_exception = exc
-                if not self._should_retry(None, exc):
-                    raise
+    async def get(self, url: str, params: dict[str, Any] | None = None, **kwargs) -> httpx.Response:
+        """
+        GET request with retry logic.
 
-                if attempt < self.max_retries:
-                    delay = self._calculate_backoff(attempt)
-                    await asyncio.sleep(delay)
-                else:
-                    raise
+        Args:
+            url: Request URL
+            params: Query parameters
+            **kwargs: Additional arguments to pass to httpx
 
-        # Should not reach here, but satisfy type checker
-        if last_exception:
-            raise last_exception
-        raise RuntimeError("Unexpected retry loop exit")
+        Returns:
+            Response object
+
+        Raises:
+            httpx.HTTPStatusError: On final failure after retries
+        """
+        return await self._request("GET", url, params=params, **kwargs)
 
     async def post(
         self, url: str, data: Any = None, json: Any = None, **kwargs
@@ -132,34 +293,4 @@ class RetryableHTTPClient:
         Returns:
             Response object
         """
-        last_exception: Exception | None = None
-
-        for attempt in range(self.max_retries + 1):
-            try:
-                response = await self._client.post(url, data=data, json=json, **kwargs)
-
-                if not self._should_retry(response, None):
-                    response.raise_for_status()
-                    return response
-
-                if attempt < self.max_retries:
-                    delay = self._calculate_backoff(attempt)
-                    await asyncio.sleep(delay)
-                else:
-                    response.raise_for_status()
-                    return response
-
-            except Exception as exc:
-                last_exception = exc
-                if not self._should_retry(None, exc):
-                    raise
-
-                if attempt < self.max_retries:
-                    delay = self._calculate_backoff(attempt)
-                    await asyncio.sleep(delay)
-                else:
-                    raise
-
-        if last_exception:
-            raise last_exception
-        raise RuntimeError("Unexpected retry loop exit")
+        return await self._request("POST", url, data=data, json=json, **kwargs)
@@ -1,11 +1,183 @@
 """Background job processing logic."""
 import asyncio
-from typing import Any
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable
 
-from .genbank_parser import parse_genbank_record, parse_genbank_batch
+import orjson
+
+from .config import get_settings
+from .genbank_parser import GenBankRecordSplitter, parse_genbank_headers
 from .job_store import get_job_store
 from .models import JobStatus
-from .ncbi_client import NCBIClient
+from .ncbi_client import NCBIClient, get_ncbi_client
+from .result_files import persist_results
+
+# GenBank parsing is pure-Python CPU work; run it in worker processes so it
+# neither holds the GIL on the event loop's thread nor serializes across jobs
+_parse_pool: ProcessPoolExecutor | None = None
+
+# Records handed to a parse worker at a time while an efetch stream downloads
+_PARSE_CHUNK = 8
+
+# (result key, assembly esummary key) pairs copied onto each result
+_ASM_KEYS = (
+    ("accession", "assemblyaccession"),
+    ("name", "assemblyname"),
+    ("level", "assemblystatus"),
+    ("refseq_category", "refseq_category"),
+    ("submitter", "submitter"),
+    ("date", "seqreleasedate"),
+)
+# Accession jobs only report the first four
+_ASM_CORE_KEYS = _ASM_KEYS[:4]
+
+Pair = tuple[str, Any]
+
+# Process-wide memo of resolved (nuccore_id, assembly_doc) pairs plus in-flight
+# lookups, so duplicate accessions within and across jobs share one round trip.
+# Entries expire after _RESOLVED_TTL seconds so assembly revisions are picked up
+_RESOLVED_MAX = 4096
+_RESOLVED_TTL = 3600.0
+_resolved: dict[str, tuple[float, Pair]] = {}
+_in_flight: dict[str, asyncio.Future] = {}
+
+
+async def _coalesced(key: str, resolve: Callable[[], Awaitable[Pair | None]]) -> Pair | None:
+    """
+    Resolve ``key`` at most once at a time, memoizing successful results for ``_RESOLVED_TTL``.
+
+    Concurrent callers for the same key await the first caller's lookup. Failures are
+    not cached: a caller that only observed another caller's failure runs its own
+    ``resolve`` so the error is reported against its own job.
+
+    Args:
+        key: Cache key for the lookup
+        resolve: Zero-argument coroutine factory performing the lookup
+
+    Returns:
+        Resolved pair or None on failure
+    """
+    if (entry := _resolved.get(key)) is not None:
+        if entry[0] > time.monotonic():
+            return entry[1]
+        del _resolved[key]
+    if (pending := _in_flight.get(key)) is not None:
+        pair = await asyncio.shield(pending)
+        return pair if pair is not None else await resolve()
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    pair = None
+    try:
+        pair = await resolve()
+    finally:
+        del _in_flight[key]
+        future.set_result(pair)
+    if pair is not None:
+        if len(_resolved) >= _RESOLVED_MAX:
+            _resolved.pop(next(iter(_resolved)))
+        _resolved[key] = (time.monotonic() + _RESOLVED_TTL, pair)
+    return pair
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Get or create the shared GenBank parse pool, sized by PARSE_WORKERS."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=get_settings().parse_workers)
+    return _parse_pool
+
+
+async def shutdown_parse_pool() -> None:
+    """Shut down the shared parse pool, if one was created, dropping queued work."""
+    global _parse_pool
+    if _parse_pool is not None:
+        pool, _parse_pool = _parse_pool, None
+        await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+
+
+async def _complete_job(job_id: str) -> None:
+    """Snapshot results to disk when RESULTS_DIR is set, then mark the job succeeded."""
+    job_store = get_job_store()
+    if results_dir := get_settings().results_dir:
+        results, errors = await job_store.get_job_results(job_id) or ([], [])
+        try:
+            await persist_results(results_dir, job_id, results, errors)
+        except OSError as e:
+            # Results are still served from the job store
+            await job_store.add_job_error(job_id, f"Error saving results: {str(e)}")
+    await job_store.update_job_status(job_id, JobStatus.SUCCEEDED)
+
+
+async def _iter_parsed_batches(
+    client: NCBIClient, pairs: list[Pair], batch_size: int, sem: asyncio.Semaphore
+) -> AsyncIterator[tuple[list[Pair], set[str], list[dict[str, Any]]]]:
+    """
+    Fetch and parse GenBank batches concurrently, yielding them in batch order.
+
+    All efetch calls are started up front (bounded by ``sem``) and each response is
+    streamed and parsed in the process pool as records arrive, so downloads overlap
+    parsing and the full response text is never buffered.
+    A nuccore ID is only fetched by the first batch that contains it.
+
+    Args:
+        client: Open NCBI client
+        pairs: (nuccore_id, assembly_doc) pairs to fetch
+        batch_size: Number of IDs per efetch request
+        sem: Semaphore bounding concurrent NCBI requests
+
+    Yields:
+        (batch, IDs fetched for this batch, parsed records in fetch order)
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_parse_pool()
+    batches = [pairs[i : i + batch_size] for i in range(0, len(pairs), batch_size)]
+    fetch_lists: list[list[str]] = []
+    scheduled: set[str] = set()
+    for batch in batches:
+        ids_to_fetch = [nid for nid, _ in batch if nid not in scheduled]
+        scheduled.update(ids_to_fetch)
+        fetch_lists.append(ids_to_fetch)
+
+    async def fetch_and_parse(index: int) -> tuple[int, list[dict[str, Any]]]:
+        ids_to_fetch = fetch_lists[index]
+        if not ids_to_fetch:
+            return index, []
+        # Split records off the stream and parse them in mini-batches while the
+        # rest of the response is still downloading
+        splitter = GenBankRecordSplitter(headers_only=True)
+        pending: list[str] = []
+        parse_futures: list[asyncio.Future] = []
+        async with sem:
+            async with client.efetch_stream(
+                db="nuccore", id=ids_to_fetch, rettype="gb", retmode="text", cache_headers=True
+            ) as gb_resp:
+                async for chunk in gb_resp.aiter_text():
+                    pending.extend(splitter.feed(chunk))
+                    if len(pending) >= _PARSE_CHUNK:
+                        parse_futures.append(loop.run_in_executor(pool, parse_genbank_headers, pending))
+                        pending = []
+        pending.extend(splitter.close())
+        if pending:
+            parse_futures.append(loop.run_in_executor(pool, parse_genbank_headers, pending))
+        parsed_list = [parsed for part in await asyncio.gather(*parse_futures) for parsed in part]
+        return index, parsed_list
+
+    tasks = [asyncio.create_task(fetch_and_parse(i)) for i in range(len(batches))]
+    slots: list[list[dict[str, Any]] | None] = [None] * len(batches)
+    next_index = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, parsed_list = await next_done
+            slots[index] = parsed_list
+            # Release every batch whose predecessors have all completed
+            while next_index < len(batches) and slots[next_index] is not None:
+                yield batches[next_index], set(fetch_lists[next_index]), slots[next_index]  # type: ignore[misc]
+                next_index += 1
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 async def process_query_job(job_id: str, input_data: dict[str, Any]) -> None:
@@ -17,6 +189,7 @@ async def process_query_job(job_id: str, input_data: dict[str, Any]) -> None:
         input_data: Job input parameters (organism, keywords, filters, limit)
     """
     job_store = get_job_store()
+    settings = get_settings()
     
     try:
         await job_store.update_job_status(job_id, JobStatus.RUNNING)
@@ -50,130 +223,125 @@ async def process_query_job(job_id: str, input_data: dict[str, Any]) -> None:
         
         term = " AND ".join(search_terms)
         
-        async with NCBIClient() as client:
-            # Search assemblies
-            search_resp = await client.esearch(db="assembly", term=term, retmax=limit)
-            search_data = search_resp.json()
-            
-            id_list = search_data.get("esearchresult", {}).get("idlist", [])
-            
-            if not id_list:
-                await job_store.add_job_error(job_id, "No assemblies found matching criteria")
-                await job_store.update_job_status(job_id, JobStatus.SUCCEEDED)
-                return
-            
-            # Get assembly summaries
+        client = get_ncbi_client()
+        # Search assemblies, keeping the hits on the NCBI history server
+        search_resp = await client.esearch(db="assembly", term=term, retmax=limit, usehistory="y")
+        search_data = orjson.loads(search_resp.content)
+        
+        esearch_result = search_data.get("esearchresult", {})
+        id_list = esearch_result.get("idlist", [])
+        
+        if not id_list:
+            await job_store.add_job_error(job_id, "No assemblies found matching criteria")
+            await _complete_job(job_id)
+            return
+        
+        # Get assembly summaries from the search history instead of re-sending the IDs
+        webenv = esearch_result.get("webenv")
+        query_key = esearch_result.get("querykey")
+        if webenv and query_key:
+            summary_resp = await client.esummary(
+                db="assembly", WebEnv=webenv, query_key=query_key, retstart=0, retmax=limit
+            )
+        else:
             summary_resp = await client.esummary(db="assembly", id=id_list)
-            summary_data = summary_resp.json()
-            
-            result = summary_data.get("result", {})
+        summary_data = orjson.loads(summary_resp.content)
+        
+        result = summary_data.get("result", {})
+        
+        # Filter for RefSeq if requested (GCF_ prefix)
+        prefer_refseq = filters.get("source_db_preference") == "RefSeq"
+        filtered_ids = []
+        
+        # id_list comes from esearch, so it never holds esummary's "uids" key
+        for uid in id_list:
+            assembly_doc = result.get(uid, {})
+            assembly_acc = assembly_doc.get("assemblyaccession", "")
             
-            # Filter for RefSeq if requested (GCF_ prefix)
-            prefer_refseq = filters.get("source_db_preference") == "RefSeq"
-            filtered_ids = []
+            # Apply RefSeq filter if requested
+            if prefer_refseq and not assembly_acc.startswith("GCF_"):
+                continue
             
-            for uid in id_list:
-                if uid == "uids":
-                    continue
+            filtered_ids.append(uid)
+            if len(filtered_ids) >= limit:
+                break
+        
+        if not filtered_ids:
+            await job_store.add_job_error(job_id, "No assemblies found after filtering")
+            await _complete_job(job_id)
+            return
+        
+        # Update progress total
+        await job_store.update_job_progress(job_id, total=len(filtered_ids))
+
+        # Bounded concurrency for faster processing
+        concurrency = max(1, settings.ncbi_concurrency)
+        sem = asyncio.Semaphore(concurrency)
+
+        async def link_primary(uid: str):
+            async with sem:
                 assembly_doc = result.get(uid, {})
                 assembly_acc = assembly_doc.get("assemblyaccession", "")
-                
-                # Apply RefSeq filter if requested
-                if prefer_refseq and not assembly_acc.startswith("GCF_"):
-                    continue
-                
-                filtered_ids.append(uid)
-                if len(filtered_ids) >= limit:
-                    break
-            
-            if not filtered_ids:
-                await job_store.add_job_error(job_id, "No assemblies found after filtering")
-                await job_store.update_job_status(job_id, JobStatus.SUCCEEDED)
-                return
-            
-            # Update progress total
-            await job_store.update_job_progress(job_id, total=len(filtered_ids))
+                try:
+                    # Link to nuccore to get representative sequence
+                    link_resp = await client.elink(
+                        dbfrom="assembly",
+                        db="nuccore",
+                        id=uid,
+                        linkname="assembly_nuccore_refseq",
+                    )
+                    link_data = orjson.loads(link_resp.content)
+                    nuccore_ids: list[str] = []
+                    linksets = link_data.get("linksets", [])
+                    if linksets:
+                        linksetdbs = linksets[0].get("linksetdbs", [])
+                        if linksetdbs:
+                            nuccore_ids = linksetdbs[0].get("links", [])
+                    if not nuccore_ids:
+                        await job_store.add_job_error(job_id, f"No nuccore link for {assembly_acc}")
+                        return None
+                    return (nuccore_ids[0], assembly_doc)
+                except Exception as e:
+                    await job_store.add_job_error(job_id, f"Error linking assembly {assembly_acc}: {str(e)}")
+                    return None
 
-            # Bounded concurrency for faster processing
-            from .config import get_settings
-            concurrency = max(1, get_settings().ncbi_concurrency)
-            sem = asyncio.Semaphore(concurrency)
+        async def resolve_primary(uid: str):
+            return await _coalesced(f"assembly-uid:{uid}", lambda: link_primary(uid))
 
-            async def resolve_primary(uid: str):
-                if uid == "uids":
-                    return None
-                async with sem:
-                    assembly_doc = result.get(uid, {})
-                    assembly_acc = assembly_doc.get("assemblyaccession", "")
-                    try:
-                        # Link to nuccore to get representative sequence
-                        link_resp = await client.elink(
-                            dbfrom="assembly",
-                            db="nuccore",
-                            id=uid,
-                            linkname="assembly_nuccore_refseq",
-                        )
-                        link_data = link_resp.json()
-                        nuccore_ids: list[str] = []
-                        linksets = link_data.get("linksets", [])
-                        if linksets:
-                            linksetdbs = linksets[0].get("linksetdbs", [])
-                            if linksetdbs:
-                                nuccore_ids = linksetdbs[0].get("links", [])
-                        if not nuccore_ids:
-                            await job_store.add_job_error(job_id, f"No nuccore link for {assembly_acc}")
-                            return None
-                        return (nuccore_ids[0], assembly_doc)
-                    except Exception as e:
-                        await job_store.add_job_error(job_id, f"Error linking assembly {assembly_acc}: {str(e)}")
-                        return None
+        # Resolve all primary nuccore IDs concurrently
+        resolved = await asyncio.gather(*[resolve_primary(uid) for uid in filtered_ids])
+        pairs = [(nid, doc) for nid, doc in resolved if nid is not None]  # type: ignore[misc]
+        if not pairs:
+            await _complete_job(job_id)
+            return
 
-            # Resolve all primary nuccore IDs concurrently
-            resolved = await asyncio.gather(*[resolve_primary(uid) for uid in filtered_ids])
-            pairs = [(nid, doc) for nid, doc in resolved if nid is not None]  # type: ignore[misc]
-            if not pairs:
-                await job_store.update_job_status(job_id, JobStatus.SUCCEEDED)
-                return
-
-            # Batch efetch and parse
-            from .config import get_settings
-            batch_size = max(1, get_settings().ncbi_batch_size)
-            gb_cache: dict[str, dict[str, Any]] = {}
-
-            for i in range(0, len(pairs), batch_size):
-                batch = pairs[i : i + batch_size]
-                # Identify which IDs need fetching (not cached)
-                ids_to_fetch = [nid for nid, _ in batch if nid not in gb_cache]
-                parsed_list: list[dict[str, Any]] = []
-                if ids_to_fetch:
-                    gb_resp = await client.efetch(db="nuccore", id=ids_to_fetch, rettype="gb", retmode="text")
-                    gb_text = gb_resp.text
-                    parsed_list = await asyncio.to_thread(parse_genbank_batch, gb_text)
-                # Map parsed records back to ids in order
-                idx = 0
-                for nid, assembly_doc in batch:
-                    parsed = gb_cache.get(nid)
-                    if parsed is None:
-                        if idx < len(parsed_list):
-                            parsed = parsed_list[idx]
-                            idx += 1
-                            if parsed:
-                                gb_cache[nid] = parsed
-                    if parsed:
-                        enriched = dict(parsed)
-                        enriched["assembly"] = {
-                            "accession": assembly_doc.get("assemblyaccession", ""),
-                            "name": assembly_doc.get("assemblyname", ""),
-                            "level": assembly_doc.get("assemblystatus", ""),
-                            "refseq_category": assembly_doc.get("refseq_category", ""),
-                            "submitter": assembly_doc.get("submitter", ""),
-                            "date": assembly_doc.get("seqreleasedate", ""),
-                        }
-                        await job_store.add_job_result(job_id, enriched)
-                    else:
-                        await job_store.add_job_error(job_id, "Failed to parse GenBank record")
-            
-        await job_store.update_job_status(job_id, JobStatus.SUCCEEDED)
+        # Batch efetch and parse, pipelined
+        batch_size = max(1, settings.ncbi_batch_size)
+        gb_cache: dict[str, dict[str, Any]] = {}
+
+        async for batch, fetched, parsed_list in _iter_parsed_batches(client, pairs, batch_size, sem):
+            # Map parsed records back to ids in order
+            batch_results: list[dict[str, Any]] = []
+            batch_errors: list[str] = []
+            idx = 0
+            for nid, assembly_doc in batch:
+                parsed = gb_cache.get(nid)
+                if parsed is None and nid in fetched:
+                    if idx < len(parsed_list):
+                        parsed = parsed_list[idx]
+                        idx += 1
+                        if parsed:
+                            gb_cache[nid] = parsed
+                if parsed:
+                    enriched = parsed.copy()
+                    enriched["assembly"] = {out: assembly_doc.get(key, "") for out, key in _ASM_KEYS}
+                    batch_results.append(enriched)
+                else:
+                    batch_errors.append("Failed to parse GenBank record")
+            await job_store.add_job_results_bulk(job_id, batch_results)
+            await job_store.add_job_errors_bulk(job_id, batch_errors)
+        
+        await _complete_job(job_id)
     
     except Exception as e:
         await job_store.add_job_error(job_id, f"Job failed: {str(e)}")
@@ -189,6 +357,7 @@ async def process_accession_job(job_id: str, input_data: dict[str, Any]) -> None
         input_data: Job input parameters (accessions, filters)
     """
     job_store = get_job_store()
+    settings = get_settings()
     
     try:
         await job_store.update_job_status(job_id, JobStatus.RUNNING)
@@ -198,99 +367,100 @@ async def process_accession_job(job_id: str, input_data: dict[str, Any]) -> None
         # Set total for progress
         await job_store.update_job_progress(job_id, total=len(accessions))
 
-        async with NCBIClient() as client:
-            from .config import get_settings
-            concurrency = max(1, get_settings().ncbi_concurrency)
-            sem = asyncio.Semaphore(concurrency)
-
-            async def resolve_accession(accession: str):
-                async with sem:
-                    try:
-                        # Detect accession type
-                        if accession.startswith("GCF_") or accession.startswith("GCA_"):
-                            # Assembly accession - search by accession
-                            search_resp = await client.esearch(
-                                db="assembly",
-                                term=f"{accession}[Assembly Accession]",
-                                retmax=1,
-                            )
-                            search_data = search_resp.json()
-                            assembly_ids = search_data.get("esearchresult", {}).get("idlist", [])
-                            if not assembly_ids:
-                                await job_store.add_job_error(job_id, f"Assembly not found: {accession}")
-                                return None
-                            # Get assembly summary
-                            summary_resp = await client.esummary(db="assembly", id=assembly_ids[0])
-                            summary_data = summary_resp.json()
-                            assembly_doc = summary_data.get("result", {}).get(assembly_ids[0], {})
-                            # Link to nuccore
-                            link_resp = await client.elink(
-                                dbfrom="assembly",
-                                db="nuccore",
-                                id=assembly_ids[0],
-                                linkname="assembly_nuccore_refseq",
-                            )
-                            link_data = link_resp.json()
-                            nuccore_ids = []
-                            linksets = link_data.get("linksets", [])
-                            if linksets:
-                                linksetdbs = linksets[0].get("linksetdbs", [])
-                                if linksetdbs:
-                                    nuccore_ids = linksetdbs[0].get("links", [])
-                            if not nuccore_ids:
-                                await job_store.add_job_error(job_id, f"No nuccore link for {accession}")
-                                return None
-                            return (nuccore_ids[0], assembly_doc)
-                        else:
-                            # Nuccore accession (NC_, NZ_, CP_, etc.) -- fetch directly
-                            return (accession, None)
-                    except Exception as e:
-                        await job_store.add_job_error(job_id, f"Error resolving {accession}: {str(e)}")
-                        return None
+        client = get_ncbi_client()
+        concurrency = max(1, settings.ncbi_concurrency)
+        sem = asyncio.Semaphore(concurrency)
+
+        async def lookup_accession(accession: str):
+            async with sem:
+                try:
+                    # Detect accession type
+                    if accession.startswith("GCF_") or accession.startswith("GCA_"):
+                        # Assembly accession - search by accession
+                        search_resp = await client.esearch(
+                            db="assembly",
+                            term=f"{accession}[Assembly Accession]",
+                            retmax=1,
+                        )
+                        search_data = orjson.loads(search_resp.content)
+                        assembly_ids = search_data.get("esearchresult", {}).get("idlist", [])
+                        if not assembly_ids:
+                            await job_store.add_job_error(job_id, f"Assembly not found: {accession}")
+                            return None
+                        # Link to nuccore (the summary is fetched later, batched)
+                        link_resp = await client.elink(
+                            dbfrom="assembly",
+                            db="nuccore",
+                            id=assembly_ids[0],
+                            linkname="assembly_nuccore_refseq",
+                        )
+                        link_data = orjson.loads(link_resp.content)
+                        nuccore_ids = []
+                        linksets = link_data.get("linksets", [])
+                        if linksets:
+                            linksetdbs = linksets[0].get("linksetdbs", [])
+                            if linksetdbs:
+                                nuccore_ids = linksetdbs[0].get("links", [])
+                        if not nuccore_ids:
+                            await job_store.add_job_error(job_id, f"No nuccore link for {accession}")
+                            return None
+                        return (nuccore_ids[0], assembly_ids[0])
+                    else:
+                        # Nuccore accession (NC_, NZ_, CP_, etc.) -- fetch directly
+                        return (accession, None)
+                except Exception as e:
+                    await job_store.add_job_error(job_id, f"Error resolving {accession}: {str(e)}")
+                    return None
+
+        async def resolve_accession(accession: str):
+            if accession.startswith(("GCF_", "GCA_")):
+                return await _coalesced(f"assembly-acc:{accession}", lambda: lookup_accession(accession))
+            return await lookup_accession(accession)
+
+        # Resolve to (nuccore_id, assembly_uid | None), then fetch all assembly
+        # summaries in a few batched history-server requests
+        resolved = [r for r in await asyncio.gather(*[resolve_accession(a) for a in accessions]) if r]
+        assembly_uids = list(dict.fromkeys(uid for _, uid in resolved if uid))
+        assembly_docs: dict[str, dict[str, Any]] = {}
+        if assembly_uids:
+            try:
+                async for summary_resp in client.esummary_batched(db="assembly", ids=assembly_uids):
+                    assembly_docs.update(orjson.loads(summary_resp.content).get("result", {}))
+            except Exception as e:
+                await job_store.add_job_error(job_id, f"Error fetching assembly summaries: {str(e)}")
+        pairs = [(nid, assembly_docs.get(uid, {}) if uid else None) for nid, uid in resolved]
+        if not pairs:
+            await _complete_job(job_id)
+            return
+
+        batch_size = max(1, settings.ncbi_batch_size)
+        gb_cache: dict[str, dict[str, Any]] = {}
 
-            resolved = await asyncio.gather(*[resolve_accession(a) for a in accessions])
-            pairs = [(nid, doc) for nid, doc in resolved if nid is not None]  # type: ignore[misc]
-            if not pairs:
-                await job_store.update_job_status(job_id, JobStatus.SUCCEEDED)
-                return
-
-            from .config import get_settings
-            batch_size = max(1, get_settings().ncbi_batch_size)
-            gb_cache: dict[str, dict[str, Any]] = {}
-
-            for i in range(0, len(pairs), batch_size):
-                batch = pairs[i : i + batch_size]
-                ids_to_fetch = [nid for nid, _ in batch if nid not in gb_cache]
-                parsed_list: list[dict[str, Any]] = []
-                if ids_to_fetch:
-                    gb_resp = await client.efetch(db="nuccore", id=ids_to_fetch, rettype="gb", retmode="text")
-                    gb_text = gb_resp.text
-                    parsed_list = await asyncio.to_thread(parse_genbank_batch, gb_text)
-                idx = 0
-                for nid, assembly_doc in batch:
-                    parsed = gb_cache.get(nid)
-                    if parsed is None:
-                        if idx < len(parsed_list):
-                            parsed = parsed_list[idx]
-                            idx += 1
-                            if parsed:
-                                gb_cache[nid] = parsed
-                    if parsed:
-                        enriched = dict(parsed)
-                        if assembly_doc:
-                            enriched["assembly"] = {
-                                "accession": assembly_doc.get("assemblyaccession", ""),
-                                "name": assembly_doc.get("assemblyname", ""),
-                                "level": assembly_doc.get("assemblystatus", ""),
-                                "refseq_category": assembly_doc.get("refseq_category", ""),
-                            }
-                        else:
-                            enriched.setdefault("assembly", {"accession": None, "name": None, "level": None})
-                        await job_store.add_job_result(job_id, enriched)
+        async for batch, fetched, parsed_list in _iter_parsed_batches(client, pairs, batch_size, sem):
+            batch_results: list[dict[str, Any]] = []
+            batch_errors: list[str] = []
+            idx = 0
+            for nid, assembly_doc in batch:
+                parsed = gb_cache.get(nid)
+                if parsed is None and nid in fetched:
+                    if idx < len(parsed_list):
+                        parsed = parsed_list[idx]
+                        idx += 1
+                        if parsed:
+                            gb_cache[nid] = parsed
+                if parsed:
+                    enriched = parsed.copy()
+                    if assembly_doc:
+                        enriched["assembly"] = {out: assembly_doc.get(key, "") for out, key in _ASM_CORE_KEYS}
                     else:
-                        await job_store.add_job_error(job_id, f"Failed to parse GenBank for {nid}")
+                        enriched.setdefault("assembly", {"accession": None, "name": None, "level": None})
+                    batch_results.append(enriched)
+                else:
+                    batch_errors.append(f"Failed to parse GenBank for {nid}")
+            await job_store.add_job_results_bulk(job_id, batch_results)
+            await job_store.add_job_errors_bulk(job_id, batch_errors)
         
-        await job_store.update_job_status(job_id, JobStatus.SUCCEEDED)
+        await _complete_job(job_id)
     
     except Exception as e:
         await job_store.add_job_error(job_id, f"Job failed: {str(e)}")
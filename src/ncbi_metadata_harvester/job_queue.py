@@ -0,0 +1,213 @@
+"""Redis-backed job queue with per-job leases for multi-worker deployments."""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Any, Awaitable, Callable
+
+from .job_processor import process_accession_job, process_query_job
+from .job_store import RedisJobStore, get_job_store
+from .models import JobStatus
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+Processor = Callable[[str, dict[str, Any]], Awaitable[None]]
+
+
+def _processor_for(input_data: dict[str, Any]) -> Processor:
+    """Pick the job processor matching a job's stored request body."""
+    return process_accession_job if "accessions" in input_data else process_query_job
+
+
+class RedisJobQueue:
+    """
+    Job queue shared by all workers through Redis.
+
+    Submitted job IDs are pushed onto a list; each worker pops them and runs a job
+    only after taking its lease (``SET lock:{id} <worker> NX EX``), renewing the
+    lease while the job runs. A job left ``running`` without a lease (its worker
+    died) is reset and requeued by the periodic orphan scan.
+    """
+
+    QUEUE_KEY = "jobs:queue"
+
+    def __init__(
+        self,
+        store: RedisJobStore,
+        worker_id: str | None = None,
+        lease_ttl: int = 300,
+        renew_interval: float = 60.0,
+        max_jobs: int = 4,
+        poll_timeout: float = 5.0,
+        error_backoff: float = 5.0,
+    ):
+        """
+        Initialize job queue.
+
+        Args:
+            store: Redis job store holding job state
+            worker_id: Lease owner name (defaults to host, pid and a random suffix)
+            lease_ttl: Seconds a lease survives without renewal
+            renew_interval: Seconds between lease renewals while a job runs
+            max_jobs: Jobs this worker runs concurrently
+            poll_timeout: Seconds each blocking pop waits before checking for orphans
+            error_backoff: Seconds to wait before polling again after a Redis error
+        """
+        self.store = store
+        self.client = store.client
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_ttl = lease_ttl
+        self.renew_interval = renew_interval
+        self.poll_timeout = poll_timeout
+        self.error_backoff = error_backoff
+        self._slots = asyncio.Semaphore(max_jobs)
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _lock_key(job_id: str) -> str:
+        return f"lock:{job_id}"
+
+    async def submit(self, job_id: str) -> None:
+        """
+        Queue a created job for execution by any worker.
+
+        Args:
+            job_id: Job identifier
+        """
+        await self.client.lpush(self.QUEUE_KEY, job_id)
+
+    async def _owns_lease(self, key: str, action: Callable[[Any], None]) -> bool:
+        """Apply ``action`` to a pipeline on ``key`` only while this worker holds the lease."""
+        async with self.client.pipeline() as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) != self.worker_id.encode():
+                    return False
+                pipe.multi()
+                action(pipe)
+                await pipe.execute()
+            except redis.WatchError:
+                return False
+        return True
+
+    async def _renew(self, key: str) -> None:
+        """Extend the lease every ``renew_interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            if not await self._owns_lease(key, lambda pipe: pipe.expire(key, self.lease_ttl)):
+                logger.warning("Lost lease %s; another worker may rerun the job", key)
+                return
+
+    async def execute(self, job_id: str) -> bool:
+        """
+        Run a queued job if its lease can be taken.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Whether this worker ran the job
+        """
+        key = self._lock_key(job_id)
+        if not await self.client.set(key, self.worker_id, nx=True, ex=self.lease_ttl):
+            return False
+        try:
+            job = await self.store.get_job(job_id)
+            # Duplicate queue entries for finished or running jobs are dropped here
+            if job is None or job.status != JobStatus.QUEUED:
+                return False
+            renewer = asyncio.create_task(self._renew(key))
+            try:
+                await _processor_for(job.input_data)(job_id, job.input_data)
+            finally:
+                renewer.cancel()
+            return True
+        finally:
+            await self._owns_lease(key, lambda pipe: pipe.delete(key))
+
+    async def requeue_orphans(self) -> list[str]:
+        """
+        Reset and requeue running jobs whose lease has expired.
+
+        Returns:
+            IDs of the requeued jobs
+        """
+        job_ids = [raw.decode() for raw in await self.client.zrange(RedisJobStore.INDEX_KEY, 0, -1)]
+        if not job_ids:
+            return []
+        async with self.client.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hget(RedisJobStore._key(job_id), "status")
+                pipe.exists(self._lock_key(job_id))
+            replies = await pipe.execute()
+        orphans = [
+            job_id
+            for job_id, status, locked in zip(job_ids, replies[::2], replies[1::2])
+            if status == JobStatus.RUNNING.value.encode() and not locked
+        ]
+        for job_id in orphans:
+            logger.warning("Requeueing orphaned job %s", job_id)
+            await self.store.reset_job(job_id)
+            await self.submit(job_id)
+        return orphans
+
+    async def _run_slot(self, job_id: str) -> None:
+        """Execute one job and free its slot, logging rather than raising failures."""
+        try:
+            await self.execute(job_id)
+        except Exception:
+            logger.exception("Job %s failed in worker %s", job_id, self.worker_id)
+        finally:
+            self._slots.release()
+
+    async def run(self) -> None:
+        """Consume the queue until cancelled, scanning for orphans between pops."""
+        loop = asyncio.get_running_loop()
+        next_scan = loop.time()
+        try:
+            while True:
+                acquired = False
+                try:
+                    if loop.time() >= next_scan:
+                        await self.requeue_orphans()
+                        next_scan = loop.time() + self.lease_ttl
+                    await self._slots.acquire()
+                    acquired = True
+                    item = await self.client.blpop([self.QUEUE_KEY], timeout=self.poll_timeout)
+                except Exception:
+                    # A dropped connection must not end the consumer; back off and retry
+                    if acquired:
+                        self._slots.release()
+                    logger.exception("Queue poll failed in worker %s", self.worker_id)
+                    await asyncio.sleep(self.error_backoff)
+                    continue
+                if item is None:
+                    self._slots.release()
+                    continue
+                task = asyncio.create_task(self._run_slot(item[1].decode()))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+_job_queue: RedisJobQueue | None = None
+
+
+def get_job_queue() -> RedisJobQueue | None:
+    """Get the global job queue, or None when jobs run in-process (no REDIS_URL)."""
+    global _job_queue
+    if _job_queue is None:
+        store = get_job_store()
+        if isinstance(store, RedisJobStore):
+            _job_queue = RedisJobQueue(store)
+    return _job_queue
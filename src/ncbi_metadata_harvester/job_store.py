@@ -1,15 +1,36 @@
 """In-memory job store and management."""
 import asyncio
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
-from typing import Any
+from itertools import islice
+from typing import Any, AsyncIterator
 
+import orjson
+
+from .config import get_settings
 from .models import JobProgress, JobStatus
 
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+# Statuses after which a job no longer changes
+TERMINAL_STATUSES = frozenset({JobStatus.SUCCEEDED, JobStatus.FAILED})
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Job:
-    """Represents a metadata harvesting job."""
+    """
+    Snapshot of a metadata harvesting job.
+
+    Snapshots are immutable, so readers can hold one without copying; every change
+    produces a new snapshot. The results and errors lists are append-only and
+    shared between a job's snapshots, with ``progress`` recording how many
+    of each the snapshot covers.
+    """
 
     job_id: str
     status: JobStatus
@@ -20,30 +41,28 @@ class Job:
     results: list[dict[str, Any]] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
 
-    def update_progress(self, completed: int | None = None, errors: int | None = None, total: int | None = None) -> None:
-        """Update job progress and timestamp."""
-        if completed is not None:
-            self.progress.completed = completed
-        if errors is not None:
-            self.progress.errors = errors
-        if total is not None:
-            self.progress.total = total
-        self.updated_at = datetime.now(timezone.utc)
+    def with_progress(self, completed: int | None = None, errors: int | None = None, total: int | None = None) -> "Job":
+        """Return a snapshot with updated progress and timestamp."""
+        update = {
+            name: value
+            for name, value in (("completed", completed), ("errors", errors), ("total", total))
+            if value is not None
+        }
+        return replace(self, progress=self.progress.model_copy(update=update), updated_at=datetime.now(timezone.utc))
 
-    def update_status(self, status: JobStatus) -> None:
-        """Update job status and timestamp."""
-        self.status = status
-        self.updated_at = datetime.now(timezone.utc)
+    def with_status(self, status: JobStatus) -> "Job":
+        """Return a snapshot with updated status and timestamp."""
+        return replace(self, status=status, updated_at=datetime.now(timezone.utc))
 
-    def add_result(self, result: dict[str, Any]) -> None:
-        """Add a result to the job."""
-        self.results.append(result)
-        self.update_progress(completed=len(self.results))
+    def with_results(self, results: list[dict[str, Any]]) -> "Job":
+        """Append results and return a snapshot counting them."""
+        self.results.extend(results)
+        return self.with_progress(completed=len(self.results))
 
-    def add_error(self, error: str) -> None:
-        """Add an error to the job."""
-        self.errors.append(error)
-        self.update_progress(errors=len(self.errors))
+    def with_errors(self, errors: list[str]) -> "Job":
+        """Append errors and return a snapshot counting them."""
+        self.errors.extend(errors)
+        return self.with_progress(errors=len(self.errors))
 
 
 class JobStore:
@@ -52,7 +71,17 @@ class JobStore:
     def __init__(self):
         """Initialize job store."""
         self._jobs: dict[str, Job] = {}
+        # Each job has a single writer (its background task) and snapshot swaps
+        # do not yield, so only job creation and listing take the lock
         self._lock = asyncio.Lock()
+        # Per-job event set (and dropped) on the next snapshot swap, for watchers
+        self._changed: dict[str, asyncio.Event] = {}
+
+    def _swap(self, job_id: str, job: Job) -> None:
+        """Store a new snapshot and wake anyone watching the job."""
+        self._jobs[job_id] = job
+        if (changed := self._changed.pop(job_id, None)) is not None:
+            changed.set()
 
     async def create_job(
         self, job_id: str, input_data: dict[str, Any], total: int
@@ -69,17 +98,21 @@ class JobStore:
             Created job object
         """
         async with self._lock:
-            now = datetime.now(timezone.utc)
-            job = Job(
-                job_id=job_id,
-                status=JobStatus.QUEUED,
-                progress=JobProgress(total=total, completed=0, errors=0),
-                submitted_at=now,
-                updated_at=now,
-                input_data=input_data,
-            )
-            self._jobs[job_id] = job
-            return job
+            return self._create_job_unsafe(job_id, input_data, total)
+
+    def _create_job_unsafe(self, job_id: str, input_data: dict[str, Any], total: int) -> Job:
+        """Create a job without taking the lock; for ``create_job`` and single-threaded seeding."""
+        now = datetime.now(timezone.utc)
+        job = Job(
+            job_id=job_id,
+            status=JobStatus.QUEUED,
+            progress=JobProgress(total=total, completed=0, errors=0),
+            submitted_at=now,
+            updated_at=now,
+            input_data=input_data,
+        )
+        self._jobs[job_id] = job
+        return job
 
     async def get_job(self, job_id: str) -> Job | None:
         """
@@ -89,10 +122,9 @@ class JobStore:
             job_id: Job identifier
 
         Returns:
-            Job object or None if not found
+            Current job snapshot or None if not found
         """
-        async with self._lock:
-            return self._jobs.get(job_id)
+        return self._jobs.get(job_id)
 
     async def update_job_status(self, job_id: str, status: JobStatus) -> None:
         """
@@ -102,9 +134,12 @@ class JobStore:
             job_id: Job identifier
             status: New status
         """
-        async with self._lock:
-            if job := self._jobs.get(job_id):
-                job.update_status(status)
+        self._set_status(job_id, status)
+
+    def _set_status(self, job_id: str, status: JobStatus) -> None:
+        """Swap in a snapshot with the new status; synchronous, so usable when seeding."""
+        if job := self._jobs.get(job_id):
+            self._swap(job_id, job.with_status(status))
 
     async def update_job_progress(
         self, job_id: str, completed: int | None = None, errors: int | None = None, total: int | None = None
@@ -118,9 +153,8 @@ class JobStore:
             errors: Error count
             total: Total items to process
         """
-        async with self._lock:
-            if job := self._jobs.get(job_id):
-                job.update_progress(completed=completed, errors=errors, total=total)
+        if job := self._jobs.get(job_id):
+            self._swap(job_id, job.with_progress(completed=completed, errors=errors, total=total))
 
     async def add_job_result(self, job_id: str, result: dict[str, Any]) -> None:
         """
@@ -130,9 +164,8 @@ class JobStore:
             job_id: Job identifier
             result: Result data
         """
-        async with self._lock:
-            if job := self._jobs.get(job_id):
-                job.add_result(result)
+        if job := self._jobs.get(job_id):
+            self._swap(job_id, job.with_results([result]))
 
     async def add_job_error(self, job_id: str, error: str) -> None:
         """
@@ -142,9 +175,69 @@ class JobStore:
             job_id: Job identifier
             error: Error message
         """
-        async with self._lock:
-            if job := self._jobs.get(job_id):
-                job.add_error(error)
+        if job := self._jobs.get(job_id):
+            self._swap(job_id, job.with_errors([error]))
+
+    async def add_job_results_bulk(self, job_id: str, results: list[dict[str, Any]]) -> None:
+        """
+        Add a batch of results to a job.
+
+        Args:
+            job_id: Job identifier
+            results: Result data items
+        """
+        if results and (job := self._jobs.get(job_id)):
+            self._swap(job_id, job.with_results(results))
+
+    async def add_job_errors_bulk(self, job_id: str, errors: list[str]) -> None:
+        """
+        Add a batch of errors to a job.
+
+        Args:
+            job_id: Job identifier
+            errors: Error messages
+        """
+        if errors and (job := self._jobs.get(job_id)):
+            self._swap(job_id, job.with_errors(errors))
+
+    async def get_job_results(self, job_id: str) -> tuple[list[dict[str, Any]], list[str]] | None:
+        """
+        Retrieve a job's results and errors.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            (results, errors) or None if the job is not found
+        """
+        if job := self._jobs.get(job_id):
+            return job.results, job.errors
+        return None
+
+    async def watch_job(self, job_id: str, heartbeat: float = 15.0) -> AsyncIterator[Job]:
+        """
+        Yield a job's snapshot now and after every change, until it finishes.
+
+        Args:
+            job_id: Job identifier
+            heartbeat: Seconds after which the current snapshot is re-sent unchanged
+
+        Yields:
+            Job snapshots; stops after a terminal one or if the job disappears
+        """
+        while True:
+            # Register before yielding so a change made while the caller handles
+            # this snapshot is not missed
+            if (job := self._jobs.get(job_id)) is None:
+                return
+            changed = self._changed.setdefault(job_id, asyncio.Event())
+            yield job
+            if job.status in TERMINAL_STATUSES:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                pass
 
     async def list_jobs(self, limit: int = 100) -> list[Job]:
         """
@@ -156,20 +249,326 @@ class JobStore:
         Returns:
             List of jobs, newest first
         """
+        # Jobs are inserted in submission order (timestamped under the lock),
+        # so newest-first is just the dict in reverse
         async with self._lock:
-            jobs = sorted(
-                self._jobs.values(), key=lambda j: j.submitted_at, reverse=True
-            )
-            return jobs[:limit]
+            return list(islice(reversed(self._jobs.values()), limit))
+
+
+class RedisJobStore:
+    """
+    Redis-backed job registry shared by every worker process.
+
+    Job state lives in a hash at ``jobs:{id}``; results and errors are appended to
+    the ``jobs:{id}:results`` / ``jobs:{id}:errors`` lists as orjson items, so status
+    polls never transfer them. All keys expire after ``ttl`` seconds.
+    """
+
+    INDEX_KEY = "jobs:index"
+
+    def __init__(self, url: str, ttl: int = 86400, client: Any = None):
+        """
+        Initialize Redis job store.
+
+        Args:
+            url: Redis connection URL
+            ttl: Seconds to keep job keys after their last write
+            client: Existing ``redis.asyncio`` client (used instead of ``url``)
+        """
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("redis is required for REDIS_URL job storage but not installed")
+            client = redis.from_url(url)
+        self._redis = client
+        self.ttl = ttl
+
+    @property
+    def client(self) -> Any:
+        """Underlying ``redis.asyncio`` client, shared with the job queue."""
+        return self._redis
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"jobs:{job_id}"
+
+    def _job_from_hash(self, job_id: str, data: dict[bytes, bytes]) -> Job | None:
+        """Build a Job from its hash, or None for a missing or incomplete hash."""
+        if b"status" not in data:
+            return None
+        return Job(
+            job_id=job_id,
+            status=JobStatus(data[b"status"].decode()),
+            progress=JobProgress(
+                total=int(data[b"total"]), completed=int(data[b"completed"]), errors=int(data[b"errors"])
+            ),
+            submitted_at=datetime.fromisoformat(data[b"submitted_at"].decode()),
+            updated_at=datetime.fromisoformat(data[b"updated_at"].decode()),
+            input_data=orjson.loads(data[b"input_data"]),
+        )
+
+    async def _touch(self, job_id: str, **fields: Any) -> None:
+        """Set hash fields (plus updated_at) on an existing job and refresh its TTL."""
+        key = self._key(job_id)
+        if not await self._redis.exists(key):
+            return
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, self.ttl)
+            pipe.publish(f"{key}:events", fields["updated_at"])
+            await pipe.execute()
+
+    async def create_job(self, job_id: str, input_data: dict[str, Any], total: int) -> Job:
+        """
+        Create a new job.
+
+        Args:
+            job_id: Unique job identifier
+            input_data: Job input parameters
+            total: Total items to process
+
+        Returns:
+            Created job object
+
+        Raises:
+            ValueError: If a job with this ID already exists
+        """
+        key = self._key(job_id)
+        now = datetime.now(timezone.utc)
+        # Claim and write in one transaction so readers never see a partial hash
+        # and a crash cannot leave the key behind without a TTL
+        async with self._redis.pipeline() as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.exists(key):
+                    raise ValueError(f"Job already exists: {job_id}")
+                pipe.multi()
+                pipe.hset(
+                    key,
+                    mapping={
+                        "job_id": job_id,
+                        "status": JobStatus.QUEUED.value,
+                        "total": total,
+                        "completed": 0,
+                        "errors": 0,
+                        "submitted_at": now.isoformat(),
+                        "updated_at": now.isoformat(),
+                        "input_data": orjson.dumps(input_data),
+                    },
+                )
+                pipe.expire(key, self.ttl)
+                pipe.zadd(self.INDEX_KEY, {job_id: now.timestamp()})
+                await pipe.execute()
+            except redis.WatchError:
+                # Another worker created the job between WATCH and EXEC
+                raise ValueError(f"Job already exists: {job_id}") from None
+        return Job(
+            job_id=job_id,
+            status=JobStatus.QUEUED,
+            progress=JobProgress(total=total, completed=0, errors=0),
+            submitted_at=now,
+            updated_at=now,
+            input_data=input_data,
+        )
+
+    async def get_job(self, job_id: str) -> Job | None:
+        """
+        Retrieve a job's state (results and errors are left empty; see get_job_results).
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job object or None if not found
+        """
+        data = await self._redis.hgetall(self._key(job_id))
+        return self._job_from_hash(job_id, data)
+
+    async def update_job_status(self, job_id: str, status: JobStatus) -> None:
+        """
+        Update job status.
+
+        Args:
+            job_id: Job identifier
+            status: New status
+        """
+        await self._touch(job_id, status=status.value)
+
+    async def update_job_progress(
+        self, job_id: str, completed: int | None = None, errors: int | None = None, total: int | None = None
+    ) -> None:
+        """
+        Update job progress.
+
+        Args:
+            job_id: Job identifier
+            completed: Completed items count
+            errors: Error count
+            total: Total items to process
+        """
+        fields = {
+            name: value
+            for name, value in (("completed", completed), ("errors", errors), ("total", total))
+            if value is not None
+        }
+        await self._touch(job_id, **fields)
+
+    async def _append(self, job_id: str, kind: str, items: list[Any]) -> None:
+        """Append encoded items to a job's results/errors list and bump its counter."""
+        key = self._key(job_id)
+        if not items or not await self._redis.exists(key):
+            return
+        list_key = f"{key}:{kind}"
+        counter = "completed" if kind == "results" else "errors"
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.rpush(list_key, *(orjson.dumps(item) for item in items))
+            pipe.expire(list_key, self.ttl)
+            pipe.hincrby(key, counter, len(items))
+            updated_at = datetime.now(timezone.utc).isoformat()
+            pipe.hset(key, "updated_at", updated_at)
+            pipe.expire(key, self.ttl)
+            pipe.publish(f"{key}:events", updated_at)
+            await pipe.execute()
+
+    async def add_job_result(self, job_id: str, result: dict[str, Any]) -> None:
+        """
+        Add a result to a job.
+
+        Args:
+            job_id: Job identifier
+            result: Result data
+        """
+        await self._append(job_id, "results", [result])
+
+    async def add_job_error(self, job_id: str, error: str) -> None:
+        """
+        Add an error to a job.
+
+        Args:
+            job_id: Job identifier
+            error: Error message
+        """
+        await self._append(job_id, "errors", [error])
+
+    async def add_job_results_bulk(self, job_id: str, results: list[dict[str, Any]]) -> None:
+        """
+        Add a batch of results to a job.
+
+        Args:
+            job_id: Job identifier
+            results: Result data items
+        """
+        await self._append(job_id, "results", results)
+
+    async def add_job_errors_bulk(self, job_id: str, errors: list[str]) -> None:
+        """
+        Add a batch of errors to a job.
+
+        Args:
+            job_id: Job identifier
+            errors: Error messages
+        """
+        await self._append(job_id, "errors", errors)
+
+    async def reset_job(self, job_id: str) -> None:
+        """
+        Drop a job's partial output and mark it queued again, for re-execution.
+
+        Args:
+            job_id: Job identifier
+        """
+        key = self._key(job_id)
+        await self._redis.delete(f"{key}:results", f"{key}:errors")
+        await self._touch(job_id, status=JobStatus.QUEUED.value, completed=0, errors=0)
+
+    async def get_job_results(self, job_id: str) -> tuple[list[dict[str, Any]], list[str]] | None:
+        """
+        Retrieve a job's results and errors.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            (results, errors) or None if the job is not found
+        """
+        key = self._key(job_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.exists(key)
+            pipe.lrange(f"{key}:results", 0, -1)
+            pipe.lrange(f"{key}:errors", 0, -1)
+            exists, results, errors = await pipe.execute()
+        if not exists:
+            return None
+        return [orjson.loads(r) for r in results], [orjson.loads(e) for e in errors]
+
+    async def watch_job(self, job_id: str, heartbeat: float = 15.0) -> AsyncIterator[Job]:
+        """
+        Yield a job's snapshot now and after every change, until it finishes.
+
+        Changes are signalled on the ``jobs:{id}:events`` channel by whichever
+        worker runs the job.
+
+        Args:
+            job_id: Job identifier
+            heartbeat: Seconds after which the current snapshot is re-sent unchanged
+
+        Yields:
+            Job snapshots; stops after a terminal one or if the job expires
+        """
+        loop = asyncio.get_running_loop()
+        pubsub = self._redis.pubsub()
+        try:
+            # Subscribe before reading so no change between the two is missed
+            await pubsub.subscribe(f"{self._key(job_id)}:events")
+            while True:
+                if (job := await self.get_job(job_id)) is None:
+                    return
+                yield job
+                if job.status in TERMINAL_STATUSES:
+                    return
+                # get_message also returns None for (ignored) subscribe confirmations
+                deadline = loop.time() + heartbeat
+                while (remaining := deadline - loop.time()) > 0:
+                    if await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining):
+                        break
+        finally:
+            await pubsub.aclose()
+
+    async def list_jobs(self, limit: int = 100) -> list[Job]:
+        """
+        List recent jobs.
+
+        Args:
+            limit: Maximum jobs to return
+
+        Returns:
+            List of jobs, newest first
+        """
+        job_ids = [raw.decode() for raw in await self._redis.zrevrange(self.INDEX_KEY, 0, limit - 1)]
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hgetall(self._key(job_id))
+            hashes = await pipe.execute() if job_ids else []
+        jobs = []
+        expired = []
+        for job_id, data in zip(job_ids, hashes):
+            if not data:
+                expired.append(job_id)
+            elif (job := self._job_from_hash(job_id, data)) is not None:
+                jobs.append(job)
+        if expired:
+            await self._redis.zrem(self.INDEX_KEY, *expired)
+        return jobs
 
 
 # Global job store instance
-_job_store: JobStore | None = None
+_job_store: JobStore | RedisJobStore | None = None
 
 
-def get_job_store() -> JobStore:
-    """Get or create the global job store instance."""
+def get_job_store() -> JobStore | RedisJobStore:
+    """Get or create the global job store (Redis-backed when REDIS_URL is set)."""
     global _job_store
     if _job_store is None:
-        _job_store = JobStore()
+        redis_url = get_settings().redis_url
+        _job_store = RedisJobStore(redis_url) if redis_url else JobStore()
     return _job_store
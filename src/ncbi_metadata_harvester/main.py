@@ -1,27 +1,58 @@
 import asyncio
 import uuid
+from contextlib import asynccontextmanager
+from email.utils import format_datetime
+from typing import AsyncIterator
 
-from fastapi import BackgroundTasks, FastAPI, HTTPException
-from fastapi.responses import PlainTextResponse
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 
-from .csv_export import export_results_to_csv
-from .job_processor import process_accession_job, process_query_job
-from .job_store import get_job_store
+from .config import get_settings
+from .csv_export import iter_results_to_csv
+from .job_processor import process_accession_job, process_query_job, shutdown_parse_pool
+from .job_queue import get_job_queue
+from .job_store import TERMINAL_STATUSES, Job, get_job_store
+from .ncbi_client import close_ncbi_client, get_ncbi_client
+from .result_files import RESULT_FORMATS, result_path
 from .models import (
     AccessionJobRequest,
     HealthResponse,
     JobResponse,
     JobStatus,
+    JobStatusSummary,
     QueryJobRequest,
 )
 
-app = FastAPI(title="NCBI Metadata Harvester", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared NCBI client (and job queue consumer) at startup; close them and the parse pool on shutdown."""
+    ncbi = get_ncbi_client()
+    # Warm the connection pool in the background so startup isn't blocked
+    warmup = asyncio.create_task(ncbi.warmup()) if get_settings().ncbi_warmup else None
+    # With a shared Redis store, jobs are taken from the queue by whichever worker holds the lease
+    queue = get_job_queue()
+    consumer = asyncio.create_task(queue.run()) if queue is not None else None
+    yield
+    for task in (warmup, consumer):
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    await close_ncbi_client()
+    await shutdown_parse_pool()
 
 
-@app.get("/healthz", response_model=HealthResponse)
-async def healthz() -> HealthResponse:
+app = FastAPI(title="NCBI Metadata Harvester", version="0.1.0", lifespan=lifespan)
+
+
+# Liveness probes hit this constantly; build and serialize the body once
+_HEALTH_OK = HealthResponse()
+_HEALTH_OK_DICT = _HEALTH_OK.model_dump()
+
+
+@app.get("/healthz", response_model=None, responses={200: {"model": HealthResponse}})
+async def healthz() -> dict[str, str]:
     """Health check endpoint."""
-    return HealthResponse(status="ok")
+    return _HEALTH_OK_DICT
 
 
 @app.post("/api/v1/jobs/query", status_code=202, response_model=JobResponse)
@@ -38,7 +69,10 @@ async def submit_query_job(request: QueryJobRequest, background_tasks: Backgroun
     )
     
     # Enqueue background task to process job
-    background_tasks.add_task(process_query_job, job_id, request.model_dump())
+    if (queue := get_job_queue()) is not None:
+        await queue.submit(job_id)
+    else:
+        background_tasks.add_task(process_query_job, job_id, request.model_dump())
     
     return JobResponse(
         job_id=job.job_id,
@@ -63,7 +97,10 @@ async def submit_accession_job(request: AccessionJobRequest, background_tasks: B
     )
     
     # Enqueue background task to process job
-    background_tasks.add_task(process_accession_job, job_id, request.model_dump())
+    if (queue := get_job_queue()) is not None:
+        await queue.submit(job_id)
+    else:
+        background_tasks.add_task(process_accession_job, job_id, request.model_dump())
     
     return JobResponse(
         job_id=job.job_id,
@@ -74,15 +111,78 @@ async def submit_accession_job(request: AccessionJobRequest, background_tasks: B
     )
 
 
+@app.get("/api/v1/jobs", response_model=dict[str, JobStatusSummary])
+async def get_jobs_progress(ids: str) -> dict[str, JobStatusSummary]:
+    """Get status and progress for several jobs (comma-separated ids); unknown ids are omitted."""
+    job_store = get_job_store()
+    summaries: dict[str, JobStatusSummary] = {}
+    for job_id in filter(None, ids.split(",")):
+        job = await job_store.get_job(job_id)
+        if job:
+            summaries[job_id] = JobStatusSummary(status=job.status, progress=job.progress)
+    return summaries
+
+
+# Last JobResponse built per job, keyed by its ETag, so unchanged polls reuse it
+_STATUS_SNAPSHOTS_MAX = 1024
+_status_snapshots: dict[str, tuple[str, JobResponse]] = {}
+
+_TERMINAL_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _job_etag(job: Job) -> str:
+    """Weak ETag that changes whenever a job's state or progress does."""
+    return f'W/"{job.updated_at.timestamp()}-{job.progress.completed}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in if_none_match.split(","))
+
+
 @app.get("/api/v1/jobs/{job_id}", response_model=JobResponse)
-async def get_job_status(job_id: str) -> JobResponse:
-    """Get job status and progress."""
+async def get_job_status(
+    job_id: str,
+    request: Request,
+    response: Response,
+    wait_ms: int = Query(default=0, ge=0, le=30000, description="Long-poll: hold a matching If-None-Match up to this long"),
+) -> JobResponse | Response:
+    """
+    Get job status and progress; supports If-None-Match for cheap polling.
+
+    With ``wait_ms``, a request whose If-None-Match still matches is held until the
+    job changes (or ``wait_ms`` passes) instead of answering 304 straight away.
+    """
     job_store = get_job_store()
     job = await job_store.get_job(job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    etag = _job_etag(job)
+    if_none_match = request.headers.get("if-none-match")
+    if wait_ms and job.status not in TERMINAL_STATUSES and _etag_matches(if_none_match, etag):
+        watcher = job_store.watch_job(job_id, heartbeat=wait_ms / 1000)
+        try:
+            await anext(watcher)  # the snapshot just read
+            job = await anext(watcher, None) or job
+        finally:
+            await watcher.aclose()
+        etag = _job_etag(job)
+    # Finished jobs never change, so clients and proxies can stop polling them
+    cache_control = _TERMINAL_CACHE_CONTROL if job.status in TERMINAL_STATUSES else "no-cache, must-revalidate"
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = format_datetime(job.updated_at, usegmt=True)
+    response.headers["Cache-Control"] = cache_control
+    
+    snapshot = _status_snapshots.get(job_id)
+    if snapshot is not None and snapshot[0] == etag:
+        return snapshot[1]
+    
     # Build links if job succeeded
     links = None
     if job.status == JobStatus.SUCCEEDED:
@@ -91,7 +191,7 @@ async def get_job_status(job_id: str) -> JobResponse:
             "results_csv": f"/api/v1/jobs/{job_id}/results?format=csv",
         }
     
-    return JobResponse(
+    job_response = JobResponse(
         job_id=job.job_id,
         status=job.status,
         progress=job.progress,
@@ -99,6 +199,47 @@ async def get_job_status(job_id: str) -> JobResponse:
         updated_at=job.updated_at,
         links=links,
     )
+    if snapshot is None and len(_status_snapshots) >= _STATUS_SNAPSHOTS_MAX:
+        _status_snapshots.pop(next(iter(_status_snapshots)))
+    _status_snapshots[job_id] = (etag, job_response)
+    return job_response
+
+
+@app.get("/api/v1/jobs/{job_id}/status", response_model=JobStatusSummary)
+async def get_job_progress(job_id: str) -> JobStatusSummary:
+    """Get only job status and progress, for lightweight polling."""
+    job_store = get_job_store()
+    job = await job_store.get_job(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return JobStatusSummary(status=job.status, progress=job.progress)
+
+
+@app.get("/api/v1/jobs/{job_id}/events")
+async def stream_job_events(job_id: str) -> StreamingResponse:
+    """Stream job status and progress as server-sent events until the job finishes."""
+    job_store = get_job_store()
+    if not await job_store.get_job(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events() -> AsyncIterator[str]:
+        last = None
+        async for job in job_store.watch_job(job_id):
+            payload = JobStatusSummary(status=job.status, progress=job.progress).model_dump_json()
+            if payload == last:
+                # Heartbeat: keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            last = payload
+            yield f"event: progress\ndata: {payload}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/api/v1/jobs/{job_id}/results")
@@ -116,14 +257,26 @@ async def get_job_results(job_id: str, format: str = "json"):
             detail=f"Job is not ready. Current status: {job.status}",
         )
     
+    if format not in RESULT_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid format. Use 'json' or 'csv'.")
+
+    filename = f"job_{job_id}_results.{format}"
+    media_type = "application/json" if format == "json" else "text/csv"
+    if results_dir := get_settings().results_dir:
+        # Snapshot written at completion; served without re-serializing
+        path = result_path(results_dir, job_id, format)
+        if path.is_file():
+            if format == "json":
+                return FileResponse(path, media_type=media_type)
+            return FileResponse(path, media_type=media_type, filename=filename)
+    
+    results, errors = await job_store.get_job_results(job_id) or ([], [])
     if format == "json":
-        return {"results": job.results, "errors": job.errors}
-    elif format == "csv":
-        csv_content = export_results_to_csv(job.results)
-        return PlainTextResponse(
-            content=csv_content,
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename=job_{job_id}_results.csv"}
-        )
+        # Result lists can be large and deeply nested; skip the stdlib json encoder
+        return ORJSONResponse({"results": results, "errors": errors})
     else:
-        raise HTTPException(status_code=400, detail="Invalid format. Use 'json' or 'csv'.")
+        return StreamingResponse(
+            iter_results_to_csv(results),
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
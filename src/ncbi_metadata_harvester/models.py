@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class AssemblyLevel(str, Enum):
@@ -26,6 +26,8 @@ class SourceDBPreference(str, Enum):
 class QueryFilters(BaseModel):
     """Filters for genome queries."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     assembly_level: list[AssemblyLevel] | None = Field(
         default=None, description="Filter by assembly level (default: any)"
     )
@@ -58,6 +60,12 @@ class AccessionJobRequest(BaseModel):
     )
     filters: QueryFilters = Field(default_factory=QueryFilters)
 
+    @field_validator("accessions")
+    @classmethod
+    def _dedupe_accessions(cls, accessions: list[str]) -> list[str]:
+        """Drop repeated accessions, keeping first-seen order."""
+        return list(dict.fromkeys(accessions))
+
 
 class JobStatus(str, Enum):
     """Possible job states."""
@@ -71,6 +79,9 @@ class JobStatus(str, Enum):
 class JobProgress(BaseModel):
     """Progress information for a job."""
 
+    # Immutable so one instance can be shared between the store and responses
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     total: int = Field(default=0, description="Total items to process")
     completed: int = Field(default=0, description="Items completed")
     errors: int = Field(default=0, description="Items failed")
@@ -79,6 +90,8 @@ class JobProgress(BaseModel):
 class JobResponse(BaseModel):
     """Response for job submission and status."""
 
+    model_config = ConfigDict(frozen=True)
+
     job_id: str = Field(..., description="Unique job identifier")
     status: JobStatus = Field(..., description="Current job status")
     progress: JobProgress | None = Field(default=None, description="Job progress")
@@ -89,7 +102,16 @@ class JobResponse(BaseModel):
     )
 
 
+class JobStatusSummary(BaseModel):
+    """Compact job status for polling (no timestamps or links)."""
+
+    status: JobStatus = Field(..., description="Current job status")
+    progress: JobProgress = Field(..., description="Job progress")
+
+
 class HealthResponse(BaseModel):
     """Response for health check."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     status: Literal["ok"] = "ok"
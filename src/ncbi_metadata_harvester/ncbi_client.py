@@ -1,21 +1,133 @@
 """NCBI E-utilities client with rate limiting and retry."""
-from typing import Any
+import asyncio
+import codecs
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+from xml.etree import ElementTree
 
 import httpx
+import orjson
 
 from .config import get_settings
+from .genbank_parser import GenBankRecordSplitter
 from .http_client import RetryableHTTPClient
 from .rate_limiter import TokenBucketRateLimiter
 
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """Minimal stand-in for a successful httpx.Response rebuilt from a cached body."""
+
+    status_code = 200
+
+    def __init__(self, content: bytes):
+        """
+        Initialize cached response.
+
+        Args:
+            content: Response body
+        """
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        """Body decoded as UTF-8."""
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        """Body decoded as JSON."""
+        return orjson.loads(self.content)
+
+    async def aiter_text(self) -> AsyncIterator[str]:
+        """Yield the body as a single text chunk, like a fully buffered stream."""
+        yield self.text
+
+
+class HeaderCachingResponse:
+    """
+    Streamed GenBank text response that keeps each record's header lines as it is read.
+
+    Wraps an httpx.Response rather than patching it, so caching does not depend on
+    how httpx dispatches between its iterators. ``records`` is only complete once
+    ``complete`` is set, i.e. the body was iterated to the end.
+    """
+
+    def __init__(self, response: httpx.Response):
+        """
+        Initialize the wrapper.
+
+        Args:
+            response: Open streaming response with an unread body
+        """
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self._splitter = GenBankRecordSplitter(headers_only=True)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.records: list[str] = []
+        self.complete = False
+
+    def _feed(self, chunk: bytes, final: bool = False) -> str:
+        text = self._decoder.decode(chunk, final=final)
+        self.records.extend(self._splitter.feed(text))
+        if final:
+            self.records.extend(self._splitter.close())
+            self.complete = True
+        return text
+
+    async def aiter_bytes(self, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+        """Yield the decoded body bytes, recording headers as they pass."""
+        async for chunk in self._response.aiter_bytes(chunk_size):
+            self._feed(chunk)
+            yield chunk
+        self._feed(b"", final=True)
+
+    async def aiter_text(self) -> AsyncIterator[str]:
+        """Yield the body as UTF-8 text, recording headers as they pass."""
+        async for chunk in self._response.aiter_bytes():
+            if text := self._feed(chunk):
+                yield text
+        if text := self._feed(b"", final=True):
+            yield text
+
+    def header_body(self) -> bytes:
+        """Header-only records seen so far, as a GenBank text body."""
+        return "".join(f"{record}\n" for record in self.records).encode()
+
 
 class NCBIClient:
     """Client for NCBI E-utilities API with rate limiting and retry."""
 
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self):
-        """Initialize NCBI client with settings-based configuration."""
+    def __init__(self, cache: Any = None):
+        """
+        Initialize NCBI client with settings-based configuration.
+
+        Args:
+            cache: ``redis.asyncio`` client for the ESummary/EFetch read-through cache;
+                defaults to one on REDIS_URL when set
+        """
         self.settings = get_settings()
+        if cache is None and self.settings.redis_url and REDIS_AVAILABLE:
+            cache = redis.from_url(self.settings.redis_url)
+        self.cache = cache
+        # Identification sent with every E-utilities request
+        self._base_params: dict[str, Any] = {
+            "tool": self.settings.ncbi_tool,
+            "email": self.settings.ncbi_email,
+        }
+        if self.settings.ncbi_api_key:
+            self._base_params["api_key"] = self.settings.ncbi_api_key
         # Determine effective rate limit: prefer 10 rps when API key is present
         effective_rate = self.settings.ncbi_rate_limit
         if self.settings.ncbi_api_key and effective_rate <= 3.0:
@@ -25,6 +137,7 @@ class NCBIClient:
         limits = httpx.Limits(
             max_connections=self.settings.http_max_connections,
             max_keepalive_connections=self.settings.http_max_keepalive,
+            keepalive_expiry=self.settings.http_keepalive_expiry,
         )
         self.http_client = RetryableHTTPClient(
             max_retries=self.settings.max_retries,
@@ -33,11 +146,14 @@ class NCBIClient:
             timeout=30.0,
             http2=self.settings.http2_enabled,
             limits=limits,
+            max_concurrent_retries=self.settings.max_concurrent_retries,
         )
 
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP client and cache connection."""
         await self.http_client.close()
+        if self.cache is not None:
+            await self.cache.aclose()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -47,16 +163,58 @@ class NCBIClient:
         """Async context manager exit."""
         await self.close()
 
+    async def warmup(self) -> None:
+        """
+        Open a pooled connection to E-utilities with a cheap EInfo call.
+
+        Best-effort: failures are logged and the first real request connects instead.
+        """
+        await self.rate_limiter.acquire()
+        try:
+            await self.http_client.get(f"{self.BASE_URL}/einfo.fcgi", params=self._build_params(retmode="json"))
+        except httpx.HTTPError as e:
+            logger.warning("NCBI connection warmup failed: %s", e)
+
+    @staticmethod
+    def _cache_key(db: str, id_str: str, rettype: str) -> str:
+        """Build the cache key for a lookup; long ID lists are hashed."""
+        if len(id_str) > 100:
+            id_str = hashlib.sha1(id_str.encode()).hexdigest()
+        return f"ncbi:{db}:{id_str}:{rettype}"
+
+    async def _cache_get(self, key: str) -> CachedResponse | None:
+        """Return a cached response body, treating cache errors as misses."""
+        if self.cache is None:
+            return None
+        try:
+            body = await self.cache.get(key)
+        except redis.RedisError as e:
+            logger.warning("NCBI cache read failed: %s", e)
+            return None
+        return CachedResponse(body) if body is not None else None
+
+    async def _cache_set(self, key: str, body: bytes) -> None:
+        """Store a response body with the configured TTL, ignoring cache errors."""
+        if self.cache is None:
+            return
+        try:
+            await self.cache.setex(key, self.settings.ncbi_cache_ttl, body)
+        except redis.RedisError as e:
+            logger.warning("NCBI cache write failed: %s", e)
+
+    async def _read_through(
+        self, key: str, fetch: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response | CachedResponse:
+        """Serve ``key`` from the cache, else fetch it and cache the body."""
+        if (cached := await self._cache_get(key)) is not None:
+            return cached
+        response = await fetch()
+        await self._cache_set(key, response.content)
+        return response
+
     def _build_params(self, **kwargs: Any) -> dict[str, Any]:
         """Build request parameters with tool/email/api_key."""
-        params = {
-            "tool": self.settings.ncbi_tool,
-            "email": self.settings.ncbi_email,
-        }
-        if self.settings.ncbi_api_key:
-            params["api_key"] = self.settings.ncbi_api_key
-        params.update(kwargs)
-        return params
+        return {**self._base_params, **kwargs}
 
     async def esearch(
         self, db: str, term: str, retmax: int = 20, **kwargs: Any
@@ -78,27 +236,103 @@ class NCBIClient:
         url = f"{self.BASE_URL}/esearch.fcgi"
         return await self.http_client.get(url, params=params)
 
-    async def esummary(self, db: str, id: str | list[str], **kwargs: Any) -> httpx.Response:
+    async def esummary(
+        self, db: str, id: str | list[str] | None = None, **kwargs: Any
+    ) -> httpx.Response | CachedResponse:
         """
         Execute ESummary query.
 
         Args:
             db: Database (e.g., 'assembly', 'nuccore')
-            id: Single ID or list of IDs
-            **kwargs: Additional query parameters
+            id: Single ID or list of IDs; omit when passing WebEnv/query_key
+            **kwargs: Additional query parameters (e.g., WebEnv, query_key, retstart)
 
         Returns:
             Response object with summaries
         """
-        await self.rate_limiter.acquire()
-        id_str = ",".join(id) if isinstance(id, list) else id
-        params = self._build_params(db=db, id=id_str, retmode="json", **kwargs)
+        if id is not None:
+            kwargs["id"] = ",".join(id) if isinstance(id, list) else id
+        params = self._build_params(db=db, retmode="json", **kwargs)
         url = f"{self.BASE_URL}/esummary.fcgi"
-        return await self.http_client.get(url, params=params)
+
+        async def fetch() -> httpx.Response:
+            await self.rate_limiter.acquire()
+            return await self.http_client.get(url, params=params)
+
+        # History-server (WebEnv) lookups are session-specific; only cache by ID
+        if id is None or len(kwargs) > 1:
+            return await fetch()
+        return await self._read_through(self._cache_key(db, kwargs["id"], "esummary"), fetch)
+
+    async def epost(self, db: str, ids: list[str]) -> tuple[str, str]:
+        """
+        Upload IDs to the NCBI history server with EPost.
+
+        Args:
+            db: Database the IDs belong to
+            ids: IDs to post
+
+        Returns:
+            (WebEnv, query_key) identifying the posted set
+        """
+        await self.rate_limiter.acquire()
+        params = self._build_params(db=db, id=",".join(ids))
+        url = f"{self.BASE_URL}/epost.fcgi"
+        response = await self.http_client.post(url, data=params)
+        root = ElementTree.fromstring(response.content)
+        webenv = root.findtext("WebEnv")
+        query_key = root.findtext("QueryKey")
+        if not webenv or not query_key:
+            raise ValueError(root.findtext("ERROR") or "EPost response missing WebEnv/QueryKey")
+        return webenv, query_key
+
+    async def esummary_batched(
+        self, db: str, ids: list[str], chunk: int = 200, **kwargs: Any
+    ) -> AsyncIterator[httpx.Response | CachedResponse]:
+        """
+        Execute ESummary for many IDs via EPost, ``chunk`` IDs per request.
+
+        Chunks are requested concurrently (paced by the rate limiter) so they
+        share the pooled connection instead of waiting on each other.
+
+        Args:
+            db: Database (e.g., 'assembly', 'nuccore')
+            ids: IDs to summarize
+            chunk: IDs per EPost/ESummary round
+            **kwargs: Additional ESummary query parameters
+
+        Yields:
+            Response object with summaries for each chunk, in ``ids`` order
+        """
+
+        async def fetch(batch: list[str]) -> httpx.Response:
+            webenv, query_key = await self.epost(db, batch)
+            return await self.esummary(
+                db=db, WebEnv=webenv, query_key=query_key, retstart=0, retmax=len(batch), **kwargs
+            )
+
+        async def summarize(batch: list[str]) -> httpx.Response | CachedResponse:
+            if kwargs:
+                return await fetch(batch)
+            return await self._read_through(
+                self._cache_key(db, ",".join(batch), "esummary"), lambda: fetch(batch)
+            )
+
+        tasks = [
+            asyncio.ensure_future(summarize(ids[start : start + chunk]))
+            for start in range(0, len(ids), chunk)
+        ]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def efetch(
         self, db: str, id: str | list[str], rettype: str = "gb", retmode: str = "text", **kwargs: Any
-    ) -> httpx.Response:
+    ) -> httpx.Response | CachedResponse:
         """
         Execute EFetch query.
 
@@ -112,11 +346,68 @@ class NCBIClient:
         Returns:
             Response object with record data
         """
-        await self.rate_limiter.acquire()
         id_str = ",".join(id) if isinstance(id, list) else id
         params = self._build_params(db=db, id=id_str, rettype=rettype, retmode=retmode, **kwargs)
         url = f"{self.BASE_URL}/efetch.fcgi"
-        return await self.http_client.get(url, params=params)
+
+        async def fetch() -> httpx.Response:
+            await self.rate_limiter.acquire()
+            return await self.http_client.get(url, params=params)
+
+        if kwargs:
+            return await fetch()
+        return await self._read_through(self._cache_key(db, id_str, f"{rettype}.{retmode}"), fetch)
+
+    @asynccontextmanager
+    async def efetch_stream(
+        self,
+        db: str,
+        id: str | list[str],
+        rettype: str = "gb",
+        retmode: str = "text",
+        cache_headers: bool = False,
+        **kwargs: Any,
+    ) -> AsyncIterator[httpx.Response | HeaderCachingResponse | CachedResponse]:
+        """
+        Execute EFetch query, yielding a response whose body is streamed.
+
+        Streamed bodies (full GenBank records with sequence can be many MB) are
+        never buffered for the cache. With ``cache_headers`` a GenBank text
+        stream is split as it is read and only each record's header lines are
+        cached, so a cache hit replays header-only records.
+
+        Args:
+            db: Database (e.g., 'nuccore')
+            id: Single ID or list of IDs
+            rettype: Return type (e.g., 'gb', 'fasta')
+            retmode: Return mode ('text', 'xml')
+            cache_headers: Read through the cache, storing header-only records
+                (``rettype="gb"``, ``retmode="text"`` only)
+            **kwargs: Additional query parameters
+
+        Yields:
+            Response object with an unread body (header-only records on a cache hit)
+        """
+        id_str = ",".join(id) if isinstance(id, list) else id
+        cacheable = (
+            cache_headers and self.cache is not None and not kwargs and (rettype, retmode) == ("gb", "text")
+        )
+        key = self._cache_key(db, id_str, "gb.text.headers")
+        if cacheable and (cached := await self._cache_get(key)) is not None:
+            yield cached
+            return
+        await self.rate_limiter.acquire()
+        params = self._build_params(db=db, id=id_str, rettype=rettype, retmode=retmode, **kwargs)
+        url = f"{self.BASE_URL}/efetch.fcgi"
+        async with self.http_client.stream("GET", url, params=params) as response:
+            if not cacheable:
+                yield response
+                return
+            # Keep only header lines of each record as the body streams past
+            tee = HeaderCachingResponse(response)
+            yield tee
+            if tee.complete:
+                await self._cache_set(key, tee.header_body())
 
     async def elink(
         self, dbfrom: str, db: str, id: str | list[str], linkname: str | None = None, **kwargs: Any
@@ -141,3 +432,44 @@ class NCBIClient:
             params["linkname"] = linkname
         url = f"{self.BASE_URL}/elink.fcgi"
         return await self.http_client.get(url, params=params)
+
+
+# Shared client, so jobs reuse one warm connection pool and one rate limiter
+_ncbi_client: NCBIClient | None = None
+_ncbi_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _release_stale_client(client: NCBIClient, loop: asyncio.AbstractEventLoop) -> None:
+    """Close a shared client left behind by another event loop."""
+    if loop.is_running() and not loop.is_closed():
+        # Its connections belong to that loop (e.g. a server thread); close them there
+        asyncio.run_coroutine_threadsafe(client.close(), loop)
+    else:
+        # Transports of a stopped loop cannot be closed from this one
+        logger.warning("Discarding NCBI client from a stopped event loop without closing its connections")
+
+
+def get_ncbi_client() -> NCBIClient:
+    """
+    Get or create the shared NCBI client for the running event loop.
+
+    Connections are bound to the loop that opened them, so a client created under a
+    different loop is closed on that loop (when still running) and replaced rather
+    than reused. Call close_ncbi_client() before a loop shuts down.
+    """
+    global _ncbi_client, _ncbi_client_loop
+    loop = asyncio.get_running_loop()
+    if _ncbi_client is None or _ncbi_client_loop is not loop:
+        if _ncbi_client is not None:
+            _release_stale_client(_ncbi_client, _ncbi_client_loop)
+        _ncbi_client = NCBIClient()
+        _ncbi_client_loop = loop
+    return _ncbi_client
+
+
+async def close_ncbi_client() -> None:
+    """Close the shared NCBI client, if one was created."""
+    global _ncbi_client, _ncbi_client_loop
+    if _ncbi_client is not None:
+        client, _ncbi_client, _ncbi_client_loop = _ncbi_client, None, None
+        await client.close()
@@ -1,45 +1,71 @@
 """Rate limiting utilities."""
 import asyncio
-import time
-from collections import deque
+import math
+from array import array
+from typing import Awaitable, Callable
 
 
 class TokenBucketRateLimiter:
     """Token bucket rate limiter for async requests."""
 
-    def __init__(self, rate: float, burst: int = 1):
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        time_func: Callable[[], float] | None = None,
+        sleep_func: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
         """
         Initialize rate limiter.
 
         Args:
             rate: Requests per second allowed
             burst: Maximum burst size (tokens that can accumulate)
+            time_func: Monotonic clock (defaults to the running event loop's)
+            sleep_func: Coroutine used to wait for a token
         """
         self.rate = rate
         self.burst = burst
+        self._time = time_func
+        self._sleep = sleep_func
         self.tokens = float(burst)
-        self.last_update = time.monotonic()
+        # Timestamps come from the event loop clock; set on first acquire
+        self.last_update: float | None = None
         self._lock = asyncio.Lock()
 
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued between the last update and ``now``."""
+        if self.last_update is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.last_update) * self.rate)
+        self.last_update = now
+
     async def acquire(self) -> None:
         """Wait until a token is available, then consume it."""
+        # loop.time() is monotonic and avoids a separate clock read per call
+        now = self._time or asyncio.get_running_loop().time
+        # Fast path: with no await between refill and consume this is atomic on the
+        # event loop. Skip it while a waiter holds the lock so the waiter's token
+        # isn't taken out from under it.
+        if not self._lock.locked():
+            self._refill(now())
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+
         async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self.last_update
-            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
-            self.last_update = now
+            self._refill(now())
 
             if self.tokens < 1.0:
                 wait_time = (1.0 - self.tokens) / self.rate
-                await asyncio.sleep(wait_time)
+                await self._sleep(wait_time)
                 self.tokens = 0.0
-                self.last_update = time.monotonic()
+                self.last_update = now()
             else:
                 self.tokens -= 1.0
 
 
 class SlidingWindowRateLimiter:
-    """Sliding window rate limiter (simple deque-based implementation)."""
+    """Sliding window rate limiter backed by a fixed-size ring of admission times."""
 
     def __init__(self, rate: float):
         """
@@ -50,27 +76,20 @@ class SlidingWindowRateLimiter:
         """
         self.rate = rate
         self.window = 1.0  # 1 second window
-        self.requests: deque[float] = deque()
+        # Only the last ceil(rate) admissions can block the next one
+        self._ring = array("d", [-math.inf] * max(1, math.ceil(rate)))
+        self._idx = 0
         self._lock = asyncio.Lock()
 
     async def acquire(self) -> None:
         """Wait until a slot is available in the sliding window."""
+        loop = asyncio.get_running_loop()
         async with self._lock:
-            now = time.monotonic()
-            # Remove requests outside the window
-            cutoff = now - self.window
-            while self.requests and self.requests[0] < cutoff:
-                self.requests.popleft()
-
-            # If at capacity, wait until oldest request expires
-            if len(self.requests) >= self.rate:
-                wait_time = self.requests[0] + self.window - now
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    now = time.monotonic()
-                    # Clean up again after sleep
-                    cutoff = now - self.window
-                    while self.requests and self.requests[0] < cutoff:
-                        self.requests.popleft()
-
-            self.requests.append(now)
+            now = loop.time()
+            # The slot about to be overwritten holds the oldest admission in the window
+            oldest = self._ring[self._idx]
+            if now - oldest < self.window:
+                await asyncio.sleep(oldest + self.window - now)
+                now = loop.time()
+            self._ring[self._idx] = now
+            self._idx = (self._idx + 1) % len(self._ring)
@@ -0,0 +1,61 @@
+"""On-disk snapshots of finished job results."""
+import asyncio
+import os
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from .csv_export import export_results_to_csv
+
+RESULT_FORMATS = ("json", "csv")
+
+
+def result_path(directory: str, job_id: str, format: str) -> Path:
+    """
+    Build the snapshot path for a job's results.
+
+    Args:
+        directory: Results directory
+        job_id: Job identifier
+        format: "json" or "csv"
+
+    Returns:
+        Path of the snapshot file
+    """
+    return Path(directory) / f"job_{job_id}_results.{format}"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a temp file so readers never see a partial file."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _write_results(directory: str, job_id: str, results: list[dict[str, Any]], errors: list[str]) -> None:
+    """Serialize and write both snapshot formats."""
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    _write_atomic(
+        result_path(directory, job_id, "json"),
+        orjson.dumps({"results": results, "errors": errors}),
+    )
+    _write_atomic(
+        result_path(directory, job_id, "csv"),
+        export_results_to_csv(results).encode("utf-8"),
+    )
+
+
+async def persist_results(
+    directory: str, job_id: str, results: list[dict[str, Any]], errors: list[str]
+) -> None:
+    """
+    Write JSON and CSV snapshots of a finished job off the event loop.
+
+    Args:
+        directory: Results directory (created if missing)
+        job_id: Job identifier
+        results: Job results
+        errors: Job errors
+    """
+    await asyncio.to_thread(_write_results, directory, job_id, results, errors)
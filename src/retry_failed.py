@@ -1,10 +1,75 @@
 """Retry failed accessions from a previous job."""
 import asyncio
-import json
+import re
 import sys
 from pathlib import Path
+from typing import Awaitable, Callable
 
 import httpx
+import orjson
+
+# Accession following any of the job processor's per-accession error prefixes
+# (covers GenBank "CP184062.1", RefSeq "NZ_CP012345.1" and assembly "GCF_000005845.2")
+_ACC_RE = re.compile(
+    r"(?:Error processing |Error resolving |Assembly not found: |not found: |No nuccore link for )"
+    r"([A-Z]{1,3}_?[A-Z]{0,4}\d+(?:\.\d+)?)"
+)
+
+
+async def poll_job(
+    client: httpx.AsyncClient,
+    status_url: httpx.URL,
+    timeout: float = 600.0,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+) -> str:
+    """
+    Poll a job document with conditional GETs until the job finishes or ``timeout`` passes.
+
+    Backs off 1s -> 30s while progress is flat and resets when it advances. Each poll
+    sends the last ETag, and a 304 Not Modified reuses the previous document.
+
+    Args:
+        client: Open HTTP client
+        status_url: Job document URL
+        timeout: Seconds to keep polling
+        sleep: Coroutine used to wait between polls
+
+    Returns:
+        Last seen job status
+    """
+    status = "queued"
+    etag = None
+    status_data = None
+    delay = 1.0
+    last_completed = -1
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    while loop.time() - start < timeout:
+        await sleep(delay)
+        
+        headers = {"If-None-Match": etag} if etag else None
+        resp = await client.get(status_url, headers=headers)
+        # raise_for_status treats 304 as an error, so only call it off the happy path
+        if resp.status_code not in (200, 304):
+            resp.raise_for_status()
+        if resp.status_code != 304 or status_data is None:
+            status_data = orjson.loads(resp.content)
+            etag = resp.headers.get("etag")
+        
+        status = status_data["status"]
+        progress = status_data["progress"]
+        
+        if progress['completed'] != last_completed:
+            last_completed = progress['completed']
+            delay = 1.0
+            elapsed = loop.time() - start
+            print(f"   [{elapsed:.0f}s] {status} | {progress['completed']}/{progress['total']} | Errors: {progress['errors']}")
+        else:
+            delay = min(delay * 2, 30.0)
+        
+        if status in ["succeeded", "failed"]:
+            break
+    return status
 
 
 async def retry_failed_accessions(original_job_id: str, base_url: str = "http://127.0.0.1:8000"):
@@ -25,8 +90,7 @@ async def retry_failed_accessions(original_job_id: str, base_url: str = "http://
         print(f"   Make sure the job completed and results were saved.")
         return
     
-    with open(results_file, 'r', encoding='utf-8') as f:
-        results = json.load(f)
+    results = orjson.loads(await asyncio.to_thread(Path(results_file).read_bytes))
     
     # Extract failed accessions from errors
     errors = results.get('errors', [])
@@ -41,29 +105,12 @@ async def retry_failed_accessions(original_job_id: str, base_url: str = "http://
     if len(errors) > 10:
         print(f"   ... and {len(errors) - 10} more")
     
-    # Extract accession IDs from error messages
+    # Extract accession IDs from error messages in one scan
     # Error format: "Error processing CP184062.1: ..." or "Assembly not found: GCF_..."
-    failed_accessions = []
-    for err in errors:
-        # Try different patterns
-        if "Error processing" in err:
-            # Extract "CP184062.1" from "Error processing CP184062.1: ..."
-            parts = err.split("Error processing ")
-            if len(parts) > 1:
-                acc = parts[1].split(":")[0].strip()
-                failed_accessions.append(acc)
-        elif "not found:" in err or "Assembly not found:" in err:
-            # Extract "GCF_..." from "Assembly not found: GCF_..."
-            parts = err.split(":")
-            if len(parts) > 1:
-                acc = parts[-1].strip()
-                failed_accessions.append(acc)
-        elif "No nuccore link for" in err:
-            # Extract from "No nuccore link for GCF_..."
-            parts = err.split("for ")
-            if len(parts) > 1:
-                acc = parts[1].strip()
-                failed_accessions.append(acc)
+    failed_accessions = _ACC_RE.findall("\n".join(errors))
+    raw_count = len(failed_accessions)
+    # The same accession can fail more than once (e.g. chained lookups)
+    failed_accessions = list(dict.fromkeys(failed_accessions))
     
     if not failed_accessions:
         print(f"\n⚠️  Could not automatically extract accession IDs from errors.")
@@ -71,17 +118,23 @@ async def retry_failed_accessions(original_job_id: str, base_url: str = "http://
         return
     
     print(f"\n📋 Extracted {len(failed_accessions)} failed accession(s):")
+    if raw_count != len(failed_accessions):
+        print(f"   (deduplicated from {raw_count} to {len(failed_accessions)})")
     for acc in failed_accessions:
         print(f"   - {acc}")
     
     # Submit retry job
     print(f"\n🚀 Submitting retry job...")
-    async with httpx.AsyncClient(timeout=300.0) as client:
+    # Keep connections alive across the whole polling window; two so the concurrent
+    # JSON and CSV result downloads both reuse one. HTTP/2 is only negotiated (via
+    # ALPN) when base_url is https; plain http:// stays on HTTP/1.1
+    limits = httpx.Limits(max_keepalive_connections=2, keepalive_expiry=300.0)
+    async with httpx.AsyncClient(timeout=300.0, http2=True, limits=limits) as client:
         try:
             payload = {"accessions": failed_accessions}
             resp = await client.post(f"{base_url}/api/v1/jobs/accessions", json=payload)
             resp.raise_for_status()
-            job_data = resp.json()
+            job_data = orjson.loads(resp.content)
             retry_job_id = job_data["job_id"]
             
             print(f"✅ Retry job created: {retry_job_id}")
@@ -89,22 +142,8 @@ async def retry_failed_accessions(original_job_id: str, base_url: str = "http://
             
             # Monitor the retry job
             print(f"\n⏳ Monitoring retry job...")
-            status = "queued"
-            for i in range(300):  # 10 minutes max for retries
-                await asyncio.sleep(2)
-                
-                resp = await client.get(f"{base_url}/api/v1/jobs/{retry_job_id}")
-                resp.raise_for_status()
-                status_data = resp.json()
-                
-                status = status_data["status"]
-                progress = status_data["progress"]
-                
-                if i % 5 == 0:  # Print every 10 seconds
-                    print(f"   [{i*2}s] {status} | {progress['completed']}/{progress['total']} | Errors: {progress['errors']}")
-                
-                if status in ["succeeded", "failed"]:
-                    break
+            status_url = httpx.URL(f"{base_url}/api/v1/jobs/{retry_job_id}")
+            status = await poll_job(client, status_url)
             
             if status != "succeeded":
                 print(f"\n⚠️  Retry job status: {status}")
@@ -113,9 +152,15 @@ async def retry_failed_accessions(original_job_id: str, base_url: str = "http://
             
             # Get retry results
             print(f"\n✅ Retry job completed!")
-            resp = await client.get(f"{base_url}/api/v1/jobs/{retry_job_id}/results?format=json")
-            resp.raise_for_status()
-            retry_results = resp.json()
+            # JSON and CSV downloads are independent; fetch them together
+            results_url = f"{base_url}/api/v1/jobs/{retry_job_id}/results"
+            json_resp, csv_resp = await asyncio.gather(
+                client.get(results_url, params={"format": "json"}),
+                client.get(results_url, params={"format": "csv"}),
+            )
+            json_resp.raise_for_status()
+            csv_resp.raise_for_status()
+            retry_results = orjson.loads(json_resp.content)
             
             print(f"\n📊 Retry Results:")
             print(f"   Successfully retrieved: {len(retry_results['results'])}")
@@ -130,19 +175,16 @@ async def retry_failed_accessions(original_job_id: str, base_url: str = "http://
             
             # Save merged results
             merged_file = f"results/metadata_{original_job_id}_merged.json"
-            with open(merged_file, 'w', encoding='utf-8') as f:
-                json.dump(merged_results, f, indent=2, ensure_ascii=False)
+            merged_bytes = orjson.dumps(merged_results, option=orjson.OPT_INDENT_2)
+            await asyncio.to_thread(Path(merged_file).write_bytes, merged_bytes)
             print(f"✅ Merged results saved: {merged_file}")
             
             # Also save CSV
             print(f"\n📥 Generating merged CSV...")
             # For CSV, we need to re-submit merged accessions or manually create
             # Simpler: just save the retry CSV separately
-            resp = await client.get(f"{base_url}/api/v1/jobs/{retry_job_id}/results?format=csv")
-            resp.raise_for_status()
             retry_csv_file = f"results/metadata_{original_job_id}_retry.csv"
-            with open(retry_csv_file, 'w', encoding='utf-8') as f:
-                f.write(resp.text)
+            await asyncio.to_thread(Path(retry_csv_file).write_bytes, csv_resp.content)
             print(f"✅ Retry CSV saved: {retry_csv_file}")
             
             print(f"\n" + "=" * 70)
@@ -188,4 +230,10 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        # Installed with uvicorn[standard] on non-Windows platforms
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())
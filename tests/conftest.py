@@ -0,0 +1,28 @@
+"""Shared pytest fixtures."""
+import os
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+
+
+# The session app must not reach out to NCBI in the background while other
+# tests have the httpx transport mocked; set before settings are first read
+os.environ.setdefault("NCBI_WARMUP", "false")
+
+from ncbi_metadata_harvester.main import app  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    """An httpx client bound to the app in-process, on the test's own event loop."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole session; app startup/shutdown run once around it."""
+    with TestClient(app) as client:
+        yield client
@@ -1,19 +1,19 @@
 """Tests for API endpoints and request/response models."""
+import pytest
 from fastapi.testclient import TestClient
 
 from ncbi_metadata_harvester.main import app
 
-client = TestClient(app)
 
-
-def test_healthz():
+def test_healthz(client):
     """Test health check endpoint."""
     resp = client.get("/healthz")
     assert resp.status_code == 200
     assert resp.json() == {"status": "ok"}
 
 
-def test_submit_query_job():
+@pytest.mark.integration
+def test_submit_query_job(client):
     """Test POST /api/v1/jobs/query with minimal request."""
     payload = {
         "organism": "Escherichia coli",
@@ -30,7 +30,8 @@ def test_submit_query_job():
     assert data["progress"]["completed"] == 0
 
 
-def test_submit_query_job_defaults():
+@pytest.mark.integration
+def test_submit_query_job_defaults(client):
     """Test POST /api/v1/jobs/query with defaults."""
     payload = {"organism": "Salmonella enterica"}
     resp = client.post("/api/v1/jobs/query", json=payload)
@@ -40,7 +41,8 @@ def test_submit_query_job_defaults():
     assert data["progress"]["total"] == 20  # default limit
 
 
-def test_submit_accession_job():
+@pytest.mark.integration
+def test_submit_accession_job(client):
     """Test POST /api/v1/jobs/accessions."""
     payload = {
         "accessions": ["GCF_000005845.2", "NC_000913.3", "GCA_000008865.1"],
@@ -54,15 +56,39 @@ def test_submit_accession_job():
     assert data["progress"]["completed"] == 0
 
 
-def test_submit_accession_job_empty_list():
+def test_accession_request_dedupes():
+    """Test repeated accessions are dropped before a job is created."""
+    from ncbi_metadata_harvester.models import AccessionJobRequest
+
+    request = AccessionJobRequest(accessions=["NC_000913.3", "GCF_000005845.2", "NC_000913.3"])
+    assert request.accessions == ["NC_000913.3", "GCF_000005845.2"]
+
+
+def test_submit_accession_job_empty_list(client):
     """Test POST /api/v1/jobs/accessions with empty list fails validation."""
     payload = {"accessions": []}
     resp = client.post("/api/v1/jobs/accessions", json=payload)
     assert resp.status_code == 422  # Unprocessable Entity
 
 
-def test_query_job_invalid_limit():
+def test_query_job_invalid_limit(client):
     """Test POST /api/v1/jobs/query with out-of-range limit."""
     payload = {"organism": "Bacillus subtilis", "limit": 200}
     resp = client.post("/api/v1/jobs/query", json=payload)
     assert resp.status_code == 422  # exceeds max 100
+
+
+def test_query_job_unknown_filter_rejected(client):
+    """Test POST /api/v1/jobs/query rejects misspelled filter keys."""
+    payload = {"organism": "Bacillus subtilis", "filters": {"latest": False}}
+    resp = client.post("/api/v1/jobs/query", json=payload)
+    assert resp.status_code == 422
+
+
+def test_lifespan_manages_shared_ncbi_client():
+    """Test app startup opens the shared NCBI client and shutdown closes it."""
+    from ncbi_metadata_harvester import ncbi_client
+
+    with TestClient(app):
+        assert ncbi_client._ncbi_client is not None
+    assert ncbi_client._ncbi_client is None
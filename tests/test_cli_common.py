@@ -0,0 +1,33 @@
+"""Tests for the command-line scripts' shared helpers."""
+import orjson
+
+from cli_common import dig, head_json_list
+
+
+def test_dig_follows_nested_keys():
+    """Test dig walks nested dicts and falls back to the default."""
+    record = {"dblink": {"biosample": "SAMN1", "bioproject": ""}}
+    assert dig(record, ("dblink", "biosample")) == "SAMN1"
+    assert dig(record, ("dblink", "bioproject")) == "N/A"
+    assert dig(record, ("organism",), "Unknown") == "Unknown"
+
+
+def test_head_json_list_reads_across_chunks(tmp_path):
+    """Test the first items of each list are read without loading the file."""
+    results = [{"accession": f"NC_{n:06d}", "definition": "x" * 500, "size": n} for n in range(200)]
+    errors = [f"Failed to parse GenBank for NC_{n}" for n in range(10)]
+    path = tmp_path / "results.json"
+    path.write_bytes(orjson.dumps({"results": results, "errors": errors}, option=orjson.OPT_INDENT_2))
+
+    assert head_json_list(path, "results", 3) == results[:3]
+    assert head_json_list(path, "errors", 5) == errors[:5]
+    assert head_json_list(path, "missing", 5) == []
+
+
+def test_head_json_list_empty_lists(tmp_path):
+    """Test empty lists yield no items."""
+    path = tmp_path / "results.json"
+    path.write_bytes(b'{"results":[],"errors":[]}')
+
+    assert head_json_list(path, "results", 3) == []
+    assert head_json_list(path, "errors", 5) == []
@@ -0,0 +1,49 @@
+"""Tests for CSV export."""
+import csv
+import io
+
+from ncbi_metadata_harvester.csv_export import CSV_FIELDNAMES, export_results_to_csv, iter_results_to_csv
+
+
+def test_export_empty_results():
+    """Test empty result list returns placeholder text."""
+    assert export_results_to_csv([]) == "No results to export"
+
+
+def test_export_flattens_nested_fields():
+    """Test nested dblink/assembly/references are flattened into columns."""
+    results = [
+        {
+            "accession": "NC_000913",
+            "version": "NC_000913.3",
+            "definition": 'Escherichia coli, "K-12"',
+            "dblink": {"biosample": "SAMN02604091", "bioproject": "PRJNA57779"},
+            "keywords": ["RefSeq", "complete genome"],
+            "assembly": {"accession": "GCF_000005845.2", "level": "Complete Genome"},
+            "references": [{"authors": "Blattner,F.R.", "title": "The complete genome", "pubmed": "9278503"}],
+        },
+        {"accession": "CP184062"},
+    ]
+
+    rows = list(csv.DictReader(io.StringIO(export_results_to_csv(results))))
+
+    assert tuple(rows[0].keys()) == CSV_FIELDNAMES
+    assert rows[0]["definition"] == 'Escherichia coli, "K-12"'
+    assert rows[0]["biosample"] == "SAMN02604091"
+    assert rows[0]["keywords"] == "RefSeq; complete genome"
+    assert rows[0]["assembly_accession"] == "GCF_000005845.2"
+    assert rows[0]["ref_pubmed"] == "9278503"
+    assert rows[0]["ref_journal"] == ""
+    assert rows[1]["accession"] == "CP184062"
+    assert rows[1]["ref_authors"] == ""
+
+
+def test_iter_results_chunks_match_full_export():
+    """Test streamed chunks concatenate to the same CSV as the full export."""
+    results = [{"accession": f"NC_{n:06d}", "keywords": ["RefSeq"]} for n in range(600)]
+
+    chunks = list(iter_results_to_csv(results))
+
+    assert len(chunks) == 3
+    assert "".join(chunks) == export_results_to_csv(results)
+    assert chunks[0].startswith(",".join(CSV_FIELDNAMES))
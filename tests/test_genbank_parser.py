@@ -0,0 +1,95 @@
+"""Tests for GenBank parsing."""
+import pytest
+
+from ncbi_metadata_harvester.genbank_parser import (
+    GenBankRecordSplitter,
+    parse_genbank_header,
+    parse_genbank_record,
+)
+
+SAMPLE_RECORD = """\
+LOCUS       ABC123                    10 bp    DNA     linear   BCT 01-JAN-2020
+DEFINITION  A very long definition line that wraps onto
+            a second line.
+ACCESSION   ABC123 ABC124
+VERSION     ABC123.2
+DBLINK      BioProject: PRJNA1, PRJNA2
+            BioSample: SAMN1
+            Sequence Read Archive: SRR1
+KEYWORDS    .
+SOURCE      Some bug.
+  ORGANISM  Some bug with a very long
+            name continued
+            .
+REFERENCE   1  (bases 1 to 10)
+  CONSRTM   Big Consortium
+  TITLE     A title that
+            wraps
+  JOURNAL   Unpublished
+REFERENCE   2
+  AUTHORS   Smith,A.
+  TITLE     Direct Submission
+  JOURNAL   Submitted
+   PUBMED   12345
+  REMARK    line one
+            line two
+FEATURES             Location/Qualifiers
+     source          1..10
+                     /organism="Some bug"
+ORIGIN
+        1 acgtacgtac
+//
+"""
+
+
+def test_parse_header_fields():
+    """Test header scanner joins continuations and splits structured fields."""
+    parsed = parse_genbank_header(SAMPLE_RECORD)
+
+    assert parsed["locus"] == "ABC123"
+    assert parsed["definition"] == "A very long definition line that wraps onto a second line"
+    assert parsed["accession"] == "ABC123"
+    assert parsed["version"] == "ABC123.2"
+    assert parsed["dblink"] == {"biosample": "SAMN1", "bioproject": "PRJNA1, PRJNA2"}
+    assert parsed["source"] == "Some bug"
+    assert parsed["organism"] == "Some bug with a very long name continued"
+    assert parsed["taxonomy"] == []
+    assert parsed["references"][0]["authors"] == ""
+    assert parsed["references"][0]["title"] == "A title that wraps"
+    assert parsed["references"][1]["pubmed"] == "12345"
+    assert parsed["references"][1]["remark"] == "line one line two"
+
+
+def test_parse_header_rejects_non_genbank():
+    """Test text without a LOCUS line yields None."""
+    assert parse_genbank_header("not a genbank record") is None
+
+
+def test_parse_header_matches_biopython():
+    """Test header scanner output matches the Biopython-based parser."""
+    pytest.importorskip("Bio")
+    assert parse_genbank_header(SAMPLE_RECORD) == parse_genbank_record(SAMPLE_RECORD)
+
+
+def test_record_splitter_handles_chunk_boundaries():
+    """Test streamed chunks are reassembled into records regardless of split points."""
+    second = SAMPLE_RECORD.replace("ABC123", "XYZ789")
+    text = SAMPLE_RECORD + second
+    splitter = GenBankRecordSplitter(headers_only=True)
+
+    records = []
+    for start in range(0, len(text), 7):
+        records.extend(splitter.feed(text[start : start + 7]))
+    records.extend(splitter.close())
+
+    assert len(records) == 2
+    assert "ORIGIN" not in records[0]
+    assert parse_genbank_header(records[1]) == parse_genbank_header(second)
+
+
+def test_parse_record_logs_malformed_input(caplog):
+    """Test malformed records are logged and skipped instead of raising."""
+    pytest.importorskip("Bio")
+    with caplog.at_level("WARNING", logger="ncbi_metadata_harvester.genbank_parser"):
+        assert parse_genbank_record("not a genbank record") is None
+    assert "Failed to parse GenBank record" in caplog.text
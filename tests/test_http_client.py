@@ -1,13 +1,34 @@
-"""Tests for HTTP client, rate limiter, and NCBI client."""
+"""Tests for HTTP client, rate limiter, and NCBI client.
+
+HTTP/2 coverage needs the ``h2`` package (installed via ``httpx[http2]``).
+"""
 import asyncio
+import dataclasses
 import time
 
 import httpx
 import pytest
 from pytest import approx
 
-from ncbi_metadata_harvester.http_client import RetryableHTTPClient
-from ncbi_metadata_harvester.rate_limiter import TokenBucketRateLimiter
+from ncbi_metadata_harvester import http_client
+from ncbi_metadata_harvester.config import get_settings
+from ncbi_metadata_harvester.http_client import RetryableHTTPClient, with_retries
+from ncbi_metadata_harvester.rate_limiter import SlidingWindowRateLimiter, TokenBucketRateLimiter
+
+
+class FakeClock:
+    """Virtual monotonic clock whose sleep advances time instead of waiting."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
 
 
 class TestTokenBucketRateLimiter:
@@ -16,33 +37,54 @@ class TestTokenBucketRateLimiter:
     @pytest.mark.asyncio
     async def test_rate_limiting(self):
         """Test that rate limiter enforces rate."""
-        rate = 10.0  # 10 requests per second
-        limiter = TokenBucketRateLimiter(rate=rate, burst=1)
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(rate=10.0, burst=1, time_func=clock.time, sleep_func=clock.sleep)
 
-        start = time.monotonic()
         for _ in range(5):
             await limiter.acquire()
-        elapsed = time.monotonic() - start
 
-        # Should take ~0.4s (4 waits of ~0.1s each)
-        # Allow some tolerance for timing variance
-        assert elapsed >= 0.3, f"Too fast: {elapsed}s"
-        assert elapsed < 0.7, f"Too slow: {elapsed}s"
+        # One burst token, then a 0.1s wait for each of the other 4
+        assert clock.sleeps == [approx(0.1)] * 4
+        assert clock.now == approx(0.4)
 
     @pytest.mark.asyncio
     async def test_burst_allowance(self):
         """Test that burst allows initial requests without delay."""
-        rate = 5.0
-        burst = 3
-        limiter = TokenBucketRateLimiter(rate=rate, burst=burst)
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(rate=5.0, burst=3, time_func=clock.time, sleep_func=clock.sleep)
 
-        start = time.monotonic()
         for _ in range(3):  # First 3 should be instant (burst)
             await limiter.acquire()
-        elapsed = time.monotonic() - start
 
-        # Should be nearly instant (< 0.1s)
-        assert elapsed < 0.1, f"Burst not working: {elapsed}s"
+        assert clock.sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_respect_rate(self):
+        """Test fast-path callers cannot overtake a waiter and exceed the rate."""
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(rate=10.0, burst=2, time_func=clock.time, sleep_func=clock.sleep)
+
+        await asyncio.gather(*[limiter.acquire() for _ in range(8)])
+
+        # 2 burst tokens, then 6 more at 10 rps
+        assert clock.now == approx(0.6)
+
+
+class TestSlidingWindowRateLimiter:
+    """Tests for sliding window rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_blocks_when_window_full(self):
+        """Test the request after ``rate`` admissions waits for the window to slide."""
+        limiter = SlidingWindowRateLimiter(rate=3)
+        limiter.window = 0.2
+
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        assert time.monotonic() - start < 0.1
+        await limiter.acquire()
+        assert time.monotonic() - start >= 0.19
 
 
 class TestRetryableHTTPClient:
@@ -100,20 +142,170 @@ class TestRetryableHTTPClient:
                 await client.get("https://example.com/test")
 
     @pytest.mark.asyncio
-    async def test_exponential_backoff(self, httpx_mock):
+    async def test_exponential_backoff(self, httpx_mock, monkeypatch):
         """Test exponential backoff timing."""
         # Fail twice, then succeed
         httpx_mock.add_response(url="https://example.com/test", status_code=500)
         httpx_mock.add_response(url="https://example.com/test", status_code=500)
         httpx_mock.add_response(url="https://example.com/test", json={"status": "ok"})
 
-        base_delay = 0.1
-        async with RetryableHTTPClient(base_delay=base_delay, max_retries=3) as client:
-            start = time.monotonic()
+        # Pin the jitter to its upper bound so the delays are deterministic
+        monkeypatch.setattr(http_client.random, "uniform", lambda low, high: high)
+        clock = FakeClock()
+        async with RetryableHTTPClient(base_delay=0.1, max_retries=3, sleep=clock.sleep) as client:
             resp = await client.get("https://example.com/test")
-            elapsed = time.monotonic() - start
 
-            # Should have 2 backoffs: ~0.1s and ~0.2s (with jitter ±25%)
-            # Minimum: ~0.225s (0.075 + 0.15), allow some tolerance
-            assert elapsed >= 0.15, f"Backoff too short: {elapsed}s"
-            assert resp.status_code == 200
+        # Decorrelated jitter upper bounds: 3 * base, then 3 * previous delay
+        assert clock.sleeps == [approx(0.3), approx(0.9)]
+        assert resp.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_honors_retry_after(self, httpx_mock):
+        """Test Retry-After sets a floor on the backoff delay."""
+        httpx_mock.add_response(url="https://example.com/test", status_code=429, headers={"Retry-After": "0.3"})
+        httpx_mock.add_response(url="https://example.com/test", json={"status": "ok"})
+
+        clock = FakeClock()
+        async with RetryableHTTPClient(base_delay=0.01, max_retries=1, sleep=clock.sleep) as client:
+            resp = await client.get("https://example.com/test")
+
+        assert clock.sleeps[0] >= 0.3, f"Retry-After ignored: {clock.sleeps}"
+        assert resp.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_stream_retries_before_body(self, httpx_mock):
+        """Test streaming requests retry on server errors before yielding the body."""
+        httpx_mock.add_response(url="https://example.com/stream", status_code=503)
+        httpx_mock.add_response(url="https://example.com/stream", text="LOCUS       A\n//\n")
+
+        async with RetryableHTTPClient(base_delay=0.01, max_retries=2) as client:
+            async with client.stream("GET", "https://example.com/stream") as resp:
+                body = "".join([chunk async for chunk in resp.aiter_text()])
+
+        assert body == "LOCUS       A\n//\n"
+
+    @pytest.mark.asyncio
+    async def test_reuses_connection(self):
+        """Test sequential requests to one host share a single pooled connection."""
+        handlers = []
+
+        async def handle(reader, writer):
+            handlers.append(asyncio.current_task())
+            try:
+                while await reader.readuntil(b"\r\n\r\n"):
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                    await writer.drain()
+            except asyncio.IncompleteReadError:
+                pass  # client closed the connection
+            finally:
+                writer.close()
+                await writer.wait_closed()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            async with RetryableHTTPClient(http2=False) as client:
+                for _ in range(5):
+                    resp = await client.get(f"http://127.0.0.1:{port}/esummary")
+                    assert resp.text == "ok"
+            # Let the handler see the client's EOF and close its side
+            await asyncio.gather(*handlers)
+
+        assert len(handlers) == 1
+
+    @pytest.mark.asyncio
+    async def test_http2_pool_config(self):
+        """Test the client's connection pool is configured for HTTP/2 with 32 keep-alive connections."""
+        pytest.importorskip("h2")
+        async with RetryableHTTPClient() as client:
+            pool = client._client._transport._pool
+            assert pool._http2 is True
+            assert pool._max_keepalive_connections == 32
+
+    @pytest.mark.asyncio
+    async def test_concurrent_retries_capped(self, httpx_mock):
+        """Test no more than max_concurrent_retries callers back off and retry at once."""
+        for _ in range(3):
+            httpx_mock.add_response(url="https://example.com/test", status_code=503)
+        for _ in range(3):
+            httpx_mock.add_response(url="https://example.com/test", json={"status": "ok"})
+        retrying = peak = 0
+
+        async def sleep(delay):
+            nonlocal retrying, peak
+            retrying += 1
+            peak = max(peak, retrying)
+            await asyncio.sleep(0.01)
+            retrying -= 1
+
+        async with RetryableHTTPClient(base_delay=0.01, max_retries=1, sleep=sleep, max_concurrent_retries=1) as client:
+            responses = await asyncio.gather(*(client.get("https://example.com/test") for _ in range(3)))
+
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        assert peak == 1
+
+    def test_decorrelated_backoff_bounds(self):
+        """Test backoff stays within [base, min(max, 3 * prev)]."""
+        client = RetryableHTTPClient(base_delay=0.5, max_delay=8.0)
+        delay = 0.0
+        for _ in range(20):
+            upper = min(8.0, max(0.5, delay) * 3)
+            delay = client._calculate_backoff(delay)
+            assert 0.5 <= delay <= upper
+
+
+class TestWithRetries:
+    """Tests for the with_retries helper used by the job scripts."""
+
+    @pytest.fixture(autouse=True)
+    def fast_settings(self, monkeypatch):
+        fast = dataclasses.replace(get_settings(), max_retries=2, retry_base_delay=0.001, retry_max_delay=0.01)
+        monkeypatch.setattr(http_client, "get_settings", lambda: fast)
+
+    @pytest.mark.asyncio
+    async def test_retries_gateway_errors(self, httpx_mock):
+        """Test 503 responses are retried until success."""
+        httpx_mock.add_response(url="https://example.com/job", status_code=503)
+        httpx_mock.add_response(url="https://example.com/job", json={"status": "running"})
+
+        async with httpx.AsyncClient() as client:
+            resp = await with_retries(lambda: client.get("https://example.com/job"))
+        assert resp.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_backoff_delays(self, httpx_mock, monkeypatch):
+        """Test each retry sleeps base_delay * 2**attempt scaled by the 0.5-1.5 jitter."""
+        settings = dataclasses.replace(get_settings(), max_retries=2, retry_base_delay=0.1, retry_max_delay=1.0)
+        monkeypatch.setattr(http_client, "get_settings", lambda: settings)
+        clock = FakeClock()
+        httpx_mock.add_response(url="https://example.com/job", status_code=503)
+        httpx_mock.add_response(url="https://example.com/job", status_code=504)
+        httpx_mock.add_response(url="https://example.com/job", json={"status": "running"})
+
+        async with httpx.AsyncClient() as client:
+            resp = await with_retries(lambda: client.get("https://example.com/job"), sleep=clock.sleep)
+        assert resp.status_code == 200
+        assert len(clock.sleeps) == 2
+        assert 0.05 <= clock.sleeps[0] <= 0.15
+        assert 0.1 <= clock.sleeps[1] <= 0.3
+
+    @pytest.mark.asyncio
+    async def test_returns_last_response_when_exhausted(self, httpx_mock):
+        """Test the final 502 response is returned for the caller to handle."""
+        for _ in range(3):
+            httpx_mock.add_response(url="https://example.com/job", status_code=502)
+
+        async with httpx.AsyncClient() as client:
+            resp = await with_retries(lambda: client.get("https://example.com/job"))
+        assert resp.status_code == 502
+        assert len(httpx_mock.get_requests()) == 3
+
+    @pytest.mark.asyncio
+    async def test_non_idempotent_not_retried_after_send(self, httpx_mock):
+        """Test a POST is not repeated once it may have reached the server."""
+        httpx_mock.add_exception(httpx.ReadTimeout("timed out"), url="https://example.com/jobs")
+
+        async with httpx.AsyncClient() as client:
+            with pytest.raises(httpx.ReadTimeout):
+                await with_retries(lambda: client.post("https://example.com/jobs", json={}), idempotent=False)
+        assert len(httpx_mock.get_requests()) == 1
@@ -0,0 +1,115 @@
+"""Tests for background job processing helpers."""
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from ncbi_metadata_harvester import job_processor
+from ncbi_metadata_harvester.job_processor import _coalesced, _iter_parsed_batches, get_parse_pool, shutdown_parse_pool
+
+RECORD = """\
+LOCUS       {acc}                    10 bp    DNA     linear   BCT 01-JAN-2020
+DEFINITION  Test record.
+ACCESSION   {acc}
+VERSION     {acc}.1
+ORIGIN
+        1 acgtacgtac
+//
+"""
+
+
+class FakeClient:
+    """Minimal efetch stub; earlier batches answer slower than later ones."""
+
+    def __init__(self):
+        self.fetched: list[list[str]] = []
+
+    @asynccontextmanager
+    async def efetch_stream(self, db, id, rettype, retmode, cache_headers=False):
+        self.fetched.append(list(id))
+        await asyncio.sleep(0.05 / len(self.fetched))
+        text = "".join(RECORD.format(acc=nid) for nid in id)
+
+        class Response:
+            async def aiter_text(self):
+                # Split mid-line to exercise the record splitter
+                for start in range(0, len(text), 37):
+                    yield text[start : start + 37]
+
+        yield Response()
+
+
+@pytest.mark.asyncio
+async def test_parsed_batches_keep_order_and_skip_repeats():
+    """Test batches are yielded in order and repeated IDs are fetched once."""
+    client = FakeClient()
+    pairs = [("A00001", None), ("A00002", None), ("A00001", None), ("A00003", None)]
+
+    batches = [
+        (batch, fetched, parsed)
+        async for batch, fetched, parsed in _iter_parsed_batches(client, pairs, 2, asyncio.Semaphore(4))
+    ]
+
+    assert [b for b, _, _ in batches] == [pairs[:2], pairs[2:]]
+    assert batches[1][1] == {"A00003"}
+    assert [p["accession"] for p in batches[1][2]] == ["A00003"]
+    assert sorted(client.fetched) == [["A00001", "A00002"], ["A00003"]]
+
+
+@pytest.fixture
+def resolved(monkeypatch):
+    """Isolate the process-wide lookup memo for one test."""
+    memo = {}
+    monkeypatch.setattr(job_processor, "_resolved", memo)
+    return memo
+
+
+@pytest.mark.asyncio
+async def test_coalesced_shares_lookup_and_skips_failures(resolved):
+    """Test concurrent lookups share one call and failed lookups are not memoized."""
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ("NC_000913.3", {"assemblyaccession": "GCF_000005845.2"})
+
+    results = await asyncio.gather(*[_coalesced("test:GCF_000005845.2", lookup) for _ in range(5)])
+    assert len(calls) == 1
+    assert all(r == results[0] for r in results)
+    assert await _coalesced("test:GCF_000005845.2", lookup) == results[0]
+    assert len(calls) == 1
+
+    async def failing():
+        calls.append(1)
+        return None
+
+    assert await _coalesced("test:missing", failing) is None
+    assert await _coalesced("test:missing", failing) is None
+    assert len(calls) == 3
+
+
+async def test_coalesced_memo_expires(resolved, monkeypatch):
+    """Test memoized lookups are redone once their TTL has passed."""
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        return ("NC_000913.3", {})
+
+    monkeypatch.setattr(job_processor, "_RESOLVED_TTL", 0.0)
+    await _coalesced("test:expiring", lookup)
+    await _coalesced("test:expiring", lookup)
+    assert len(calls) == 2
+
+
+async def test_parse_pool_created_lazily_and_shut_down():
+    """Test the parse pool is opened on first use and replaced after shutdown."""
+    await shutdown_parse_pool()
+    assert job_processor._parse_pool is None
+    pool = get_parse_pool()
+    assert get_parse_pool() is pool
+
+    await shutdown_parse_pool()
+    assert job_processor._parse_pool is None
+    assert get_parse_pool() is not pool
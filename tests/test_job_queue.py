@@ -0,0 +1,95 @@
+"""Tests for the Redis-backed job queue."""
+import asyncio
+
+import pytest
+
+from ncbi_metadata_harvester import job_queue
+from ncbi_metadata_harvester.job_queue import RedisJobQueue
+from ncbi_metadata_harvester.job_store import RedisJobStore
+from ncbi_metadata_harvester.models import JobStatus
+
+
+@pytest.fixture
+def queue():
+    fakeredis = pytest.importorskip("fakeredis")
+    store = RedisJobStore("redis://unused", client=fakeredis.FakeAsyncRedis())
+    return RedisJobQueue(store, worker_id="worker-a", poll_timeout=0.05, error_backoff=0.0)
+
+
+class TestRedisJobQueue:
+    """Tests for RedisJobQueue (against fakeredis)."""
+
+    @pytest.mark.asyncio
+    async def test_execute_runs_job_once_and_releases_lease(self, queue, monkeypatch):
+        """Test a queued job runs once and duplicate queue entries are dropped."""
+        calls = []
+
+        async def fake_process(job_id, input_data):
+            calls.append(job_id)
+            await queue.store.update_job_status(job_id, JobStatus.SUCCEEDED)
+
+        monkeypatch.setattr(job_queue, "process_accession_job", fake_process)
+        await queue.store.create_job(job_id="q-1", input_data={"accessions": ["NC_1"]}, total=1)
+
+        assert await queue.execute("q-1") is True
+        assert await queue.execute("q-1") is False
+        assert calls == ["q-1"]
+        assert not await queue.client.exists("lock:q-1")
+
+    @pytest.mark.asyncio
+    async def test_execute_skips_job_leased_elsewhere(self, queue, monkeypatch):
+        """Test a job whose lease is held by another worker is not run."""
+        monkeypatch.setattr(job_queue, "process_query_job", pytest.fail)
+        await queue.store.create_job(job_id="q-2", input_data={"organism": "E. coli"}, total=1)
+        await queue.client.set("lock:q-2", "worker-b")
+
+        assert await queue.execute("q-2") is False
+        assert await queue.client.get("lock:q-2") == b"worker-b"
+
+    @pytest.mark.asyncio
+    async def test_requeue_orphans(self, queue):
+        """Test running jobs without a lease are reset and requeued."""
+        store = queue.store
+        for job_id in ("orphan", "leased"):
+            await store.create_job(job_id=job_id, input_data={"accessions": ["NC_1"]}, total=1)
+            await store.update_job_status(job_id, JobStatus.RUNNING)
+            await store.add_job_result(job_id, {"accession": "NC_1"})
+        await queue.client.set("lock:leased", "worker-b")
+
+        assert await queue.requeue_orphans() == ["orphan"]
+
+        job = await store.get_job("orphan")
+        assert job.status == JobStatus.QUEUED
+        assert job.progress.completed == 0
+        assert await store.get_job_results("orphan") == ([], [])
+        assert await queue.client.lrange(RedisJobQueue.QUEUE_KEY, 0, -1) == [b"orphan"]
+
+    @pytest.mark.asyncio
+    async def test_run_survives_redis_error(self, queue, monkeypatch):
+        """Test a failed pop is logged and the consumer goes on to the next item."""
+        done = asyncio.Event()
+        blpop = queue.client.blpop
+        failures = []
+
+        async def flaky_blpop(*args, **kwargs):
+            if done.is_set():
+                raise asyncio.CancelledError  # stop between pops rather than mid-call
+            if not failures:
+                failures.append(True)
+                raise job_queue.redis.ConnectionError("connection reset")
+            return await blpop(*args, **kwargs)
+
+        async def fake_process(job_id, input_data):
+            await queue.store.update_job_status(job_id, JobStatus.SUCCEEDED)
+            done.set()
+
+        monkeypatch.setattr(queue.client, "blpop", flaky_blpop)
+        monkeypatch.setattr(job_queue, "process_accession_job", fake_process)
+        await queue.store.create_job(job_id="q-3", input_data={"accessions": ["NC_1"]}, total=1)
+        await queue.submit("q-3")
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(queue.run(), 5.0)
+        assert done.is_set()
+        assert failures == [True]
+        assert (await queue.store.get_job("q-3")).status == JobStatus.SUCCEEDED
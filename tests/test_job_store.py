@@ -1,80 +1,220 @@
 """Tests for job store and job management endpoints."""
+import asyncio
+import csv
+import uuid
+from types import MappingProxyType
+
+import orjson
 import pytest
-from fastapi.testclient import TestClient
 
-from ncbi_metadata_harvester.job_store import JobStore, get_job_store
-from ncbi_metadata_harvester.main import app
-from ncbi_metadata_harvester.models import JobStatus
+from ncbi_metadata_harvester import job_store
+from ncbi_metadata_harvester.csv_export import CSV_FIELDNAMES
+from ncbi_metadata_harvester.job_store import JobStore, RedisJobStore
+from ncbi_metadata_harvester.models import JobResponse, JobStatus
+
+# Shared read-only payloads; copy with dict() where a mutable/serializable dict is needed
+_SALMONELLA_PAYLOAD = MappingProxyType({"organism": "Salmonella", "limit": 10})
+_NC123 = MappingProxyType({"accession": "NC_123", "organism": "E. coli"})
+_NC456 = MappingProxyType({"accession": "NC_456", "organism": "E. coli"})
+
+
+@pytest.fixture
+def jid(request):
+    """A job id unique to this test, so ids never collide across tests or xdist workers."""
+    return f"{request.node.name}-{uuid.uuid4().hex[:8]}"
+
+
+async def _scenario_create(store: JobStore, job_id: str) -> None:
+    job = await store.create_job(job_id=job_id, input_data={"organism": "E. coli"}, total=10)
+    assert job.status == JobStatus.QUEUED
+    assert (job.progress.total, job.progress.completed) == (10, 0)
+
+    retrieved = await store.get_job(job_id)
+    assert retrieved is not None
+    assert retrieved.job_id == job_id
+
+
+async def _scenario_status(store: JobStore, job_id: str) -> None:
+    await store.create_job(job_id=job_id, input_data={}, total=5)
+    await store.update_job_status(job_id, JobStatus.RUNNING)
+    assert (await store.get_job(job_id)).status == JobStatus.RUNNING
 
-client = TestClient(app)
 
+async def _scenario_result(store: JobStore, job_id: str) -> None:
+    await store.create_job(job_id=job_id, input_data={}, total=3)
+    await store.add_job_results_bulk(job_id, [{"accession": "NC_123"}, {"accession": "NC_456"}])
+    job = await store.get_job(job_id)
+    assert job.progress.completed == 2
+    assert len(job.results) == 2
 
+
+async def _scenario_error(store: JobStore, job_id: str) -> None:
+    await store.create_job(job_id=job_id, input_data={}, total=5)
+    await store.add_job_errors_bulk(job_id, ["Failed to fetch accession", "Timeout"])
+    job = await store.get_job(job_id)
+    assert job.progress.errors == 2
+    assert len(job.errors) == 2
+
+
+@pytest.mark.asyncio(scope="module")
 class TestJobStore:
     """Tests for JobStore."""
 
-    @pytest.mark.asyncio
-    async def test_create_and_get_job(self):
-        """Test creating and retrieving a job."""
+    @pytest.fixture(scope="module")
+    def store(self):
         store = JobStore()
-        job = await store.create_job(
-            job_id="test-123",
-            input_data={"organism": "E. coli"},
-            total=10,
+        yield store
+        store._jobs.clear()
+        store._changed.clear()
+
+    async def test_all_store_scenarios(self, jid):
+        """Test create/get, status updates, results and errors, run concurrently on separate stores."""
+        await asyncio.gather(
+            _scenario_create(JobStore(), f"{jid}-create"),
+            _scenario_status(JobStore(), f"{jid}-status"),
+            _scenario_result(JobStore(), f"{jid}-result"),
+            _scenario_error(JobStore(), f"{jid}-error"),
         )
 
-        assert job.job_id == "test-123"
-        assert job.status == JobStatus.QUEUED
-        assert job.progress.total == 10
-        assert job.progress.completed == 0
+    async def test_job_snapshots_are_not_mutated(self, store, jid):
+        """Test updates swap in a new job snapshot instead of mutating the old one."""
+        before = await store.create_job(job_id=jid, input_data={}, total=2)
 
-        retrieved = await store.get_job("test-123")
-        assert retrieved is not None
-        assert retrieved.job_id == "test-123"
+        await store.add_job_result(jid, {"accession": "NC_1"})
+        await store.update_job_status(jid, JobStatus.RUNNING)
+        after = await store.get_job(jid)
 
-    @pytest.mark.asyncio
-    async def test_update_job_status(self):
-        """Test updating job status."""
-        store = JobStore()
-        await store.create_job(job_id="test-456", input_data={}, total=5)
+        assert (before.status, before.progress.completed) == (JobStatus.QUEUED, 0)
+        assert (after.status, after.progress.completed) == (JobStatus.RUNNING, 1)
+        assert after.updated_at >= before.updated_at
+
+    async def test_watch_job_yields_changes_until_terminal(self, store, jid):
+        """Test watchers see each change and stop after the job finishes."""
+        await store.create_job(job_id=jid, input_data={}, total=1)
+
+        async def run_job():
+            await store.update_job_status(jid, JobStatus.RUNNING)
+            await store.add_job_result(jid, {"accession": "NC_1"})
+            await store.update_job_status(jid, JobStatus.SUCCEEDED)
+
+        seen = []
+        async for job in store.watch_job(jid):
+            seen.append(job.status)
+            if len(seen) == 1:
+                asyncio.get_running_loop().call_soon(asyncio.ensure_future, run_job())
 
-        await store.update_job_status("test-456", JobStatus.RUNNING)
-        job = await store.get_job("test-456")
+        assert seen[0] == JobStatus.QUEUED
+        assert seen[-1] == JobStatus.SUCCEEDED
+
+    async def test_succeeded_job_keeps_results(self, store, jid):
+        """Test results added before success stay on the finished job."""
+        await store.create_job(job_id=jid, input_data={"organism": "E. coli"}, total=2)
+        await store.add_job_results_bulk(jid, [{"accession": "NC_123"}, {"accession": "NC_456"}])
+        await store.update_job_status(jid, JobStatus.SUCCEEDED)
+
+        job = await store.get_job(jid)
+        assert job.status == JobStatus.SUCCEEDED
+        assert [r["accession"] for r in job.results] == ["NC_123", "NC_456"]
+
+    async def test_list_jobs_newest_first(self, store, jid):
+        """Test list_jobs returns the most recently created jobs first."""
+        for n in range(5):
+            await store.create_job(job_id=f"{jid}-{n}", input_data={}, total=1)
+
+        jobs = await store.list_jobs(limit=3)
+        assert [j.job_id for j in jobs] == [f"{jid}-4", f"{jid}-3", f"{jid}-2"]
+
+    async def test_bulk_add_updates_progress(self, store, jid):
+        """Test bulk result/error adds update progress once per batch."""
+        await store.create_job(job_id=jid, input_data={}, total=4)
+
+        await store.add_job_results_bulk(jid, [{"accession": "NC_1"}, {"accession": "NC_2"}])
+        await store.add_job_results_bulk(jid, [{"accession": "NC_3"}])
+        await store.add_job_errors_bulk(jid, ["Failed to parse GenBank for NC_4"])
+
+        job = await store.get_job(jid)
+        assert job.progress.completed == 3
+        assert job.progress.errors == 1
+        assert [r["accession"] for r in job.results] == ["NC_1", "NC_2", "NC_3"]
+
+
+@pytest.mark.asyncio(scope="module")
+class TestRedisJobStore:
+    """Tests for RedisJobStore (against fakeredis)."""
+
+    @pytest.fixture
+    def store(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return RedisJobStore("redis://unused", client=fakeredis.FakeAsyncRedis())
+
+    async def test_round_trip(self, store, jid):
+        """Test job state, results and errors survive serialization."""
+        await store.create_job(job_id=jid, input_data={"accessions": ["NC_000913.3"]}, total=2)
+        await store.update_job_status(jid, JobStatus.RUNNING)
+        await store.add_job_results_bulk(jid, [{"accession": "NC_000913"}])
+        await store.add_job_error(jid, "Failed to parse GenBank for CP000001")
+
+        job = await store.get_job(jid)
         assert job.status == JobStatus.RUNNING
+        assert job.input_data == {"accessions": ["NC_000913.3"]}
+        assert (job.progress.total, job.progress.completed, job.progress.errors) == (2, 1, 1)
+        assert job.results == []  # results are only loaded on demand
 
-    @pytest.mark.asyncio
-    async def test_add_result_updates_progress(self):
-        """Test adding results updates progress."""
-        store = JobStore()
-        await store.create_job(job_id="test-789", input_data={}, total=3)
+        results, errors = await store.get_job_results(jid)
+        assert results == [{"accession": "NC_000913"}]
+        assert errors == ["Failed to parse GenBank for CP000001"]
 
-        await store.add_job_result("test-789", {"accession": "NC_123"})
-        await store.add_job_result("test-789", {"accession": "NC_456"})
+    async def test_watch_job_wakes_on_published_change(self, store, jid):
+        """Test watchers are woken by the events channel rather than the heartbeat."""
 
-        job = await store.get_job("test-789")
-        assert job.progress.completed == 2
-        assert len(job.results) == 2
+        await store.create_job(job_id=jid, input_data={}, total=1)
+        watcher = store.watch_job(jid, heartbeat=30.0)
+        assert (await anext(watcher)).status == JobStatus.QUEUED
 
-    @pytest.mark.asyncio
-    async def test_add_error_updates_progress(self):
-        """Test adding errors updates progress."""
-        store = JobStore()
-        await store.create_job(job_id="test-error", input_data={}, total=5)
+        asyncio.get_running_loop().call_later(
+            0.05, asyncio.ensure_future, store.update_job_status(jid, JobStatus.FAILED)
+        )
+        job = await asyncio.wait_for(anext(watcher), 5.0)
+        assert job.status == JobStatus.FAILED
+        await watcher.aclose()
+
+    async def test_create_rejects_duplicate_and_lists_newest_first(self, store, jid):
+        """Test duplicate job IDs are rejected and listing is newest first."""
+        await store.create_job(job_id=f"{jid}-a", input_data={}, total=1)
+        await store.create_job(job_id=f"{jid}-b", input_data={}, total=1)
+        with pytest.raises(ValueError):
+            await store.create_job(job_id=f"{jid}-a", input_data={}, total=1)
+
+        assert [j.job_id for j in await store.list_jobs()] == [f"{jid}-b", f"{jid}-a"]
+        assert await store.get_job("missing") is None
+        assert await store.get_job_results("missing") is None
 
-        await store.add_job_error("test-error", "Failed to fetch accession")
-        await store.add_job_error("test-error", "Timeout")
+    async def test_create_is_atomic(self, store, jid):
+        """Test a created job hash is complete and expires, and partial hashes read as missing."""
+        await store.create_job(job_id=jid, input_data={}, total=1)
+        key = RedisJobStore._key(jid)
+        assert await store.client.ttl(key) > 0
+        assert (await store.client.hgetall(key))[b"job_id"] == jid.encode()
 
-        job = await store.get_job("test-error")
-        assert job.progress.errors == 2
-        assert len(job.errors) == 2
+        # A hash left by an older, non-atomic create must not break readers
+        await store.client.hset(RedisJobStore._key(f"{jid}-partial"), "job_id", f"{jid}-partial")
+        assert await store.get_job(f"{jid}-partial") is None
 
 
 class TestJobEndpoints:
     """Tests for job management endpoints."""
 
-    def test_submit_query_job_creates_job(self):
+    @pytest.fixture(autouse=True)
+    def store(self, monkeypatch):
+        """Give each endpoint test its own empty store behind get_job_store()."""
+        store = JobStore()
+        monkeypatch.setattr(job_store, "_job_store", store)
+        return store
+
+    @pytest.mark.integration
+    def test_submit_query_job_creates_job(self, client):
         """Test submitting a query job creates it in the store."""
-        payload = {"organism": "Salmonella", "limit": 10}
-        resp = client.post("/api/v1/jobs/query", json=payload)
+        resp = client.post("/api/v1/jobs/query", json=dict(_SALMONELLA_PAYLOAD))
         
         assert resp.status_code == 202
         data = resp.json()
@@ -83,68 +223,174 @@ class TestJobEndpoints:
         # Verify job is retrievable
         status_resp = client.get(f"/api/v1/jobs/{job_id}")
         assert status_resp.status_code == 200
-        assert status_resp.json()["job_id"] == job_id
-        # Note: job may be queued or already processed in tests
-        assert status_resp.json()["status"] in ["queued", "running", "succeeded", "failed"]
+        # Note: job may be queued or already processed in tests; the model accepts any JobStatus
+        status = JobResponse.model_validate_json(status_resp.content)
+        assert status.job_id == job_id
 
-    def test_get_job_status_not_found(self):
+    def test_get_job_status_not_found(self, client):
         """Test getting status for non-existent job returns 404."""
         resp = client.get("/api/v1/jobs/nonexistent-job-id")
         assert resp.status_code == 404
 
-    def test_get_results_job_not_ready(self):
-        """Test getting results when job is manually kept in queued state."""
-        # Manually create a job that stays queued (no background task)
-        store = get_job_store()
-        import asyncio
-        job = asyncio.run(store.create_job(
-            job_id="test-not-ready",
-            input_data={"organism": "Bacillus"},
-            total=5
-        ))
-        
-        # Job is queued, not succeeded
-        results_resp = client.get("/api/v1/jobs/test-not-ready/results")
+    def test_get_job_status_conditional(self, client, store, jid):
+        """Test job status returns an ETag and 304 when the job has not changed."""
+        store._create_job_unsafe(jid, {}, total=3)
+
+        resp = client.get(f"/api/v1/jobs/{jid}")
+        assert resp.status_code == 200
+        etag = resp.headers["etag"]
+        assert "last-modified" in resp.headers
+
+        cached = client.get(f"/api/v1/jobs/{jid}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        asyncio.run(store.add_job_result(jid, {"accession": "NC_1"}))
+        changed = client.get(f"/api/v1/jobs/{jid}", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert "no-cache" in changed.headers["cache-control"]
+
+    def test_get_job_status_terminal_immutable(self, client, store, jid):
+        """Test finished jobs are served with a long-lived immutable Cache-Control."""
+        store._create_job_unsafe(jid, {}, total=1)
+        store._set_status(jid, JobStatus.FAILED)
+
+        resp = client.get(f"/api/v1/jobs/{jid}")
+        assert resp.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    def test_get_job_progress(self, client, store, jid):
+        """Test the compact status endpoint returns only status and progress."""
+        store._create_job_unsafe(jid, {}, total=4)
+
+        resp = client.get(f"/api/v1/jobs/{jid}/status")
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "status": "queued",
+            "progress": {"total": 4, "completed": 0, "errors": 0},
+        }
+
+        assert client.get("/api/v1/jobs/nonexistent-job-id/status").status_code == 404
+
+    def test_get_jobs_progress_batch(self, client, store, jid):
+        """Test the batch status endpoint returns known jobs and omits unknown ids."""
+        store._create_job_unsafe(f"{jid}-1", {}, total=1)
+        store._create_job_unsafe(f"{jid}-2", {}, total=2)
+
+        resp = client.get("/api/v1/jobs", params={"ids": f"{jid}-1,{jid}-2,missing"})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert set(data) == {f"{jid}-1", f"{jid}-2"}
+        assert data[f"{jid}-2"]["progress"]["total"] == 2
+
+    async def test_get_results_job_not_ready(self, async_client, store, jid):
+        """Test getting results for a job that is still queued returns 400."""
+        # Primed directly in the store, so no background task ever runs it
+        await store.create_job(job_id=jid, input_data={"organism": "Bacillus"}, total=5)
+
+        results_resp = await async_client.get(f"/api/v1/jobs/{jid}/results")
         assert results_resp.status_code == 400
         assert "not ready" in results_resp.json()["detail"].lower()
 
-    @pytest.mark.asyncio
-    async def test_get_results_when_succeeded(self):
-        """Test getting results when job is succeeded."""
-        # Manually create a succeeded job
-        store = get_job_store()
-        job = await store.create_job(
-            job_id="test-success",
-            input_data={"organism": "E. coli"},
-            total=2,
-        )
-        await store.add_job_result("test-success", {"accession": "NC_123", "organism": "E. coli"})
-        await store.add_job_result("test-success", {"accession": "NC_456", "organism": "E. coli"})
-        await store.update_job_status("test-success", JobStatus.SUCCEEDED)
+    async def test_get_results_when_succeeded(self, async_client, store, jid):
+        """Test a succeeded job links to its results and serves the JSON envelope."""
+        await store.create_job(job_id=jid, input_data={"organism": "E. coli"}, total=2)
+        await store.add_job_results_bulk(jid, [dict(_NC123), dict(_NC456)])
+        await store.update_job_status(jid, JobStatus.SUCCEEDED)
 
-        # Get status endpoint should include links
-        status_resp = client.get("/api/v1/jobs/test-success")
+        status_resp = await async_client.get(f"/api/v1/jobs/{jid}")
         assert status_resp.status_code == 200
-        data = status_resp.json()
-        assert data["status"] == "succeeded"
-        assert "links" in data
-        assert "results_json" in data["links"]
+        status = JobResponse.model_validate_json(status_resp.content)
+        assert status.status == JobStatus.SUCCEEDED
+        assert status.links["results_json"]
 
-        # Get results
-        results_resp = client.get("/api/v1/jobs/test-success/results?format=json")
+        results_resp = await async_client.get(f"/api/v1/jobs/{jid}/results?format=json")
         assert results_resp.status_code == 200
-        results = results_resp.json()
-        assert len(results["results"]) == 2
-        assert results["results"][0]["accession"] == "NC_123"
+        results = orjson.loads(results_resp.content)
+        assert set(results) >= {"results", "errors"}
+        assert [r["accession"] for r in results["results"]] == ["NC_123", "NC_456"]
 
-    @pytest.mark.asyncio
-    async def test_get_results_invalid_format(self):
+    def test_get_results_invalid_format(self, client, store, jid):
         """Test getting results with invalid format returns 400."""
         # Create a succeeded job so format validation is reached
-        store = get_job_store()
-        await store.create_job(job_id="test-format", input_data={"organism": "Test"}, total=1)
-        await store.update_job_status("test-format", JobStatus.SUCCEEDED)
+        store._create_job_unsafe(jid, {"organism": "Test"}, total=1)
+        store._set_status(jid, JobStatus.SUCCEEDED)
 
-        results_resp = client.get("/api/v1/jobs/test-format/results?format=xml")
+        results_resp = client.get(f"/api/v1/jobs/{jid}/results?format=xml")
         assert results_resp.status_code == 400
         assert "Invalid format" in results_resp.json()["detail"]
+
+    async def test_get_results_csv_streamed(self, async_client, store, jid):
+        """Test CSV results are streamed as an attachment."""
+        await store.create_job(job_id=jid, input_data={}, total=1)
+        await store.add_job_result(jid, {"accession": "NC_789", "organism": "E. coli"})
+        await store.update_job_status(jid, JobStatus.SUCCEEDED)
+
+        async with async_client.stream("GET", f"/api/v1/jobs/{jid}/results?format=csv") as resp:
+            assert resp.status_code == 200
+            assert resp.headers["content-type"].startswith("text/csv")
+            assert "attachment" in resp.headers["content-disposition"]
+            lines = [line async for line in resp.aiter_lines()]
+        reader = csv.reader(lines)
+        assert tuple(next(reader)) == CSV_FIELDNAMES
+        assert [row[0] for row in reader] == ["NC_789"]
+
+    async def test_get_results_served_from_snapshot(self, async_client, store, jid, tmp_path, monkeypatch):
+        """Test results are served from the completion snapshot when RESULTS_DIR is set."""
+        from dataclasses import replace
+
+        from ncbi_metadata_harvester import job_processor, main
+
+        settings = replace(main.get_settings(), results_dir=str(tmp_path))
+        monkeypatch.setattr(main, "get_settings", lambda: settings)
+        monkeypatch.setattr(job_processor, "get_settings", lambda: settings)
+
+        await store.create_job(job_id=jid, input_data={}, total=1)
+        await store.add_job_result(jid, {"accession": "NC_321", "organism": "E. coli"})
+        await job_processor._complete_job(jid)
+
+        assert (tmp_path / f"job_{jid}_results.json").is_file()
+        # Later store changes are not reflected; the snapshot is authoritative
+        await store.add_job_result(jid, {"accession": "NC_999"})
+
+        json_resp = await async_client.get(f"/api/v1/jobs/{jid}/results?format=json")
+        assert [r["accession"] for r in orjson.loads(json_resp.content)["results"]] == ["NC_321"]
+        csv_resp = await async_client.get(f"/api/v1/jobs/{jid}/results?format=csv")
+        assert csv_resp.headers["content-type"].startswith("text/csv")
+        assert "attachment" in csv_resp.headers["content-disposition"]
+        assert csv_resp.text.splitlines()[1].startswith("NC_321,")
+
+    def test_job_events_stream_terminal_job(self, client, store, jid):
+        """Test the SSE endpoint sends the final state of a finished job and closes."""
+        store._create_job_unsafe(jid, {}, total=1)
+        store._set_status(jid, JobStatus.SUCCEEDED)
+
+        resp = client.get(f"/api/v1/jobs/{jid}/events")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        assert resp.text.count("event: progress") == 1
+        assert '"status":"succeeded"' in resp.text
+
+    def test_job_events_not_found(self, client):
+        """Test the SSE endpoint returns 404 for unknown jobs."""
+        assert client.get("/api/v1/jobs/missing-events/events").status_code == 404
+
+    async def test_get_job_status_long_poll(self, async_client, store, jid):
+        """Test wait_ms holds a matching conditional poll until the job changes."""
+
+        await store.create_job(job_id=jid, input_data={}, total=1)
+        etag = (await async_client.get(f"/api/v1/jobs/{jid}")).headers["etag"]
+
+        idle = await async_client.get(f"/api/v1/jobs/{jid}?wait_ms=50", headers={"If-None-Match": etag})
+        assert idle.status_code == 304
+
+        poll = asyncio.ensure_future(
+            async_client.get(f"/api/v1/jobs/{jid}?wait_ms=5000", headers={"If-None-Match": etag})
+        )
+        await asyncio.sleep(0.05)
+        assert not poll.done()
+        await store.add_job_result(jid, {"accession": "NC_1"})
+        resp = await asyncio.wait_for(poll, 2.0)
+
+        assert resp.status_code == 200
+        assert resp.json()["progress"]["completed"] == 1
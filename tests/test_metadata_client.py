@@ -0,0 +1,164 @@
+"""Tests for the Python metadata client's polling helpers."""
+import asyncio
+
+import httpx
+import pytest
+
+from clients import metadata_client
+from clients.metadata_client import JobPoller, MetadataClientError, get_job_status, wait_for_job
+
+
+def _doc(status: str, completed: int = 0) -> dict:
+    return {"status": status, "progress": {"total": 2, "completed": completed, "errors": 0}}
+
+
+@pytest.fixture
+async def make_poller():
+    """JobPoller factory over a MockTransport; lets sweep tasks exit before teardown."""
+    pollers = []
+
+    def make(handler, base_url: str) -> JobPoller:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pollers.append(JobPoller(base_url=base_url, interval=0.01, client=client))
+        return pollers[-1]
+
+    yield make
+    for poller in pollers:
+        if poller._task is not None:
+            await poller._task
+        await poller._client.aclose()
+
+
+class TestJobPoller:
+    """Test JobPoller sweeps and cleanup."""
+
+    async def test_batch_sweep(self, make_poller):
+        """Test one batch request per cycle covers every waiting job."""
+        requests = []
+        polls = {"job-a": 0, "job-b": 0}
+
+        def handler(request):
+            requests.append(request)
+            ids = request.url.params["ids"].split(",")
+            for job_id in ids:
+                polls[job_id] += 1
+            return httpx.Response(200, json={
+                job_id: _doc("succeeded" if polls[job_id] > 1 else "running", polls[job_id]) for job_id in ids
+            })
+
+        poller = make_poller(handler, "http://batch")
+        a, b = await asyncio.gather(
+            wait_for_job("job-a", timeout=5.0, poller=poller),
+            wait_for_job("job-b", timeout=5.0, poller=poller),
+        )
+        assert (a.status, b.status) == ("succeeded", "succeeded")
+        assert a.progress.completed == 2
+        assert [r.url.params["ids"] for r in requests] == ["job-a,job-b", "job-a,job-b"]
+        assert poller._events == {} and poller._statuses == {}
+
+    async def test_fallback_sweep(self, make_poller):
+        """Test servers without the batch endpoint are polled per job."""
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            if request.url.path == "/api/v1/jobs":
+                return httpx.Response(404)
+            return httpx.Response(200, json=_doc("succeeded", 2))
+
+        poller = make_poller(handler, "http://fallback")
+        status = await wait_for_job("job-1", timeout=5.0, poller=poller)
+        assert status.status == "succeeded"
+        assert paths == ["/api/v1/jobs", "/api/v1/jobs/job-1/status"]
+
+    async def test_missing_job(self, make_poller):
+        """Test a job absent from the batch reply fails its waiter."""
+        def handler(request):
+            return httpx.Response(200, json={})
+
+        poller = make_poller(handler, "http://missing")
+        with pytest.raises(MetadataClientError, match="not found"):
+            await wait_for_job("gone", timeout=5.0, poller=poller)
+
+    async def test_missing_job_can_be_polled_again(self, make_poller):
+        """Test a 404 is forgotten once its waiter is released."""
+        docs = {}
+
+        def handler(request):
+            return httpx.Response(200, json=docs)
+
+        poller = make_poller(handler, "http://retry")
+        with pytest.raises(MetadataClientError):
+            await wait_for_job("late", timeout=5.0, poller=poller)
+        docs["late"] = _doc("succeeded", 2)
+        status = await wait_for_job("late", timeout=5.0, poller=poller)
+        assert status.status == "succeeded"
+
+    async def test_timeout(self, make_poller):
+        """Test a job that never finishes times out and is released."""
+        def handler(request):
+            return httpx.Response(200, json={"slow": _doc("running")})
+
+        poller = make_poller(handler, "http://slow")
+        with pytest.raises(MetadataClientError, match="Timeout waiting for job slow: running"):
+            await wait_for_job("slow", timeout=0.05, poller=poller)
+        assert poller._events == {} and poller._statuses == {}
+
+    async def test_malformed_response_fails_waiters(self, make_poller):
+        """Test an unexpected error in a sweep wakes waiters instead of hanging them."""
+        def handler(request):
+            return httpx.Response(200, json={"bad": {"progress": {}}})
+
+        poller = make_poller(handler, "http://malformed")
+        with pytest.raises(MetadataClientError, match="Polling job bad failed"):
+            await wait_for_job("bad", timeout=5.0, poller=poller)
+        assert poller._errors == {}
+
+
+class TestStatusCache:
+    """Test the conditional-poll cache stays bounded."""
+
+    async def test_terminal_status_not_cached(self, monkeypatch):
+        """Test a finished job's validators are dropped rather than kept forever."""
+        monkeypatch.setattr(metadata_client, "_status_cache", {})
+        docs = iter([_doc("running"), _doc("succeeded", 2)])
+
+        def handler(request):
+            return httpx.Response(200, json=next(docs), headers={"etag": '"v1"'})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await get_job_status("job-1", base_url="http://cache", client=client)
+            assert list(metadata_client._status_cache) == ["http://cache/api/v1/jobs/job-1"]
+            await get_job_status("job-1", base_url="http://cache", client=client)
+        assert metadata_client._status_cache == {}
+
+    async def test_cache_evicts_least_recently_polled(self, monkeypatch):
+        """Test the cache is capped at _STATUS_CACHE_MAX entries."""
+        monkeypatch.setattr(metadata_client, "_status_cache", {})
+        monkeypatch.setattr(metadata_client, "_STATUS_CACHE_MAX", 2)
+
+        def handler(request):
+            if request.headers.get("if-none-match"):
+                return httpx.Response(304)
+            return httpx.Response(200, json=_doc("running"), headers={"etag": '"v1"'})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            for job_id in ("a", "b", "a", "c"):
+                await get_job_status(job_id, base_url="http://lru", client=client)
+        assert [url.rsplit("/", 1)[1] for url in metadata_client._status_cache] == ["a", "c"]
+
+
+class TestWaitForJob:
+    """Test direct (non-poller) waiting."""
+
+    async def test_poll_interval_is_deprecated_alias(self):
+        """Test the old poll_interval keyword still works, with a DeprecationWarning."""
+        docs = iter([_doc("running"), _doc("succeeded", 2)])
+
+        def handler(request):
+            return httpx.Response(200, json=next(docs))
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with pytest.warns(DeprecationWarning, match="poll_interval"):
+                status = await wait_for_job("job-1", base_url="http://legacy", poll_interval=0.01, client=client)
+        assert status.status == "succeeded"
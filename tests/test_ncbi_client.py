@@ -0,0 +1,179 @@
+"""Tests for the NCBI E-utilities client."""
+import asyncio
+import re
+import threading
+
+import pytest
+
+from ncbi_metadata_harvester import ncbi_client
+from ncbi_metadata_harvester.ncbi_client import NCBIClient, close_ncbi_client, get_ncbi_client
+
+EPOST_XML = b"""<?xml version="1.0" encoding="UTF-8" ?>
+<ePostResult><QueryKey>1</QueryKey><WebEnv>MCID_test</WebEnv></ePostResult>"""
+
+
+@pytest.mark.asyncio
+async def test_esummary_batched_posts_each_chunk(httpx_mock):
+    """Test IDs are posted in chunks and summarized from the history server."""
+    httpx_mock.add_response(url=re.compile(r".*/epost\.fcgi"), content=EPOST_XML)
+    httpx_mock.add_response(
+        url=re.compile(r".*/esummary\.fcgi.*WebEnv=MCID_test.*"),
+        json={"result": {"uids": ["1"], "1": {"assemblyaccession": "GCF_000005845.2"}}},
+    )
+
+    async with NCBIClient() as client:
+        responses = [r async for r in client.esummary_batched(db="assembly", ids=["1", "2", "3"], chunk=2)]
+
+    assert len(responses) == 2
+    posts = [r for r in httpx_mock.get_requests() if r.url.path.endswith("epost.fcgi")]
+    assert [p.method for p in posts] == ["POST", "POST"]
+    assert b"id=1%2C2" in posts[0].content
+    assert b"id=3" in posts[1].content
+
+
+@pytest.mark.asyncio
+async def test_epost_error_raises(httpx_mock):
+    """Test an EPost error document raises instead of returning empty keys."""
+    httpx_mock.add_response(
+        url=re.compile(r".*/epost\.fcgi"),
+        content=b"<ePostResult><ERROR>Invalid db name</ERROR></ePostResult>",
+    )
+
+    async with NCBIClient() as client:
+        with pytest.raises(ValueError, match="Invalid db name"):
+            await client.epost("bogus", ["1"])
+
+
+@pytest.mark.asyncio
+async def test_esummary_served_from_cache(httpx_mock):
+    """Test a repeated ID-based ESummary is answered from the cache."""
+    fakeredis = pytest.importorskip("fakeredis")
+    httpx_mock.add_response(
+        url=re.compile(r".*/esummary\.fcgi.*"),
+        json={"result": {"uids": ["1"], "1": {"assemblyaccession": "GCF_000005845.2"}}},
+    )
+
+    async with NCBIClient(cache=fakeredis.FakeAsyncRedis()) as client:
+        first = await client.esummary(db="assembly", id=["1"])
+        second = await client.esummary(db="assembly", id=["1"])
+
+    assert second.json() == first.json()
+    assert len(httpx_mock.get_requests()) == 1
+
+
+GB_RECORD = (
+    "LOCUS       NC_000913\n"
+    "DEFINITION  Escherichia coli K-12.\n"
+    "FEATURES             Location/Qualifiers\n"
+    "     source          1..12\n"
+    "ORIGIN\n"
+    "        1 agcttttcat tc\n"
+    "//\n"
+)
+
+
+@pytest.mark.asyncio
+async def test_efetch_stream_caches_headers_only(httpx_mock):
+    """Test a fully read GenBank stream caches only record headers and replays them."""
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = fakeredis.FakeAsyncRedis()
+    httpx_mock.add_response(url=re.compile(r".*/efetch\.fcgi.*"), text=GB_RECORD)
+
+    async with NCBIClient(cache=cache) as client:
+        texts = []
+        for _ in range(2):
+            async with client.efetch_stream(db="nuccore", id=["NC_000913"], cache_headers=True) as response:
+                texts.append("".join([chunk async for chunk in response.aiter_text()]))
+
+    headers = "LOCUS       NC_000913\nDEFINITION  Escherichia coli K-12.\n//\n"
+    assert [await cache.get(key) for key in await cache.keys("*")] == [headers.encode()]
+    assert texts == [GB_RECORD, headers]
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_efetch_stream_caches_via_bytes_and_skips_partial_reads(httpx_mock):
+    """Test reading raw bytes also caches headers, while an abandoned stream caches nothing."""
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = fakeredis.FakeAsyncRedis()
+    httpx_mock.add_response(url=re.compile(r".*/efetch\.fcgi.*"), text=GB_RECORD)
+
+    async with NCBIClient(cache=cache) as client:
+        async with client.efetch_stream(db="nuccore", id=["NC_1"], cache_headers=True) as response:
+            async for _ in response.aiter_bytes():
+                break
+        assert await cache.keys("*") == []
+
+        async with client.efetch_stream(db="nuccore", id=["NC_000913"], cache_headers=True) as response:
+            assert b"".join([chunk async for chunk in response.aiter_bytes()]) == GB_RECORD.encode()
+
+    assert len(await cache.keys("*")) == 1
+
+
+@pytest.mark.asyncio
+async def test_efetch_stream_not_cached_by_default(httpx_mock):
+    """Test streamed bodies are not buffered into the cache unless asked for headers."""
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = fakeredis.FakeAsyncRedis()
+    httpx_mock.add_response(url=re.compile(r".*/efetch\.fcgi.*"), text=GB_RECORD)
+
+    async with NCBIClient(cache=cache) as client:
+        async with client.efetch_stream(db="nuccore", id=["NC_000913"]) as response:
+            assert "".join([chunk async for chunk in response.aiter_text()]) == GB_RECORD
+
+    assert await cache.keys("*") == []
+
+
+@pytest.mark.asyncio
+async def test_warmup_is_best_effort(httpx_mock):
+    """Test warmup issues an EInfo request and swallows failures."""
+    httpx_mock.add_response(url=re.compile(r".*/einfo\.fcgi.*"), status_code=400)
+
+    async with NCBIClient() as client:
+        await client.warmup()
+
+    assert httpx_mock.get_requests()[0].url.path.endswith("einfo.fcgi")
+
+
+@pytest.mark.asyncio
+async def test_gathered_esearch_calls_keep_their_responses(httpx_mock):
+    """Test concurrent ESearch calls through one client each get their own result."""
+    terms = [f"Escherichia coli[Organism] AND query{i}" for i in range(6)]
+    for i, term in enumerate(terms):
+        httpx_mock.add_response(
+            url=re.compile(rf".*/esearch\.fcgi.*query{i}.*"),
+            json={"esearchresult": {"count": str(i), "idlist": [str(i)]}},
+        )
+
+    async with NCBIClient() as client:
+        responses = await asyncio.gather(*(client.esearch(db="assembly", term=t, retmax=3) for t in terms))
+
+    assert [r.json()["esearchresult"]["idlist"] for r in responses] == [[str(i)] for i in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_shared_client_from_another_loop_is_closed(monkeypatch):
+    """Test switching loops closes the old shared client on its own loop."""
+    monkeypatch.setattr(ncbi_client, "_ncbi_client", None)
+    monkeypatch.setattr(ncbi_client, "_ncbi_client_loop", None)
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    try:
+        async def create():
+            return get_ncbi_client()
+
+        stale = asyncio.run_coroutine_threadsafe(create(), other).result(5)
+        current = get_ncbi_client()
+        assert current is not stale
+        # The close was handed to the other loop; wait for it to run there
+        for _ in range(100):
+            if stale.http_client._client.is_closed:
+                break
+            await asyncio.sleep(0.01)
+        assert stale.http_client._client.is_closed
+        await close_ncbi_client()
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join(5)
+        other.close()
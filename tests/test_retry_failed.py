@@ -0,0 +1,43 @@
+"""Tests for the retry_failed script's job polling."""
+import httpx
+import pytest
+
+from retry_failed import poll_job
+
+STATUS_URL = httpx.URL("http://test/api/v1/jobs/retry-1")
+
+
+def _doc(status: str, completed: int) -> dict:
+    return {"status": status, "progress": {"total": 2, "completed": completed, "errors": 0}}
+
+
+async def test_poll_job_reuses_document_on_304(httpx_mock):
+    """Test a 304 Not Modified keeps polling with the last document instead of aborting."""
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    httpx_mock.add_response(url=STATUS_URL, json=_doc("running", 1), headers={"etag": '"v1"'})
+    httpx_mock.add_response(url=STATUS_URL, status_code=304, match_headers={"If-None-Match": '"v1"'})
+    httpx_mock.add_response(url=STATUS_URL, json=_doc("succeeded", 2), match_headers={"If-None-Match": '"v1"'})
+
+    async with httpx.AsyncClient() as client:
+        status = await poll_job(client, STATUS_URL, sleep=fake_sleep)
+
+    assert status == "succeeded"
+    assert len(httpx_mock.get_requests()) == 3
+    # Flat progress on the 304 doubles the delay; the advance resets it
+    assert sleeps == [1.0, 1.0, 2.0]
+
+
+async def test_poll_job_raises_on_error_status(httpx_mock):
+    """Test non-200/304 responses still raise."""
+    httpx_mock.add_response(url=STATUS_URL, status_code=404)
+
+    async def no_sleep(delay):
+        pass
+
+    async with httpx.AsyncClient() as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await poll_job(client, STATUS_URL, sleep=no_sleep)